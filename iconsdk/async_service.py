@@ -1,15 +1,24 @@
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 # Import necessary components from iconsdk
+from iconsdk.batch import AsyncBatch
 from iconsdk.builder.call_builder import Call
 from iconsdk.builder.transaction_builder import Transaction
 from iconsdk.exception import AddressException, DataTypeException
 from iconsdk.icon_service import IconService
+from iconsdk.iterators import AsyncBlockIterator, AsyncBlockStream
+from iconsdk.monitor import EventFilter
 from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.cache import Cache
+from iconsdk.providers.caching_provider import AsyncCachingProvider
+from iconsdk.providers.head_cache import AsyncHeadCachingProvider, HeadCache, height_of
 from iconsdk.providers.provider import MonitorSpec
 from iconsdk.signed_transaction import SignedTransaction
 from iconsdk.utils import get_timestamp
+from iconsdk.utils.bloom import may_contain_events
 from iconsdk.utils.convert_type import convert_int_to_hex_str
+from iconsdk.utils.converter import get_transaction_hashes
 from iconsdk.utils.validation import (is_block_height, is_hex_block_hash,
                                       is_predefined_block_value,
                                       is_score_address, is_T_HASH,
@@ -24,8 +33,21 @@ class AsyncIconService:
     """
     DEFAULT_BLOCK_VERSION = IconService.DEFAULT_BLOCK_VERSION # Use IconService's default
 
-    def __init__(self, provider: AsyncProvider):
+    def __init__(self, provider: AsyncProvider, cache: Optional[Cache] = None,
+                 head_cache: Optional[HeadCache] = None):
+        """
+        :param provider: provider to send requests
+        :param cache: cache of data which never changes, like blocks by height or hash,
+            transactions and their results, and queries with height (e.g. LRUCache()).
+            Nothing is cached by default.
+        :param head_cache: cache sharing the last block for a short time (e.g. HeadCache(ttl=0.5))
+        """
+        if head_cache is not None:
+            provider = AsyncHeadCachingProvider(provider, head_cache)
+        if cache is not None:
+            provider = AsyncCachingProvider(provider, cache)
         self.__provider = provider
+        self.__head_cache = head_cache
 
     async def __aenter__(self):
         return self
@@ -36,6 +58,60 @@ class AsyncIconService:
     async def close(self):
         await self.__provider.close()
 
+    def batch(self) -> AsyncBatch:
+        """
+        Returns a batch collecting calls of the methods to send them in one JSON-RPC batch request.
+        Calls in the batch are not awaited. Each returns `BatchResult` which has
+        the result after the batch is executed by leaving `async with` block or `await batch.execute()`.
+
+        Example::
+
+            async with service.batch() as batch:
+                balance = batch.get_balance(address)
+            print(balance.result())
+        """
+        return AsyncBatch(self.__provider, AsyncIconService)
+
+    async def iter_blocks(self, start: int, end: Optional[int] = None, concurrency: int = 8,
+                          block_version: str = DEFAULT_BLOCK_VERSION,
+                          retries: int = 3) -> AsyncBlockIterator:
+        """
+        Async version of IconService.iter_blocks. Blocks are fetched in tasks.
+
+        Example::
+
+            async for block in await service.iter_blocks(1000, 2000, concurrency=16):
+                save(block)
+        """
+        if end is None:
+            end = await self.get_last_height()
+        return AsyncBlockIterator(lambda height: self.get_block(height, block_version=block_version),
+                                  start, end, concurrency=concurrency, retries=retries)
+
+    def stream_blocks(self, start: int, block_version: str = "0.3", convert: bool = True,
+                      concurrency: int = 8, **options) -> AsyncBlockStream:
+        """
+        Returns an endless async iterator of the blocks from `start` in the order of heights.
+        It fetches the blocks up to the last one concurrently, then follows new blocks
+        with a block monitor, falling back to polling while the monitor is not available.
+        Each block is yielded once. `next_height` of the stream is the checkpoint to resume from.
+
+        Example::
+
+            async with service.stream_blocks(checkpoint) as blocks:
+                async for block in blocks:
+                    save(block)
+
+        :param start: height of the first block
+        :param block_version: returning block format version
+        :param convert: whether blocks are converted as `IconService.get_block` does
+        :param concurrency: max number of blocks fetched ahead while catching up
+        :param options: other options of AsyncBlockStream (e.g. poll_interval, reconnect_delay)
+        :return: async iterator of the blocks
+        """
+        return AsyncBlockStream(self, start, block_version=block_version, convert=convert,
+                                concurrency=concurrency, **options)
+
     # --- Async API Methods ---
 
     async def call(self, call_obj: Call) -> Any:
@@ -158,6 +234,61 @@ class AsyncIconService:
         # IconService converts if full_response is False, skip async conversion
         return result
 
+    async def get_transaction_results(self, tx_hashes: Iterable[str], batch_size: int = 50,
+                                      concurrency: int = 8,
+                                      return_exceptions: bool = False) -> List[Any]:
+        """
+        Async version of IconService.get_transaction_results. Returns raw transaction results.
+        At most `concurrency` batch requests are sent at once.
+        """
+        tx_hashes = list(tx_hashes)
+        for tx_hash in tx_hashes:
+            if not is_T_HASH(tx_hash):
+                raise DataTypeException(f"Transaction hash is invalid: {tx_hash}")
+        if batch_size < 1:
+            raise DataTypeException(f"Invalid batch size {batch_size}")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_results(chunk: List[str]) -> List[Any]:
+            async with semaphore:
+                if batch_size == 1:
+                    return [await self.get_transaction_result(chunk[0])]
+                async with self.batch() as batch:
+                    results = [batch.get_transaction_result(tx_hash) for tx_hash in chunk]
+                return [result.exception() or result.result() for result in results]
+
+        chunks = [tx_hashes[i:i + batch_size] for i in range(0, len(tx_hashes), batch_size)]
+        tasks = [asyncio.ensure_future(get_results(chunk)) for chunk in chunks]
+        try:
+            responses = await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        finally:
+            for task in tasks:
+                task.cancel()
+        results = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, BaseException):
+                results.extend([response] * len(chunk))
+            else:
+                results.extend(response)
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+
+    async def get_block_with_results(self, value: Union[str, int], block_version: str = DEFAULT_BLOCK_VERSION,
+                                     batch_size: int = 50,
+                                     concurrency: int = 8,
+                                     event_filters: Union[EventFilter, List[EventFilter], None] = None
+                                     ) -> Tuple[Any, List[Any]]:
+        """Async version of IconService.get_block_with_results. Returns raw block and transaction results."""
+        block = await self.get_block(value, block_version=block_version)
+        if event_filters is not None and not may_contain_events(block, event_filters):
+            return block, [None] * len(get_transaction_hashes(block))
+        results = await self.get_transaction_results(get_transaction_hashes(block),
+                                                     batch_size=batch_size, concurrency=concurrency)
+        return block, results
+
     # Add missing async version of get_score_status
     async def get_score_status(self, address: str, height: Optional[int] = None) -> Any:
         """Async version of IconService.get_score_status. Returns raw SCORE status."""
@@ -204,6 +335,14 @@ class AsyncIconService:
         # IconService converts if full_response is False, skip async conversion
         return result
 
+    async def get_last_height(self) -> int:
+        """Async version of IconService.get_last_height"""
+        if self.__head_cache is not None:
+            height = self.__head_cache.notified_height
+            if height is not None:
+                return height
+        return height_of(await self.__provider.make_request('icx_getLastBlock'))
+
     async def get_total_supply(self, height: Optional[int] = None) -> int:
         """Async version of IconService.get_total_supply. Returns total supply as integer."""
         req_params = {}
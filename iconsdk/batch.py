@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from iconsdk.exception import DataTypeException, IconServiceBaseException
+from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.provider import Monitor, MonitorSpec, Provider
+
+
+class BatchResult:
+    """
+    Result of a call in a batch.
+    It's available after the batch is executed.
+    """
+
+    def __init__(self):
+        self.__done = False
+        self.__result = None
+        self.__exception = None
+
+    def _set(self, result: Any = None, exception: Optional[BaseException] = None):
+        self.__result = result
+        self.__exception = exception
+        self.__done = True
+
+    def done(self) -> bool:
+        return self.__done
+
+    def exception(self) -> Optional[BaseException]:
+        """
+        Returns the exception raised by the call or None if it succeeded
+        """
+        if not self.__done:
+            raise DataTypeException("Batch is not executed yet")
+        return self.__exception
+
+    def result(self) -> Any:
+        """
+        Returns the result of the call as the method of the service returns.
+
+        :raise: the exception raised by the call
+        """
+        if self.exception() is not None:
+            raise self.__exception
+        return self.__result
+
+
+class _Deferred(BaseException):
+    def __init__(self, method: str, params: Optional[Dict[str, Any]], full_response: bool):
+        self.request = (method, params)
+        self.full_response = full_response
+
+
+class _Recorder(Provider):
+    """
+    Provider capturing the request built by a method of the service
+    """
+
+    def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        raise _Deferred(method, params, full_response)
+
+    def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None):
+        raise DataTypeException("Monitor can't be used in a batch")
+
+
+class _AsyncRecorder(AsyncProvider):
+    async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        raise _Deferred(method, params, full_response)
+
+    async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
+        raise DataTypeException("Monitor can't be used in a batch")
+
+
+class _Replayer(Provider):
+    """
+    Provider returning the response of the batch to the method of the service,
+    so that the method converts it as usual
+    """
+
+    def __init__(self, response: Any):
+        self.__response = response
+
+    def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        if isinstance(self.__response, BaseException):
+            raise self.__response
+        return self.__response
+
+    def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> Monitor:
+        raise DataTypeException("Monitor can't be used in a batch")
+
+
+class _AsyncReplayer(AsyncProvider):
+    def __init__(self, response: Any):
+        self.__response = response
+
+    async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        if isinstance(self.__response, BaseException):
+            raise self.__response
+        return self.__response
+
+    async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
+        raise DataTypeException("Monitor can't be used in a batch")
+
+
+def _run_coroutine(coro) -> Any:
+    """
+    Runs the coroutine which doesn't suspend, like a method of AsyncIconService
+    using a provider returning immediately.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    coro.close()
+    raise RuntimeError("Unexpected suspension of the call in a batch")
+
+
+class _BatchBase:
+    def __init__(self, service_factory: Callable[[Any], Any], is_async: bool):
+        self.__service_factory = service_factory
+        self.__is_async = is_async
+        self.__calls: List[Tuple[str, tuple, dict, Tuple[str, Any], bool, BatchResult]] = []
+        self.__executed = False
+
+    def __len__(self):
+        return len(self.__calls)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        service = self.__service_factory(_AsyncRecorder() if self.__is_async else _Recorder())
+        method = getattr(service, name)
+
+        def record(*args, **kwargs) -> BatchResult:
+            if self.__executed:
+                raise DataTypeException("Batch is already executed")
+            try:
+                ret = method(*args, **kwargs)
+                if self.__is_async:
+                    _run_coroutine(ret)
+            except _Deferred as deferred:
+                result = BatchResult()
+                self.__calls.append((name, args, kwargs, deferred.request, deferred.full_response, result))
+                return result
+            raise DataTypeException(f"{name} doesn't make a request")
+
+        return record
+
+    def _take_requests(self) -> List[Tuple[str, Any]]:
+        if self.__executed:
+            raise DataTypeException("Batch is already executed")
+        self.__executed = True
+        return [request for _, _, _, request, _, _ in self.__calls]
+
+    def _resolve(self, responses: List[Any]) -> List[BatchResult]:
+        results = []
+        for (name, args, kwargs, _, _, result), response in zip(self.__calls, responses):
+            replayer = _AsyncReplayer(response) if self.__is_async else _Replayer(response)
+            try:
+                value = getattr(self.__service_factory(replayer), name)(*args, **kwargs)
+                if self.__is_async:
+                    value = _run_coroutine(value)
+                result._set(value)
+            except (Exception, IconServiceBaseException) as e:
+                result._set(exception=e)
+            results.append(result)
+        return results
+
+    def _group_requests(self) -> List[Tuple[bool, List[int], List[Tuple[str, Any]]]]:
+        """
+        Groups the requests by `full_response`, which applies to a whole batch request
+
+        :return: list of (full_response, indexes of the calls, requests)
+        """
+        requests = self._take_requests()
+        groups = []
+        for full_response in (False, True):
+            indexes = [idx for idx, call in enumerate(self.__calls) if call[4] == full_response]
+            if indexes:
+                groups.append((full_response, indexes, [requests[idx] for idx in indexes]))
+        return groups
+
+
+class Batch(_BatchBase):
+    """
+    Collects calls of IconService methods and sends them in one JSON-RPC batch request.
+    Each call returns `BatchResult` which has the result after the batch is executed.
+
+    Example::
+
+        with service.batch() as batch:
+            balances = [batch.get_balance(address) for address in addresses]
+        print([balance.result() for balance in balances])
+    """
+
+    def __init__(self, provider: Provider, service_factory: Callable[[Any], Any]):
+        super().__init__(service_factory, False)
+        self.__provider = provider
+
+    def __enter__(self) -> 'Batch':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def execute(self) -> List[BatchResult]:
+        """
+        Sends the collected calls
+
+        :return: results of the calls in the order of them
+        """
+        responses = [None] * len(self)
+        for full_response, indexes, requests in self._group_requests():
+            group = self.__provider.make_batch_request(requests, full_response)
+            for idx, response in zip(indexes, group):
+                responses[idx] = response
+        return self._resolve(responses)
+
+
+class AsyncBatch(_BatchBase):
+    """
+    Collects calls of AsyncIconService methods and sends them in one JSON-RPC batch request.
+    Calls in the batch are not awaited. Each returns `BatchResult` which has
+    the result after the batch is executed.
+
+    Example::
+
+        async with service.batch() as batch:
+            balances = [batch.get_balance(address) for address in addresses]
+        print([balance.result() for balance in balances])
+    """
+
+    def __init__(self, provider: AsyncProvider, service_factory: Callable[[Any], Any]):
+        super().__init__(service_factory, True)
+        self.__provider = provider
+
+    async def __aenter__(self) -> 'AsyncBatch':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.execute()
+
+    async def execute(self) -> List[BatchResult]:
+        """
+        Sends the collected calls
+
+        :return: results of the calls in the order of them
+        """
+        responses = [None] * len(self)
+        for full_response, indexes, requests in self._group_requests():
+            group = await self.__provider.make_batch_request(requests, full_response)
+            for idx, response in zip(indexes, group):
+                responses[idx] = response
+        return self._resolve(responses)
+
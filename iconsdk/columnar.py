@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from iconsdk.exception import DataTypeException
+from iconsdk.utils.bloom import get_param_types
+from iconsdk.utils.converter import hex_to_int
+
+# max number of indexed arguments after the event signature
+MAX_INDEXED = 3
+INT_TYPES = {"int", "bool"}
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+BASE_COLUMNS = ("height", "tx_index", "log_index", "tx_hash", "score_address", "signature")
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def import_optional(module: str, extra: str):
+    """
+    Imports the optional module, or raises ImportError telling how to install it
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(f"{module} is required. Install it with `pip install iconsdk[{extra}]`") from e
+
+
+def _decode_int(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return int(value, 0)
+        except ValueError:
+            return value
+    return value
+
+
+def _is_int64(values: List[Any]) -> bool:
+    return all(isinstance(v, int) and INT64_MIN <= v <= INT64_MAX for v in values)
+
+
+class EventLogColumns:
+    """
+    Event logs of transaction results flattened into columns.
+
+    Columns are `height`, `tx_index`, `log_index`, `tx_hash`, `score_address`, `signature`,
+    `indexed_1` to `indexed_3` for the indexed arguments after the signature,
+    and `data_0`, `data_1`, ... for the data arguments. Missing arguments are None.
+
+    Arguments are strings as the node returns. With `decode_ints`, arguments typed
+    `int` or `bool` in the event signature are decoded into integers.
+    """
+
+    def __init__(self, decode_ints: bool = False,
+                 signatures: Optional[Iterable[str]] = None,
+                 score_addresses: Optional[Iterable[str]] = None):
+        """
+        :param decode_ints: whether `int` and `bool` arguments are decoded into integers
+        :param signatures: event signatures to take. All events by default.
+        :param score_addresses: addresses of SCOREs of the events to take. All SCOREs by default.
+        """
+        self.__decode_ints = decode_ints
+        self.__signatures = None if signatures is None else set(signatures)
+        self.__score_addresses = None if score_addresses is None else set(score_addresses)
+        self.__param_types: Dict[str, List[str]] = {}
+        self.__base: Dict[str, list] = {}
+        self.__indexed: List[list] = []
+        self.__data: List[list] = []
+        self.clear()
+
+    def __len__(self):
+        return len(self.__base["height"])
+
+    def clear(self):
+        self.__base = {name: [] for name in BASE_COLUMNS}
+        self.__indexed = [[] for _ in range(MAX_INDEXED)]
+        self.__data = []
+
+    @property
+    def column_names(self) -> List[str]:
+        return (list(BASE_COLUMNS) + [f"indexed_{i + 1}" for i in range(MAX_INDEXED)]
+                + [f"data_{i}" for i in range(len(self.__data))])
+
+    def __types_of(self, signature: str) -> List[str]:
+        types = self.__param_types.get(signature)
+        if types is None:
+            try:
+                types = get_param_types(signature)
+            except DataTypeException:
+                types = []
+            self.__param_types[signature] = types
+        return types
+
+    def __decode(self, values: List[Any], types: List[str]) -> List[Any]:
+        return [_decode_int(v) if i < len(types) and types[i] in INT_TYPES else v for i, v in enumerate(values)]
+
+    def add_result(self, result: dict, height: Optional[int] = None, tx_index: Optional[int] = None):
+        """
+        Adds the event logs of a transaction result
+
+        :param result: transaction result, converted or not
+        :param height: height of the block. `blockHeight` of the result by default
+        :param tx_index: index of the transaction in the block. `txIndex` of the result by default
+        """
+        height = hex_to_int(result.get("blockHeight")) if height is None else height
+        tx_index = hex_to_int(result.get("txIndex")) if tx_index is None else tx_index
+        tx_hash = result.get("txHash")
+        for log_index, event_log in enumerate(result.get("eventLogs") or []):
+            indexed = event_log.get("indexed") or []
+            data = event_log.get("data") or []
+            signature = indexed[0] if indexed else ""
+            score_address = event_log.get("scoreAddress")
+            if self.__signatures is not None and signature not in self.__signatures:
+                continue
+            if self.__score_addresses is not None and score_address not in self.__score_addresses:
+                continue
+            args = indexed[1:]
+            if len(args) > MAX_INDEXED:
+                raise DataTypeException(f"Too many indexed arguments of {signature}")
+            if self.__decode_ints:
+                types = self.__types_of(signature)
+                args = self.__decode(args, types)
+                data = self.__decode(data, types[len(args):])
+
+            rows = len(self)
+            for name, value in zip(BASE_COLUMNS, (height, tx_index, log_index, tx_hash, score_address, signature)):
+                self.__base[name].append(value)
+            for i, column in enumerate(self.__indexed):
+                column.append(args[i] if i < len(args) else None)
+            while len(self.__data) < len(data):
+                self.__data.append([None] * rows)
+            for i, column in enumerate(self.__data):
+                column.append(data[i] if i < len(data) else None)
+
+    def add_block(self, block: dict, results: List[Optional[dict]]):
+        """
+        Adds the event logs of the results of the transactions in a block
+
+        :param block: block, converted or not
+        :param results: results of the transactions in the order of them. Results which are None are skipped.
+        """
+        height = hex_to_int(block["height"])
+        for tx_index, result in enumerate(results):
+            if result is not None:
+                self.add_result(result, height, tx_index)
+
+    def add_blocks(self, items: Iterable[Tuple[dict, List[Optional[dict]]]]):
+        for block, results in items:
+            self.add_block(block, results)
+
+    def to_pydict(self) -> Dict[str, list]:
+        """
+        Returns the columns as lists
+        """
+        columns = dict(self.__base)
+        for i, column in enumerate(self.__indexed):
+            columns[f"indexed_{i + 1}"] = column
+        for i, column in enumerate(self.__data):
+            columns[f"data_{i}"] = column
+        return columns
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Returns the columns as NumPy arrays.
+        Positions are int64 arrays. Arguments are int64 arrays if all of them are decoded integers
+        fitting in int64, or object arrays.
+        """
+        np = import_optional("numpy", "numpy")
+        arrays = {}
+        for name, values in self.to_pydict().items():
+            if name in ("height", "tx_index", "log_index") or (name not in BASE_COLUMNS
+                                                              and values and _is_int64(values)):
+                arrays[name] = np.array(values, dtype=np.int64)
+            else:
+                arrays[name] = np.array(values, dtype=object)
+        return arrays
+
+    def to_arrow(self):
+        """
+        Returns the columns as a pyarrow RecordBatch.
+        Arguments are int64 if all of them are decoded integers fitting in int64,
+        or strings with integers in decimal.
+        """
+        pa = import_optional("pyarrow", "arrow")
+        arrays, names = [], []
+        for name, values in self.to_pydict().items():
+            if name in ("height", "tx_index", "log_index"):
+                array = pa.array(values, type=pa.int64())
+            elif name in BASE_COLUMNS or not (values and _is_int64([v for v in values if v is not None])):
+                array = pa.array([v if v is None or isinstance(v, str) else str(v) for v in values],
+                                 type=pa.string())
+            else:
+                array = pa.array(values, type=pa.int64())
+            arrays.append(array)
+            names.append(name)
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+class EventLogWriter:
+    """
+    Writes event logs of blocks into files of columns in a directory.
+    Event logs are written when `rows_per_file` rows are collected, each time into a new file
+    named `<prefix>-<sequence>.parquet` (or `.arrow` for Arrow IPC files).
+    Sequences continue from the files in the directory.
+
+    Example::
+
+        with EventLogWriter("events", decode_ints=True) as writer:
+            for height in range(start, end + 1):
+                writer.add_block(*icon_service.get_block_with_results(height, block_version="0.3"))
+    """
+
+    def __init__(self, directory: str, prefix: str = "events", format: str = "parquet",
+                 rows_per_file: int = 1_000_000, **options):
+        """
+        :param directory: directory of the files
+        :param prefix: prefix of the names of the files
+        :param format: `parquet` or `arrow`
+        :param rows_per_file: number of rows to collect before writing a file
+        :param options: options of EventLogColumns
+        """
+        if format not in FORMATS:
+            raise DataTypeException(f"Unsupported format {format!r}")
+        self.__directory = directory
+        self.__prefix = prefix
+        self.__format = format
+        self.__rows_per_file = rows_per_file
+        self.__columns = EventLogColumns(**options)
+        self.__files: List[str] = []
+        os.makedirs(directory, exist_ok=True)
+        pattern = re.compile(re.escape(prefix) + r"-(\d+)" + re.escape(FORMATS[format]) + "$")
+        sequences = [int(m.group(1)) for m in map(pattern.match, os.listdir(directory)) if m]
+        self.__sequence = max(sequences, default=0) + 1
+
+    @property
+    def files(self) -> List[str]:
+        """
+        Paths of the files written by the writer
+        """
+        return list(self.__files)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add_block(self, block: dict, results: List[Optional[dict]]):
+        self.__columns.add_block(block, results)
+        if len(self.__columns) >= self.__rows_per_file:
+            self.flush()
+
+    def add_blocks(self, items: Iterable[Tuple[dict, List[Optional[dict]]]]):
+        for block, results in items:
+            self.add_block(block, results)
+
+    def flush(self) -> Optional[str]:
+        """
+        Writes the collected event logs into a new file
+
+        :return: path of the file, or None if nothing is collected
+        """
+        if len(self.__columns) == 0:
+            return None
+        pa = import_optional("pyarrow", "arrow")
+        batch = self.__columns.to_arrow()
+        path = os.path.join(self.__directory, f"{self.__prefix}-{self.__sequence:06d}{FORMATS[self.__format]}")
+        if self.__format == "parquet":
+            pq = import_optional("pyarrow.parquet", "arrow")
+            pq.write_table(pa.Table.from_batches([batch]), path)
+        else:
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+                writer.write_batch(batch)
+        self.__columns.clear()
+        self.__sequence += 1
+        self.__files.append(path)
+        return path
+
+    def close(self):
+        self.flush()
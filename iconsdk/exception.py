@@ -155,3 +155,12 @@ class HTTPError(IconServiceBaseException):
 
     def __repr__(self):
         return f'HTTPError(message={self.message!r}, status={self.status!r})'
+
+
+class CircuitOpenException(HTTPError):
+    """Error when requests to the endpoint are blocked by the circuit breaker"""
+    def __init__(self, message: str = "Circuit breaker is open"):
+        super().__init__(message, 503)
+
+    def __repr__(self):
+        return f'CircuitOpenException(message={self.message!r})'
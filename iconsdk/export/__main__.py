@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Exports a range of blocks into files.
+
+    python -m iconsdk.export --url https://ctz.solidwallet.io/api/v3 --kind events --format parquet \\
+        --start 80000000 --end 80100000 --out events
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from iconsdk.export.exporter import KINDS, Exporter
+from iconsdk.export.writers import WRITERS
+from iconsdk.icon_service import IconService
+from iconsdk.providers.http_provider import HTTPProvider
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m iconsdk.export",
+                                     description="Export blocks, transactions, receipts or events into files")
+    parser.add_argument("--url", required=True, help="URL of the node, e.g. https://ctz.solidwallet.io/api/v3")
+    parser.add_argument("--kind", choices=list(KINDS), default="blocks")
+    parser.add_argument("--format", choices=list(WRITERS), default="jsonl")
+    parser.add_argument("--start", type=int, default=0, help="first height when nothing is exported in --out")
+    parser.add_argument("--end", type=int, default=None, help="last height. The last height of the chain by default")
+    parser.add_argument("--out", required=True, help="directory of the files")
+    parser.add_argument("--max-file-mb", type=int, default=256, help="size of a file to start another")
+    parser.add_argument("--batch-rows", type=int, default=10_000, help="number of rows written at once")
+    parser.add_argument("--concurrency", type=int, default=8, help="max number of blocks fetched at once")
+    parser.add_argument("--block-version", default="0.3")
+    return parser.parse_args(args)
+
+
+def main(args: Optional[List[str]] = None):
+    options = parse_args(args)
+    logging.basicConfig(level=logging.INFO)
+    with IconService(HTTPProvider(options.url)) as icon_service:
+        exporter = Exporter(icon_service, options.out, kind=options.kind, format=options.format,
+                            max_file_bytes=options.max_file_mb * 1024 * 1024,
+                            batch_rows=options.batch_rows,
+                            concurrency=options.concurrency,
+                            block_version=options.block_version)
+        exporter.run(options.start, options.end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from iconsdk import logger
+from iconsdk.exception import DataTypeException
+from iconsdk.export.writers import INT, STR, RowWriter, get_writer_class
+from iconsdk.iterators import BlockIterator
+from iconsdk.utils.converter import get_transaction_hashes, hex_to_int, json_default
+from iconsdk.utils.hexadecimal import add_0x_prefix
+
+BLOCK_COLUMNS = [
+    ("height", INT), ("hash", STR), ("prev_hash", STR), ("timestamp", INT), ("tx_count", INT),
+]
+TRANSACTION_COLUMNS = [
+    ("height", INT), ("tx_index", INT), ("tx_hash", STR), ("timestamp", INT), ("from_address", STR),
+    ("to_address", STR), ("value", STR), ("step_limit", STR), ("data_type", STR), ("data", STR),
+]
+RECEIPT_COLUMNS = [
+    ("height", INT), ("tx_index", INT), ("tx_hash", STR), ("status", INT), ("step_used", STR),
+    ("step_price", STR), ("score_address", STR), ("failure", STR), ("event_count", INT),
+]
+EVENT_COLUMNS = [
+    ("height", INT), ("tx_index", INT), ("log_index", INT), ("tx_hash", STR), ("score_address", STR),
+    ("signature", STR), ("indexed", STR), ("data", STR),
+]
+
+
+def _str(value: Any) -> Optional[str]:
+    """
+    Returns the value as a string. Integers are in decimal, and dicts and lists are in JSON.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=json_default, separators=(",", ":"))
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if value.startswith("0x") or value.startswith("-0x"):
+        try:
+            return str(int(value, 16))
+        except ValueError:
+            pass
+    return value
+
+
+def _prefixed(value: Optional[str]) -> Optional[str]:
+    return add_0x_prefix(value) if value else None
+
+
+def _transactions_of(block: dict) -> list:
+    transactions = block.get("confirmed_transaction_list")
+    return (block.get("transactions") or []) if transactions is None else transactions
+
+
+def block_rows(block: dict, results: Optional[list]) -> List[Dict[str, Any]]:
+    return [{
+        "height": hex_to_int(block["height"]),
+        "hash": add_0x_prefix(block["hash"] if "hash" in block else block["block_hash"]),
+        "prev_hash": _prefixed(block["prevHash"] if "prevHash" in block else block.get("prev_block_hash")),
+        "timestamp": hex_to_int(block["timestamp"] if "timestamp" in block else block.get("time_stamp")),
+        "tx_count": len(_transactions_of(block)),
+    }]
+
+
+def transaction_rows(block: dict, results: Optional[list]) -> List[Dict[str, Any]]:
+    height = hex_to_int(block["height"])
+    return [{
+        "height": height,
+        "tx_index": tx_index,
+        "tx_hash": add_0x_prefix(tx_hash),
+        "timestamp": hex_to_int(tx.get("timestamp")),
+        "from_address": tx.get("from"),
+        "to_address": tx.get("to"),
+        "value": _str(tx.get("value")),
+        "step_limit": _str(tx.get("stepLimit")),
+        "data_type": tx.get("dataType"),
+        "data": None if tx.get("data") is None else json.dumps(tx["data"], default=json_default),
+    } for tx_index, (tx, tx_hash) in enumerate(zip(_transactions_of(block), get_transaction_hashes(block)))]
+
+
+def receipt_rows(block: dict, results: list) -> List[Dict[str, Any]]:
+    height = hex_to_int(block["height"])
+    return [{
+        "height": height,
+        "tx_index": tx_index,
+        "tx_hash": result.get("txHash"),
+        "status": hex_to_int(result.get("status")),
+        "step_used": _str(result.get("stepUsed")),
+        "step_price": _str(result.get("stepPrice")),
+        "score_address": result.get("scoreAddress"),
+        "failure": _str(result.get("failure")),
+        "event_count": len(result.get("eventLogs") or []),
+    } for tx_index, result in enumerate(results) if result is not None]
+
+
+def event_rows(block: dict, results: list) -> List[Dict[str, Any]]:
+    height = hex_to_int(block["height"])
+    rows = []
+    for tx_index, result in enumerate(results):
+        if result is None:
+            continue
+        for log_index, event_log in enumerate(result.get("eventLogs") or []):
+            indexed = event_log.get("indexed") or []
+            rows.append({
+                "height": height,
+                "tx_index": tx_index,
+                "log_index": log_index,
+                "tx_hash": result.get("txHash"),
+                "score_address": event_log.get("scoreAddress"),
+                "signature": indexed[0] if indexed else None,
+                "indexed": _str(indexed[1:]),
+                "data": _str(event_log.get("data") or []),
+            })
+    return rows
+
+
+# kind: (columns, whether transaction results are needed, function making rows of a block)
+KINDS: Dict[str, Tuple[List[Tuple[str, str]], bool, Callable[[dict, Optional[list]], List[Dict[str, Any]]]]] = {
+    "blocks": (BLOCK_COLUMNS, False, block_rows),
+    "transactions": (TRANSACTION_COLUMNS, False, transaction_rows),
+    "receipts": (RECEIPT_COLUMNS, True, receipt_rows),
+    "events": (EVENT_COLUMNS, True, event_rows),
+}
+
+PART_SUFFIX = ".part"
+
+
+class Exporter:
+    """
+    Exports blocks, transactions, transaction results (receipts) or event logs of a height range
+    into JSON lines, CSV or Parquet files in a directory.
+
+    Rows are written every `batch_rows` rows, and a file is closed when it exceeds `max_file_bytes`
+    after the rows of a block. A file being written has the suffix `.part`, and a closed one is named
+    `<kind>-<first height>-<last height>.<format>`. The next height of the last closed file is kept
+    in `<kind>.state.json` of the directory, so a new run resumes from it, removing `.part` files.
+    """
+
+    def __init__(self, service, directory: str, kind: str = "blocks", format: str = "jsonl",
+                 max_file_bytes: int = 256 * 1024 * 1024,
+                 batch_rows: int = 10_000,
+                 concurrency: int = 8,
+                 block_version: str = "0.3",
+                 batch_size: int = 50):
+        """
+        :param service: IconService to fetch blocks
+        :param directory: directory of the files
+        :param kind: `blocks`, `transactions`, `receipts` or `events`
+        :param format: `jsonl`, `csv` or `parquet`
+        :param max_file_bytes: size of a file to close it and start another
+        :param batch_rows: number of rows to collect before writing them
+        :param concurrency: max number of blocks fetched at once
+        :param block_version: block format version
+        :param batch_size: max number of transaction results in a batch request
+        """
+        if kind not in KINDS:
+            raise DataTypeException(f"Unsupported kind {kind!r}. It should be one of {', '.join(KINDS)}")
+        self.__service = service
+        self.__directory = directory
+        self.__kind = kind
+        self.__writer_class = get_writer_class(format)
+        self.__columns, self.__with_results, self.__make_rows = KINDS[kind]
+        self.__max_file_bytes = max_file_bytes
+        self.__batch_rows = batch_rows
+        self.__concurrency = concurrency
+        self.__block_version = block_version
+        self.__batch_size = batch_size
+        self.__files: List[str] = []
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.__directory, f"{self.__kind}.state.json")
+
+    @property
+    def next_height(self) -> Optional[int]:
+        """
+        The next height of the last closed file, or None if nothing is exported
+        """
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)["next_height"]
+        except FileNotFoundError:
+            return None
+
+    @property
+    def files(self) -> List[str]:
+        """
+        Paths of the files closed by the exporter
+        """
+        return list(self.__files)
+
+    def __save_state(self, next_height: int):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"kind": self.__kind, "next_height": next_height}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.state_path)
+
+    def __remove_parts(self):
+        for name in os.listdir(self.__directory):
+            if name.startswith(f"{self.__kind}-") and name.endswith(PART_SUFFIX):
+                os.remove(os.path.join(self.__directory, name))
+
+    def __fetch(self, height: int) -> Tuple[dict, Optional[list]]:
+        if self.__with_results:
+            return self.__service.get_block_with_results(height, block_version=self.__block_version,
+                                                         batch_size=self.__batch_size)
+        return self.__service.get_block(height, block_version=self.__block_version), None
+
+    def __open(self, height: int) -> RowWriter:
+        name = f"{self.__kind}-{height:012d}{self.__writer_class.extension}{PART_SUFFIX}"
+        return self.__writer_class(os.path.join(self.__directory, name), self.__columns)
+
+    def __close(self, writer: RowWriter, first: int, last: int):
+        writer.close()
+        path = os.path.join(self.__directory,
+                            f"{self.__kind}-{first:012d}-{last:012d}{self.__writer_class.extension}")
+        os.replace(writer.path, path)
+        self.__save_state(last + 1)
+        self.__files.append(path)
+        logger.info(f"Exported {self.__kind} from {first} to {last} into {path}")
+
+    def __items(self, start: int, end: int) -> Iterator[Tuple[dict, Optional[list]]]:
+        # blocks are fetched in other threads than the ones of the service,
+        # which fetch their results
+        with ThreadPoolExecutor(self.__concurrency) as executor:
+            with BlockIterator(self.__fetch, start, end, executor.submit, concurrency=self.__concurrency) as blocks:
+                yield from blocks
+
+    def run(self, start: int = 0, end: Optional[int] = None) -> int:
+        """
+        Exports the range of heights, resuming from the next height of the state if it exists.
+        If it fails, the rows of the blocks before the failure are written and closed before
+        the error is raised.
+
+        :param start: first height when nothing is exported
+        :param end: last height (inclusive). The last height of the chain by default.
+        :return: the next height to export
+        """
+        next_height = self.next_height
+        if next_height is not None:
+            start = next_height
+        if end is None:
+            end = self.__service.get_last_height()
+        self.__remove_parts()
+        if start > end:
+            return start
+
+        writer: Optional[RowWriter] = None
+        first = last = None
+        rows = []
+        try:
+            for block, results in self.__items(start, end):
+                height = start if last is None else last + 1
+                # a file is opened with the rows of its first block, so it has a block when it's closed
+                made = self.__make_rows(block, results)
+                if writer is None:
+                    writer, first = self.__open(height), height
+                rows.extend(made)
+                last = height
+                if len(rows) >= self.__batch_rows:
+                    writer.write(rows)
+                    rows = []
+                    if writer.size >= self.__max_file_bytes:
+                        self.__close(writer, first, last)
+                        writer = None
+        finally:
+            if writer is not None:
+                if rows:
+                    writer.write(rows)
+                self.__close(writer, first, last)
+        return end + 1
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+import os
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, List, Tuple
+
+from iconsdk.columnar import import_optional
+from iconsdk.exception import DataTypeException
+
+# column types
+INT = "int"
+STR = "str"
+
+
+class RowWriter(metaclass=ABCMeta):
+    """
+    Writer of rows with the columns into a file
+    """
+    extension = ""
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]]):
+        """
+        :param path: path of the file
+        :param columns: list of (name, type) of the columns. Type is INT or STR.
+        """
+        self.path = path
+        self.columns = columns
+
+    @abstractmethod
+    def write(self, rows: List[Dict[str, Any]]):
+        """
+        Writes the rows. Values of INT columns are integers or None, and the others are strings or None.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def close(self):
+        raise NotImplementedError()
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes written to the file
+        """
+        return os.path.getsize(self.path)
+
+
+class JSONLinesWriter(RowWriter):
+    extension = ".jsonl"
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]]):
+        super().__init__(path, columns)
+        self.__file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self.__file.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+class CSVWriter(RowWriter):
+    extension = ".csv"
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]]):
+        super().__init__(path, columns)
+        self.__file = open(path, "w", encoding="utf-8", newline="")
+        self.__writer = csv.DictWriter(self.__file, fieldnames=[name for name, _ in columns])
+        self.__writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self.__writer.writerows(rows)
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+class ParquetWriter(RowWriter):
+    """
+    Writer of a Parquet file. Each `write` makes a row group.
+    """
+    extension = ".parquet"
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]]):
+        super().__init__(path, columns)
+        self.__pa = import_optional("pyarrow", "arrow")
+        pq = import_optional("pyarrow.parquet", "arrow")
+        self.__schema = self.__pa.schema([(name, self.__pa.int64() if type_ == INT else self.__pa.string())
+                                          for name, type_ in columns])
+        self.__writer = pq.ParquetWriter(path, self.__schema)
+
+    def write(self, rows: List[Dict[str, Any]]):
+        columns = {name: [row.get(name) for row in rows] for name, _ in self.columns}
+        self.__writer.write_table(self.__pa.Table.from_pydict(columns, schema=self.__schema))
+
+    def close(self):
+        self.__writer.close()
+
+
+WRITERS = {
+    "jsonl": JSONLinesWriter,
+    "csv": CSVWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def get_writer_class(format: str) -> type:
+    writer_class = WRITERS.get(format)
+    if writer_class is None:
+        raise DataTypeException(f"Unsupported format {format!r}. It should be one of {', '.join(WRITERS)}")
+    return writer_class
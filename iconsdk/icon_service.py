@@ -12,17 +12,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Union, Tuple, Any, List, Optional
+from concurrent.futures import Future
+from typing import Union, Tuple, Any, List, Optional, Callable, Iterable, Iterator
 
+from iconsdk.batch import Batch, BatchResult
 from iconsdk.builder.call_builder import Call
 from iconsdk.builder.transaction_builder import Transaction
 from iconsdk.exception import AddressException, DataTypeException
+from iconsdk.iterators import BlockIterator
+from iconsdk.monitor import EventFilter
+from iconsdk.parallel import ParallelExecutor
+from iconsdk.providers.cache import Cache
+from iconsdk.providers.caching_provider import CachingProvider
+from iconsdk.providers.head_cache import HeadCache, HeadCachingProvider, height_of
 from iconsdk.providers.provider import Provider, MonitorSpec, Monitor
 from iconsdk.signed_transaction import SignedTransaction
 from iconsdk.utils import get_timestamp
+from iconsdk.utils.bloom import may_contain_events
 from iconsdk.utils.convert_type import convert_int_to_hex_str
 from iconsdk.utils.converter import convert, \
-    get_block_template_to_convert_transactions_for_genesis
+    get_block_template_to_convert_transactions_for_genesis, get_transaction_hashes
 from iconsdk.utils.hexadecimal import add_0x_prefix, remove_0x_prefix
 from iconsdk.utils.templates import BLOCK_0_1a, BLOCK_0_3, TRANSACTION_RESULT, TRANSACTION, BLOCK_0_1A_VERSION
 from iconsdk.utils.validation import (
@@ -43,8 +52,130 @@ class IconService:
     """
     DEFAULT_BLOCK_VERSION = BLOCK_0_1A_VERSION
 
-    def __init__(self, provider: Provider):
+    def __init__(self, provider: Provider, max_workers: int = 10, cache: Optional[Cache] = None,
+                 head_cache: Optional[HeadCache] = None):
+        """
+        :param provider: provider to send requests
+        :param max_workers: number of threads running calls of `submit()` and `map()`.
+            The pool size of HTTPProvider should be at least this.
+        :param cache: cache of data which never changes, like blocks by height or hash,
+            transactions and their results, and queries with height (e.g. LRUCache()).
+            Nothing is cached by default.
+        :param head_cache: cache sharing the last block for a short time (e.g. HeadCache(ttl=0.5))
+        """
+        if head_cache is not None:
+            provider = HeadCachingProvider(provider, head_cache)
+        if cache is not None:
+            provider = CachingProvider(provider, cache)
         self.__provider = provider
+        self.__head_cache = head_cache
+        self.__executor = ParallelExecutor(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stops the threads of `submit()` and `map()`, and closes the provider
+        """
+        self.__executor.shutdown()
+        self.__provider.close()
+
+    def __get_method(self, method: Union[str, Callable]) -> Callable:
+        if callable(method):
+            return method
+        if method.startswith('_') or not callable(getattr(self, method, None)):
+            raise AttributeError(f"IconService has no method {method!r}")
+        return getattr(self, method)
+
+    def submit(self, method: Union[str, Callable], *args, **kwargs) -> Future:
+        """
+        Calls the method in a thread of the service.
+        It waits while too many calls are pending.
+
+        Example::
+
+            future = icon_service.submit("get_balance", address)
+            balance = future.result()
+
+        :param method: name of the method of IconService or a function to call
+        :param args: positional arguments of the method
+        :param kwargs: keyword arguments of the method
+        :return: future of the result
+        """
+        return self.__executor.submit(self.__get_method(method), *args, **kwargs)
+
+    def map(self, method: Union[str, Callable], iterable: Iterable[Any],
+            max_workers: Optional[int] = None,
+            return_exceptions: bool = False) -> Iterator[Any]:
+        """
+        Calls the method with each item of the iterable concurrently in threads of the service.
+        An item is the argument of the call, or a tuple of positional arguments or a dict of keyword arguments.
+        Items are taken lazily as the results are consumed.
+
+        Example::
+
+            balances = list(icon_service.map("get_balance", addresses))
+            blocks = icon_service.map("get_block", ({"value": h, "block_version": "0.3"} for h in heights))
+
+        :param method: name of the method of IconService or a function to call
+        :param iterable: arguments of the calls
+        :param max_workers: max number of calls running at once
+        :param return_exceptions: whether the error of a call is returned in place of its result.
+            If it's false, the error is raised when its result is reached.
+        :return: iterator of the results in the order of the items
+        """
+        return self.__executor.map(self.__get_method(method), iterable, max_workers, return_exceptions)
+
+    def iter_blocks(self, start: int, end: Optional[int] = None, concurrency: int = 8,
+                    block_version: str = DEFAULT_BLOCK_VERSION,
+                    retries: int = 3) -> BlockIterator:
+        """
+        Returns an iterator of the blocks from `start` to `end` in the order of heights.
+        Blocks are fetched concurrently in threads of the service, keeping at most
+        `concurrency` blocks ahead of the consumer.
+        A failed fetch is retried `retries` times before the error is raised.
+        Then `next_height` of the iterator is the failed height; iterating again or
+        calling `iter_blocks(it.next_height, end)` resumes from it.
+
+        Example::
+
+            with icon_service.iter_blocks(1000, 2000, concurrency=16) as blocks:
+                for block in blocks:
+                    save(block)
+
+        :param start: height of the first block
+        :param end: height of the last block (inclusive). The last height by default.
+        :param concurrency: max number of blocks fetched ahead
+        :param block_version: returning block format version
+        :param retries: max number of retries of a block
+        :return: iterator of the blocks
+        """
+        if end is None:
+            end = self.get_last_height()
+        return BlockIterator(lambda height: self.get_block(height, block_version=block_version),
+                             start, end, self.__executor.submit,
+                             concurrency=concurrency, retries=retries)
+
+    def batch(self) -> Batch:
+        """
+        Returns a batch collecting calls of the methods to send them in one JSON-RPC batch request.
+        Each call in the batch returns `BatchResult` which has the result after the batch is executed.
+        The batch is executed when it leaves `with` block or `execute()` is called.
+
+        Example::
+
+            with icon_service.batch() as batch:
+                balance = batch.get_balance(address)
+                block = batch.get_block(1209)
+            print(balance.result(), block.result())
+
+        :return: Batch of the calls
+        """
+        return Batch(self.__provider, IconService)
 
     def get_block(self, value: Union[int, str], full_response: bool = False,
                   block_version: str = DEFAULT_BLOCK_VERSION) -> dict:
@@ -114,6 +245,19 @@ class IconService:
 
         return result
 
+    def get_last_height(self) -> int:
+        """
+        Returns the height of the last block.
+        With `head_cache` following a block monitor, it's the last notified height.
+
+        :return: the height of the last block
+        """
+        if self.__head_cache is not None:
+            height = self.__head_cache.notified_height
+            if height is not None:
+                return height
+        return height_of(self.__provider.make_request('icx_getLastBlock'))
+
     def get_total_supply(self, height: int = None, full_response: bool = False) -> Union[dict, int]:
         """
         Returns total ICX coin supply that has been issued
@@ -215,6 +359,87 @@ class IconService:
 
         return result
 
+    def __get_transaction_results(self, tx_hashes: List[str], full_response: bool) -> List[BatchResult]:
+        with self.batch() as batch:
+            results = [batch.get_transaction_result(tx_hash, full_response) for tx_hash in tx_hashes]
+        return results
+
+    def get_transaction_results(self, tx_hashes: Iterable[str], full_response: bool = False,
+                                batch_size: int = 50,
+                                max_workers: Optional[int] = None,
+                                return_exceptions: bool = False) -> List[Any]:
+        """
+        Returns the results of the transactions in the order of the hashes.
+        They are requested in batch requests of `batch_size` transactions,
+        and the batch requests are sent concurrently in threads of the service.
+        With `batch_size=1`, each result is requested alone.
+
+        :param tx_hashes: hashes of transactions prefixed with '0x'
+        :param full_response: Boolean to check whether get naive dict or refined data from server
+        :param batch_size: max number of results in a batch request
+        :param max_workers: max number of requests running at once
+        :param return_exceptions: whether the error of a transaction is returned in place of its result.
+            If it's false, the first error is raised.
+        :return: list of the transaction results
+        """
+        tx_hashes = list(tx_hashes)
+        for tx_hash in tx_hashes:
+            if not is_T_HASH(tx_hash):
+                raise DataTypeException(f"This hash value is unrecognized: {tx_hash!r}")
+        if batch_size < 1:
+            raise DataTypeException(f"Invalid batch size {batch_size}")
+        if batch_size == 1:
+            return list(self.map(self.get_transaction_result, ((tx_hash, full_response) for tx_hash in tx_hashes),
+                                 max_workers, return_exceptions))
+
+        chunks = [tx_hashes[i:i + batch_size] for i in range(0, len(tx_hashes), batch_size)]
+        responses = self.map(self.__get_transaction_results, ((chunk, full_response) for chunk in chunks),
+                             max_workers, return_exceptions)
+        results = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, BaseException):
+                results.extend([response] * len(chunk))
+                continue
+            for result in response:
+                if result.exception() is None:
+                    results.append(result.result())
+                elif return_exceptions:
+                    results.append(result.exception())
+                else:
+                    raise result.exception()
+        return results
+
+    def get_block_with_results(self, value: Union[int, str], block_version: str = DEFAULT_BLOCK_VERSION,
+                               batch_size: int = 50,
+                               max_workers: Optional[int] = None,
+                               event_filters: Union[EventFilter, List[EventFilter], None] = None
+                               ) -> Tuple[dict, List[Optional[dict]]]:
+        """
+        Returns a block and the results of its transactions in the order of the transactions.
+        The results are requested as `get_transaction_results` does.
+        With `event_filters`, they are not requested if `logsBloom` of the block shows
+        that it can't contain any event of the filters. Then the results are None.
+
+        Example::
+
+            block, results = icon_service.get_block_with_results(1209, block_version="0.3")
+            for tx, result in zip(block["transactions"], results):
+                print(tx["txHash"], result["status"])
+
+        :param value: height or hash of a block, or `latest`
+        :param block_version: returning block format version
+        :param batch_size: max number of results in a batch request
+        :param max_workers: max number of requests running at once
+        :param event_filters: one event filter or list of event filters of the events to get
+        :return: tuple of the block and the transaction results
+        """
+        block = self.get_block(value, block_version=block_version)
+        if event_filters is not None and not may_contain_events(block, event_filters):
+            return block, [None] * len(get_transaction_hashes(block))
+        results = self.get_transaction_results(get_transaction_hashes(block),
+                                               batch_size=batch_size, max_workers=max_workers)
+        return block, results
+
     def wait_transaction_result(self, tx_hash: str, full_response: bool = False) -> dict:
         """
         Returns the result of a transaction specified by the transaction hash like get_transaction_result,
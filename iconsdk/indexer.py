@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, local
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from iconsdk import logger
+from iconsdk.iterators import AsyncBlockIterator, BlockIterator
+from iconsdk.utils.converter import get_transaction_hashes, hex_to_int, json_default
+from iconsdk.utils.hexadecimal import add_0x_prefix
+from iconsdk.utils.validation import is_score_address, is_wallet_address
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS blocks ("
+    "height INTEGER PRIMARY KEY, hash TEXT NOT NULL, timestamp INTEGER, tx_count INTEGER NOT NULL, "
+    "data TEXT NOT NULL)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS blocks_hash ON blocks (hash)",
+    "CREATE TABLE IF NOT EXISTS transactions ("
+    "tx_hash TEXT PRIMARY KEY, height INTEGER NOT NULL, tx_index INTEGER NOT NULL, "
+    "from_address TEXT, to_address TEXT, status INTEGER, data TEXT NOT NULL, result TEXT)",
+    "CREATE INDEX IF NOT EXISTS transactions_position ON transactions (height, tx_index)",
+    "CREATE TABLE IF NOT EXISTS event_logs ("
+    "height INTEGER NOT NULL, tx_index INTEGER NOT NULL, log_index INTEGER NOT NULL, tx_hash TEXT NOT NULL, "
+    "score_address TEXT NOT NULL, signature TEXT NOT NULL, indexed TEXT NOT NULL, data TEXT NOT NULL, "
+    "PRIMARY KEY (height, tx_index, log_index)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS event_logs_score ON event_logs (score_address, signature, height)",
+    "CREATE INDEX IF NOT EXISTS event_logs_signature ON event_logs (signature, height)",
+    "CREATE TABLE IF NOT EXISTS tx_addresses ("
+    "address TEXT NOT NULL, height INTEGER NOT NULL, tx_index INTEGER NOT NULL, tx_hash TEXT NOT NULL, "
+    "PRIMARY KEY (address, height, tx_index)) WITHOUT ROWID",
+]
+
+CHECKPOINT_KEY = "checkpoint"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=json_default, separators=(",", ":"))
+
+
+def _is_address(value: Any) -> bool:
+    return isinstance(value, str) and (is_wallet_address(value) or is_score_address(value))
+
+
+def _range_clause(start: Optional[int], end: Optional[int], column: str = "height") -> Tuple[str, list]:
+    clause, args = "", []
+    if start is not None:
+        clause += f" AND {column} >= ?"
+        args.append(start)
+    if end is not None:
+        clause += f" AND {column} <= ?"
+        args.append(end)
+    return clause, args
+
+
+class ChainStore:
+    """
+    Store of blocks, transactions, their results and event logs in a SQLite database file.
+
+    Transactions are indexed by hash and by the addresses they touch: the sender,
+    the receiver, SCORE addresses of their event logs and addresses in the logs.
+    Event logs are indexed by SCORE address and event signature.
+    Blocks are written with the checkpoint in one database transaction,
+    so the checkpoint is the last height of which everything is stored.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        :param path: path of the database file
+        :param timeout: seconds to wait for a lock of the database held by others
+        """
+        self.__path = path
+        self.__timeout = timeout
+        self.__local = local()
+        self.__connections: List[sqlite3.Connection] = []
+        self.__lock = Lock()
+        conn = self.__connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def __connection(self) -> sqlite3.Connection:
+        conn = getattr(self.__local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.__path, timeout=self.__timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.__local.conn = conn
+            with self.__lock:
+                self.__connections.append(conn)
+        return conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def checkpoint(self) -> Optional[int]:
+        """
+        The last height of which the block and everything in it are stored, or None
+        """
+        row = self.__connection().execute("SELECT value FROM meta WHERE key = ?", (CHECKPOINT_KEY,)).fetchone()
+        return None if row is None else int(row[0])
+
+    def write_block(self, block: dict, results: List[Optional[dict]]):
+        self.write_blocks([(block, results)])
+
+    def write_blocks(self, items: Iterable[Tuple[dict, List[Optional[dict]]]]):
+        """
+        Writes blocks with the results of their transactions and moves the checkpoint
+        to the last block in one database transaction.
+        Blocks and results may be converted or not. A result may be None if it's not fetched.
+
+        :param items: blocks and the results of their transactions in the order of the transactions
+        """
+        conn = self.__connection()
+        with conn:
+            height = None
+            for block, results in items:
+                height = self.__write_block(conn, block, results)
+            if height is not None:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (CHECKPOINT_KEY, str(height)))
+
+    @staticmethod
+    def __write_block(conn: sqlite3.Connection, block: dict, results: List[Optional[dict]]) -> int:
+        height = hex_to_int(block["height"])
+        block_hash = add_0x_prefix(block["hash"] if "hash" in block else block["block_hash"])
+        transactions = block.get("confirmed_transaction_list")
+        if transactions is None:
+            transactions = block.get("transactions") or []
+        timestamp = block["timestamp"] if "timestamp" in block else block.get("time_stamp")
+        conn.execute("INSERT OR REPLACE INTO blocks (height, hash, timestamp, tx_count, data) VALUES (?, ?, ?, ?, ?)",
+                     (height, block_hash, hex_to_int(timestamp), len(transactions), _dumps(block)))
+
+        for tx_index, (tx, tx_hash, result) in enumerate(zip(transactions, get_transaction_hashes(block), results)):
+            tx_hash = add_0x_prefix(tx_hash)
+            addresses = {tx.get("from"), tx.get("to")}
+            status = None
+            if result is not None:
+                status = hex_to_int(result.get("status"))
+                addresses.add(result.get("scoreAddress"))
+                for log_index, event_log in enumerate(result.get("eventLogs") or []):
+                    indexed = event_log.get("indexed") or []
+                    data = event_log.get("data") or []
+                    addresses.add(event_log["scoreAddress"])
+                    addresses.update(value for value in indexed[1:] + data if isinstance(value, str))
+                    conn.execute("INSERT OR REPLACE INTO event_logs (height, tx_index, log_index, tx_hash, "
+                                 "score_address, signature, indexed, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (height, tx_index, log_index, tx_hash, event_log["scoreAddress"],
+                                  indexed[0] if indexed else "", _dumps(indexed), _dumps(data)))
+            conn.execute("INSERT OR REPLACE INTO transactions (tx_hash, height, tx_index, from_address, to_address, "
+                         "status, data, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (tx_hash, height, tx_index, tx.get("from"), tx.get("to"), status, _dumps(tx),
+                          None if result is None else _dumps(result)))
+            conn.executemany("INSERT OR IGNORE INTO tx_addresses (address, height, tx_index, tx_hash) "
+                             "VALUES (?, ?, ?, ?)",
+                             [(address, height, tx_index, tx_hash) for address in addresses if _is_address(address)])
+        return height
+
+    def get_block(self, height: int) -> Optional[dict]:
+        row = self.__connection().execute("SELECT data FROM blocks WHERE height = ?", (height,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def get_block_by_hash(self, block_hash: str) -> Optional[dict]:
+        row = self.__connection().execute("SELECT data FROM blocks WHERE hash = ?",
+                                          (add_0x_prefix(block_hash),)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    @staticmethod
+    def __to_transaction(row: tuple) -> Dict[str, Any]:
+        tx_hash, height, tx_index, data, result = row
+        return {
+            "txHash": tx_hash,
+            "height": height,
+            "txIndex": tx_index,
+            "transaction": json.loads(data),
+            "result": None if result is None else json.loads(result),
+        }
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the transaction and its result like
+        `{"txHash": .., "height": .., "txIndex": .., "transaction": {..}, "result": {..}}`, or None
+        """
+        row = self.__connection().execute("SELECT tx_hash, height, tx_index, data, result FROM transactions "
+                                          "WHERE tx_hash = ?", (add_0x_prefix(tx_hash),)).fetchone()
+        return None if row is None else self.__to_transaction(row)
+
+    def get_transactions(self, address: str, start: Optional[int] = None, end: Optional[int] = None,
+                         limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the transactions touching the address between the heights in the order of them
+
+        Example::
+
+            for tx in store.get_transactions("hx...", 1000, 2000):
+                print(tx["height"], tx["txHash"], tx["result"]["status"])
+
+        :param address: address of an account or a SCORE
+        :param start: first height (inclusive)
+        :param end: last height (inclusive)
+        :param limit: max number of transactions
+        :return: list of transactions as `get_transaction` returns
+        """
+        clause, args = _range_clause(start, end, "a.height")
+        query = ("SELECT t.tx_hash, t.height, t.tx_index, t.data, t.result FROM tx_addresses a "
+                 "JOIN transactions t ON t.tx_hash = a.tx_hash "
+                 f"WHERE a.address = ?{clause} ORDER BY a.height, a.tx_index")
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        rows = self.__connection().execute(query, [address] + args).fetchall()
+        return [self.__to_transaction(row) for row in rows]
+
+    def get_event_logs(self, score_address: Optional[str] = None, signature: Optional[str] = None,
+                       start: Optional[int] = None, end: Optional[int] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the event logs of the SCORE and the signature between the heights in the order of them
+
+        :param score_address: address of the SCORE emitting the events
+        :param signature: event signature like `Transfer(Address,Address,int,bytes)`
+        :param start: first height (inclusive)
+        :param end: last height (inclusive)
+        :param limit: max number of event logs
+        :return: list of event logs like
+            `{"height": .., "txIndex": .., "logIndex": .., "txHash": .., "scoreAddress": .., "indexed": [..], "data": [..]}`
+        """
+        clause, args = _range_clause(start, end)
+        if score_address is not None:
+            clause += " AND score_address = ?"
+            args.append(score_address)
+        if signature is not None:
+            clause += " AND signature = ?"
+            args.append(signature)
+        query = ("SELECT height, tx_index, log_index, tx_hash, score_address, indexed, data FROM event_logs "
+                 f"WHERE 1{clause} ORDER BY height, tx_index, log_index")
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return [{
+            "height": height,
+            "txIndex": tx_index,
+            "logIndex": log_index,
+            "txHash": tx_hash,
+            "scoreAddress": address,
+            "indexed": json.loads(indexed),
+            "data": json.loads(data),
+        } for height, tx_index, log_index, tx_hash, address, indexed, data
+            in self.__connection().execute(query, args)]
+
+    def close(self):
+        with self.__lock:
+            connections, self.__connections = self.__connections, []
+        for conn in connections:
+            conn.close()
+        self.__local = local()
+
+
+class ChainIndexer:
+    """
+    Indexer storing blocks and the results of their transactions into ChainStore.
+
+    Blocks with their results are fetched concurrently and stored in the order of heights.
+    It starts from the next height of the checkpoint of the store, so a stopped or
+    crashed run resumes where it stopped.
+    """
+
+    def __init__(self, service, store: ChainStore, start: int = 0,
+                 block_version: str = "0.3",
+                 concurrency: int = 8,
+                 batch_size: int = 50,
+                 commit_interval: int = 100):
+        """
+        :param service: IconService to fetch blocks
+        :param store: store of the blocks
+        :param start: first height when the store is empty
+        :param block_version: block format version
+        :param concurrency: max number of blocks fetched at once
+        :param batch_size: max number of transaction results in a batch request
+        :param commit_interval: max number of blocks written in a database transaction
+        """
+        self.__service = service
+        self.__store = store
+        self.__start = start
+        self.__block_version = block_version
+        self.__concurrency = concurrency
+        self.__batch_size = batch_size
+        self.__commit_interval = commit_interval
+
+    @property
+    def next_height(self) -> int:
+        checkpoint = self.__store.checkpoint
+        return self.__start if checkpoint is None else checkpoint + 1
+
+    def __fetch(self, height: int) -> Tuple[dict, List[dict]]:
+        return self.__service.get_block_with_results(height, block_version=self.__block_version,
+                                                     batch_size=self.__batch_size)
+
+    def run(self, end: Optional[int] = None) -> Optional[int]:
+        """
+        Indexes the blocks from the next height up to `end`.
+        Blocks fetched before an error are stored before it's raised.
+
+        :param end: last height (inclusive). The last height of the chain by default.
+        :return: the checkpoint of the store
+        """
+        if end is None:
+            end = self.__service.get_last_height()
+        start = self.next_height
+        if start > end:
+            return self.__store.checkpoint
+
+        logger.info(f"Index blocks from {start} to {end}")
+        pending = []
+        # blocks are fetched in other threads than the ones of the service,
+        # which fetch their results
+        with ThreadPoolExecutor(self.__concurrency) as executor:
+            blocks = BlockIterator(self.__fetch, start, end, executor.submit, concurrency=self.__concurrency)
+            try:
+                for item in blocks:
+                    pending.append(item)
+                    if len(pending) >= self.__commit_interval:
+                        self.__store.write_blocks(pending)
+                        pending = []
+            finally:
+                blocks.close()
+                if pending:
+                    self.__store.write_blocks(pending)
+        return self.__store.checkpoint
+
+
+class AsyncChainIndexer:
+    """
+    Async version of ChainIndexer using AsyncIconService.
+    Writes to the store are done in the event loop.
+    """
+
+    def __init__(self, service, store: ChainStore, start: int = 0,
+                 block_version: str = "0.3",
+                 concurrency: int = 8,
+                 batch_size: int = 50,
+                 commit_interval: int = 100):
+        """
+        :param service: AsyncIconService to fetch blocks
+        :param store: store of the blocks
+        :param start: first height when the store is empty
+        :param block_version: block format version
+        :param concurrency: max number of blocks fetched at once
+        :param batch_size: max number of transaction results in a batch request
+        :param commit_interval: max number of blocks written in a database transaction
+        """
+        self.__service = service
+        self.__store = store
+        self.__start = start
+        self.__block_version = block_version
+        self.__concurrency = concurrency
+        self.__batch_size = batch_size
+        self.__commit_interval = commit_interval
+
+    @property
+    def next_height(self) -> int:
+        checkpoint = self.__store.checkpoint
+        return self.__start if checkpoint is None else checkpoint + 1
+
+    async def __fetch(self, height: int) -> Tuple[Any, List[Any]]:
+        return await self.__service.get_block_with_results(height, block_version=self.__block_version,
+                                                           batch_size=self.__batch_size)
+
+    async def run(self, end: Optional[int] = None) -> Optional[int]:
+        """
+        Async version of ChainIndexer.run
+        """
+        if end is None:
+            end = await self.__service.get_last_height()
+        start = self.next_height
+        if start > end:
+            return self.__store.checkpoint
+
+        logger.info(f"Index blocks from {start} to {end}")
+        pending = []
+        async with AsyncBlockIterator(self.__fetch, start, end, concurrency=self.__concurrency) as blocks:
+            try:
+                async for item in blocks:
+                    pending.append(item)
+                    if len(pending) >= self.__commit_interval:
+                        self.__store.write_blocks(pending)
+                        pending = []
+            finally:
+                if pending:
+                    self.__store.write_blocks(pending)
+        return self.__store.checkpoint
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Optional
+
+from iconsdk import logger
+from iconsdk.exception import IconServiceBaseException
+from iconsdk.monitor import BlockMonitorSpec
+from iconsdk.providers.provider import MonitorTimeoutException
+from iconsdk.utils import retrieve_exception
+from iconsdk.utils.converter import convert_block
+
+
+def _check_range(start: int, end: int, concurrency: int):
+    if start < 0 or end < start - 1:
+        raise ValueError(f"Invalid range start={start} end={end}")
+    if concurrency < 1:
+        raise ValueError(f"Invalid concurrency {concurrency}")
+
+
+def fetch_with_retry(fetch: Callable[[int], Any], height: int, retries: int, retry_delay: float) -> Any:
+    """
+    Calls `fetch(height)`, retrying it up to `retries` times with exponential backoff
+    """
+    attempt = 0
+    while True:
+        try:
+            return fetch(height)
+        except (Exception, IconServiceBaseException) as e:
+            if attempt >= retries:
+                raise
+            delay = retry_delay * (2 ** attempt)
+            attempt += 1
+            logger.info(f"Retry fetching {height} in {delay}s by {e!r}")
+            time.sleep(delay)
+
+
+async def fetch_with_retry_async(fetch: Callable[[int], Awaitable[Any]], height: int,
+                                 retries: int, retry_delay: float) -> Any:
+    """
+    Async version of `fetch_with_retry`
+    """
+    attempt = 0
+    while True:
+        try:
+            return await fetch(height)
+        except (Exception, IconServiceBaseException) as e:
+            if attempt >= retries:
+                raise
+            delay = retry_delay * (2 ** attempt)
+            attempt += 1
+            logger.info(f"Retry fetching {height} in {delay}s by {e!r}")
+            await asyncio.sleep(delay)
+
+
+class BlockIterator:
+    """
+    Iterator fetching items by height concurrently and yielding them in the order of heights.
+
+    At most `concurrency` items are fetched or kept ahead of the consumer.
+    `next_height` is the height of the item to be yielded next. When the iteration fails,
+    it stays at the failed height; iterating again retries from it, and a new iterator
+    starting from it resumes the iteration.
+    """
+
+    def __init__(self, fetch: Callable[[int], Any], start: int, end: int,
+                 submit: Callable[..., Future],
+                 concurrency: int = 8,
+                 retries: int = 3,
+                 retry_delay: float = 0.1):
+        """
+        :param fetch: function returning the item of a height
+        :param start: first height
+        :param end: last height (inclusive)
+        :param submit: function running a function in a thread (e.g. `ThreadPoolExecutor.submit`)
+        :param concurrency: max number of items fetched ahead
+        :param retries: max number of retries of a height
+        :param retry_delay: seconds to wait before the first retry. It doubles on each retry.
+        """
+        _check_range(start, end, concurrency)
+        self.__fetch = fetch
+        self.__end = end
+        self.__submit = submit
+        self.__concurrency = concurrency
+        self.__retries = retries
+        self.__retry_delay = retry_delay
+        self.__next_height = start
+        self.__scheduled = start
+        self.__window: Deque[Future] = deque()
+
+    @property
+    def next_height(self) -> int:
+        return self.__next_height
+
+    @property
+    def end(self) -> int:
+        return self.__end
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __fill(self):
+        while len(self.__window) < self.__concurrency and self.__scheduled <= self.__end:
+            self.__window.append(self.__submit(fetch_with_retry, self.__fetch, self.__scheduled,
+                                               self.__retries, self.__retry_delay))
+            self.__scheduled += 1
+
+    def __next__(self) -> Any:
+        if self.__next_height > self.__end:
+            raise StopIteration
+        self.__fill()
+        future = self.__window.popleft()
+        try:
+            item = future.result()
+        except BaseException:
+            self.close()
+            raise
+        self.__next_height += 1
+        self.__fill()
+        return item
+
+    def close(self):
+        """
+        Cancels the fetches ahead. Iterating again fetches them again.
+        """
+        while self.__window:
+            self.__window.pop().cancel()
+        self.__scheduled = self.__next_height
+
+
+class AsyncBlockIterator:
+    """
+    Async version of BlockIterator running fetches in tasks
+    """
+
+    def __init__(self, fetch: Callable[[int], Awaitable[Any]], start: int, end: int,
+                 concurrency: int = 8,
+                 retries: int = 3,
+                 retry_delay: float = 0.1):
+        """
+        :param fetch: coroutine function returning the item of a height
+        :param start: first height
+        :param end: last height (inclusive)
+        :param concurrency: max number of items fetched ahead
+        :param retries: max number of retries of a height
+        :param retry_delay: seconds to wait before the first retry. It doubles on each retry.
+        """
+        _check_range(start, end, concurrency)
+        self.__fetch = fetch
+        self.__end = end
+        self.__concurrency = concurrency
+        self.__retries = retries
+        self.__retry_delay = retry_delay
+        self.__next_height = start
+        self.__scheduled = start
+        self.__window: Deque[asyncio.Future] = deque()
+
+    @property
+    def next_height(self) -> int:
+        return self.__next_height
+
+    @property
+    def end(self) -> int:
+        return self.__end
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __fill(self):
+        while len(self.__window) < self.__concurrency and self.__scheduled <= self.__end:
+            self.__window.append(asyncio.ensure_future(fetch_with_retry_async(
+                self.__fetch, self.__scheduled, self.__retries, self.__retry_delay)))
+            self.__scheduled += 1
+
+    async def __anext__(self) -> Any:
+        if self.__next_height > self.__end:
+            raise StopAsyncIteration
+        self.__fill()
+        task = self.__window[0]
+        try:
+            item = await asyncio.shield(task)
+        except BaseException:
+            self.close()
+            raise
+        self.__window.popleft()
+        self.__next_height += 1
+        self.__fill()
+        return item
+
+    def close(self):
+        """
+        Cancels the fetches ahead. Iterating again fetches them again.
+        """
+        while self.__window:
+            task = self.__window.pop()
+            task.cancel()
+            task.add_done_callback(retrieve_exception)
+        self.__scheduled = self.__next_height
+
+
+class AsyncBlockStream:
+    """
+    Async iterator of the blocks from a height, which never ends.
+
+    It fetches the blocks up to the last one concurrently, then follows new blocks
+    with a block monitor from the next height. Notified heights below `next_height`
+    are skipped, and heights skipped by notifications are fetched, so each block is
+    yielded once in the order of heights. While the monitor is not available,
+    it polls the last height and tries to monitor again after `reconnect_delay`.
+
+    A block is yielded after `next_height` passes it, so `next_height` is
+    the checkpoint to resume from.
+    """
+
+    def __init__(self, service, start: int,
+                 block_version: str = "0.3",
+                 convert: bool = True,
+                 concurrency: int = 8,
+                 retries: int = 3,
+                 poll_interval: float = 1.0,
+                 reconnect_delay: float = 5.0,
+                 read_timeout: Optional[float] = 30.0):
+        """
+        :param service: AsyncIconService to get blocks and monitor them
+        :param start: height of the first block
+        :param block_version: returning block format version
+        :param convert: whether blocks are converted as `IconService.get_block` does
+        :param concurrency: max number of blocks fetched ahead while catching up
+        :param retries: max number of retries of a request
+        :param poll_interval: seconds between polls of the last height without the monitor
+        :param reconnect_delay: seconds to poll before monitoring again
+        :param read_timeout: seconds to wait for a notification before polling.
+            It should be longer than the block interval.
+        """
+        _check_range(start, start, concurrency)
+        self.__service = service
+        self.__next_height = start
+        self.__block_version = block_version
+        self.__convert = convert
+        self.__concurrency = concurrency
+        self.__retries = retries
+        self.__poll_interval = poll_interval
+        self.__reconnect_delay = reconnect_delay
+        self.__read_timeout = read_timeout
+        self.__blocks: Optional[AsyncIterator] = None
+
+    @property
+    def next_height(self) -> int:
+        return self.__next_height
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.__blocks is None:
+            self.__blocks = self.__run()
+        return await self.__blocks.__anext__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Stops the stream, closing the monitor
+        """
+        if self.__blocks is not None:
+            await self.__blocks.aclose()
+
+    async def __get_block(self, height: int) -> Any:
+        return await self.__service.get_block(height, block_version=self.__block_version)
+
+    async def __last_height(self) -> int:
+        return await fetch_with_retry_async(lambda _: self.__service.get_last_height(), 0, self.__retries, 0.1)
+
+    async def __fetch_to(self, end: int):
+        if end < self.__next_height:
+            return
+        async with AsyncBlockIterator(self.__get_block, self.__next_height, end,
+                                      concurrency=self.__concurrency, retries=self.__retries) as blocks:
+            async for block in blocks:
+                self.__next_height = blocks.next_height
+                yield convert_block(block, self.__block_version) if self.__convert else block
+
+    async def __poll(self, duration: float):
+        until = time.monotonic() + duration
+        while True:
+            async with _aclosing(self.__fetch_to(await self.__last_height())) as blocks:
+                async for block in blocks:
+                    yield block
+            if time.monotonic() >= until:
+                return
+            await asyncio.sleep(self.__poll_interval)
+
+    async def __follow(self):
+        monitor = await self.__service.monitor(BlockMonitorSpec(self.__next_height))
+        try:
+            while True:
+                try:
+                    notification = await monitor.read(timeout=self.__read_timeout)
+                except MonitorTimeoutException:
+                    logger.info(f"No block notification in {self.__read_timeout}s")
+                    return
+                async with _aclosing(self.__fetch_to(int(notification["height"], 16))) as blocks:
+                    async for block in blocks:
+                        yield block
+        finally:
+            await monitor.close()
+
+    async def __run(self):
+        while True:
+            async with _aclosing(self.__poll(0)) as blocks:
+                async for block in blocks:
+                    yield block
+            try:
+                async with _aclosing(self.__follow()) as blocks:
+                    async for block in blocks:
+                        yield block
+                continue
+            except (Exception, IconServiceBaseException) as e:
+                logger.info(f"Poll blocks from {self.__next_height} by monitor failure {e!r}")
+            async with _aclosing(self.__poll(self.__reconnect_delay)) as blocks:
+                async for block in blocks:
+                    yield block
+
+
+@asynccontextmanager
+async def _aclosing(blocks):
+    try:
+        yield blocks
+    finally:
+        await blocks.aclose()
@@ -31,6 +31,15 @@ from iconsdk.providers.provider import MonitorSpec
 from iconsdk.utils.typing.conversion import object_to_str
 
 
+def _match_values(expected: List[Any], values: List[Any]) -> bool:
+    for i, value in enumerate(expected):
+        if value is None:
+            continue
+        if i >= len(values) or object_to_str(value) != values[i]:
+            return False
+    return True
+
+
 class EventFilter:
     def __init__(self, event: str, addr: str, indexed: int, *args):
         self.__event = event
@@ -38,6 +47,36 @@ class EventFilter:
         self.__indexed = list(args[0:indexed])
         self.__data = list(args[indexed:])
 
+    @property
+    def event(self) -> str:
+        return self.__event
+
+    @property
+    def addr(self) -> str | None:
+        return self.__addr
+
+    @property
+    def indexed(self) -> List[Any]:
+        return self.__indexed
+
+    @property
+    def data(self) -> List[Any]:
+        return self.__data
+
+    def matches(self, event_log: Dict[str, Any]) -> bool:
+        """
+        Returns whether the event log matches the filter as the node does
+
+        :param event_log: event log with `scoreAddress`, `indexed` and `data`
+        """
+        indexed = event_log.get("indexed") or []
+        if not indexed or indexed[0] != self.__event:
+            return False
+        if self.__addr is not None and event_log.get("scoreAddress") != self.__addr:
+            return False
+        return (_match_values(self.__indexed, indexed[1:])
+                and _match_values(self.__data, event_log.get("data") or []))
+
     def apply_to(self, obj: Dict[str, Any]):
         obj.update({
             "event": self.__event,
@@ -68,6 +107,13 @@ class EventMonitorSpec(MonitorSpec):
             self.__filters = filters
         self.__progress_interval = progress_interval
 
+    @property
+    def height(self) -> int | None:
+        return self.__height
+
+    def with_height(self, height: int) -> EventMonitorSpec:
+        return EventMonitorSpec(height, self.__filters, self.__logs, self.__progress_interval)
+
     def get_path(self) -> str:
         return 'event'
 
@@ -104,6 +150,13 @@ class BlockMonitorSpec(MonitorSpec):
         else:
             self.__filters = filters
 
+    @property
+    def height(self) -> int | None:
+        return self.__height
+
+    def with_height(self, height: int) -> BlockMonitorSpec:
+        return BlockMonitorSpec(height, self.__filters, self.__logs)
+
     def get_path(self) -> str:
         return 'block'
 
@@ -113,10 +166,11 @@ class BlockMonitorSpec(MonitorSpec):
             params["height"] = self.__height
         if self.__logs:
             params["logs"] = True
-        if len(self.__filters) == 1:
-            self.__filters[0].apply_to(params)
-        else:
-            params["eventFilters"] = list(map(lambda a: a.as_dict(), self.__filters))
+        if self.__filters:
+            if len(self.__filters) == 1:
+                self.__filters[0].apply_to(params)
+            else:
+                params["eventFilters"] = list(map(lambda a: a.as_dict(), self.__filters))
         return object_to_str(params)
 
 
@@ -139,6 +193,13 @@ class BTPMonitorSpec(MonitorSpec):
         self.__proof_flag = proof_flag
         self.__progress_interval = progress_interval
 
+    @property
+    def height(self) -> int | None:
+        return self.__height
+
+    def with_height(self, height: int) -> BTPMonitorSpec:
+        return BTPMonitorSpec(height, self.__network_id, self.__proof_flag, self.__progress_interval)
+
     def get_path(self) -> str:
         return 'btp'
 
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock, local
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional
+
+
+def apply_args(fn: Callable, args: Any) -> Any:
+    """
+    Calls the function with the arguments.
+    A tuple is passed as positional arguments, a dict as keyword arguments,
+    and any other value as the only argument.
+    """
+    if isinstance(args, tuple):
+        return fn(*args)
+    if isinstance(args, dict):
+        return fn(**args)
+    return fn(args)
+
+
+class ParallelExecutor:
+    """
+    Thread pool running calls concurrently.
+
+    The threads are started on the first call. Submitting waits while
+    `max_pending` calls are queued or running, so a fast producer can't queue
+    an unbounded number of calls.
+    Calls submitted from the threads of the executor run in the calling thread,
+    as waiting for them in a thread could deadlock when all the threads wait.
+    """
+
+    def __init__(self, max_workers: int = 10, max_pending: Optional[int] = None):
+        """
+        :param max_workers: number of threads
+        :param max_pending: max number of calls queued or running. 4 times `max_workers` by default
+        """
+        if max_workers < 1:
+            raise ValueError(f"Invalid max_workers {max_workers}")
+        self.__max_workers = max_workers
+        self.__pending = BoundedSemaphore(max_pending or max_workers * 4)
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__lock = Lock()
+        self.__local = local()
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(self.__max_workers, thread_name_prefix="iconsdk",
+                                                     initializer=self.__init_worker)
+            return self.__executor
+
+    def __init_worker(self):
+        self.__local.worker = True
+
+    @property
+    def in_worker(self) -> bool:
+        """
+        Whether the current thread is a thread of the executor
+        """
+        return getattr(self.__local, "worker", False)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Runs the function in a thread, waiting while too many calls are pending
+
+        :return: future of the result
+        """
+        if self.in_worker:
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        self.__pending.acquire()
+        try:
+            future = self.__get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            self.__pending.release()
+            raise
+        future.add_done_callback(lambda _: self.__pending.release())
+        return future
+
+    def map(self, fn: Callable, iterable: Iterable[Any],
+            max_workers: Optional[int] = None,
+            return_exceptions: bool = False) -> Iterator[Any]:
+        """
+        Calls the function with each item of the iterable concurrently.
+        Items are taken lazily as the results are consumed, keeping
+        at most `max_workers` calls in flight.
+
+        :param fn: function to call
+        :param iterable: arguments of each call (see `apply_args`)
+        :param max_workers: max number of calls running at once. `max_workers` of the executor by default
+        :param return_exceptions: whether the error of a call is returned in place of its result.
+            If it's false, the error is raised when its result is reached.
+        :return: iterator of the results in the order of the items
+        """
+        window = min(max_workers or self.__max_workers, self.__max_workers)
+        futures: Deque[Future] = deque()
+
+        def result_of(future: Future) -> Any:
+            error = future.exception()
+            if error is None:
+                return future.result()
+            if return_exceptions:
+                return error
+            raise error
+
+        try:
+            for args in iterable:
+                futures.append(self.submit(apply_args, fn, args))
+                if len(futures) >= window:
+                    yield result_of(futures.popleft())
+            while futures:
+                yield result_of(futures.popleft())
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait: bool = True):
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -14,20 +14,30 @@
 # limitations under the License.
 
 import asyncio
-import json
+from contextlib import asynccontextmanager
 from json import JSONDecodeError
 from time import monotonic
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
 
 import aiohttp
 from ..exception import JSONRPCException, HTTPError
 
 from .async_provider import AsyncMonitor, AsyncProvider
+from .codec import JSONCodec, get_codec
+from .failures import is_endpoint_failure
+from .methods import is_long_polling_payload, is_read_method, is_write_payload, request_key
 
-from .provider import (MonitorSpec,
-                       MonitorTimeoutException)
+from .provider import (BatchEntry,
+                       MonitorSpec,
+                       MonitorTimeoutException,
+                       map_batch_response)
+from .single_flight import AsyncSingleFlight
+from .throttle import OVERLOAD_STATUS, AdaptiveConcurrencyLimiter, RateLimiter
 from .url_map import URLMap
 
+# timeout to read frames received already. aiohttp takes no timeout for zero.
+DRAIN_TIMEOUT = 0.001
+
 
 class AIOHTTPProvider(AsyncProvider):
     """
@@ -37,23 +47,121 @@ class AIOHTTPProvider(AsyncProvider):
 
     def __init__(self, full_path_url: str,
                  request_kwargs: Optional[Dict[str, Any]] = None,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 ttl_dns_cache: Optional[int] = 10,
+                 keepalive_timeout: float = 15.0,
+                 single_flight: bool = False,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 codec: Union[None, str, JSONCodec] = None,
                  ):
         """
         Initializes AIOHTTPProvider.
 
         :param full_path_url: The URL of the ICON node's JSON-RPC endpoint (e.g., "https://ctz.solidwallet.io/api/v3/icon_dex").
                               It should include channel name if you want to use socket.
-        :param session: An optional existing aiohttp ClientSession. If None, a new session is created.
-                        Using an external session is recommended for better resource management.
         :param request_kwargs: Optional dictionary of keyword arguments to pass to aiohttp session requests
                                (e.g., {'timeout': 10}).
+        :param session: An optional existing aiohttp ClientSession. If None, a session is created on the first
+                        request and closed by `close()`. An external session is never closed by the provider.
+        :param limit: Total number of simultaneous connections of the created session (0 for no limit).
+        :param limit_per_host: Number of simultaneous connections to the same endpoint (0 for no limit).
+        :param ttl_dns_cache: Seconds to cache resolved addresses (None to cache forever).
+        :param keepalive_timeout: Seconds to keep an idle connection alive for reuse.
+        :param single_flight: Whether identical read requests made at the same time are sent once
+                              and share the response. The shared result must not be modified.
+        :param rate_limiter: Rate limits of requests to the endpoint.
+        :param concurrency_limiter: Limit of requests in flight to the endpoint.
+                                    Requests over the limit wait for others to end.
+        :param codec: JSON codec or its name ("json", "orjson" or "msgspec").
+                      The standard json module by default.
         """
         self._url = URLMap(full_path_url)
         self._request_kwargs = request_kwargs or {}
         if 'headers' not in self._request_kwargs:
             self._request_kwargs['headers'] = {'Content-Type': 'application/json'}
         self._request_id = 0  # Simple counter for JSON-RPC request IDs
+        self._session = session
+        self._own_session = session is None
+        self._connector_kwargs = {
+            'limit': limit,
+            'limit_per_host': limit_per_host,
+            'ttl_dns_cache': ttl_dns_cache,
+            'keepalive_timeout': keepalive_timeout,
+        }
+        self._single_flight = AsyncSingleFlight() if single_flight else None
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._codec = get_codec(codec)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared session, creating it on the first use.
+        It must be called in the event loop which the session is used in.
+        """
+        if self._session is None or (self._own_session and self._session.closed):
+            connector = aiohttp.TCPConnector(**self._connector_kwargs)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._own_session = True
+        return self._session
 
+    async def close(self):
+        """
+        Closes the session created by the provider with its pooled connections.
+        """
+        session = self._session
+        if session is not None and self._own_session:
+            self._session = None
+            await session.close()
+
+    def _make_payload(self, method: str, params: Optional[Dict[str, Any]] = None) -> dict:
+        self._request_id += 1
+
+        payload: dict = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "id": self._request_id,
+        }
+        if params is not None:
+            payload["params"] = params
+        return payload
+
+    @asynccontextmanager
+    async def _post(self, request_url: str, data: Union[dict, list]) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Posts the JSON-RPC request within the limits of the provider
+        """
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async(is_write_payload(data))
+        limiter = self._concurrency_limiter
+        if limiter is not None:
+            await limiter.acquire_async()
+        started = monotonic()
+        overloaded = False
+        measured = not is_long_polling_payload(data)
+        try:
+            body = self._codec.dumps(data)
+            async with self._get_session().post(request_url, data=body, **self._request_kwargs) as response:
+                overloaded = response.status in OVERLOAD_STATUS
+                yield response
+        except asyncio.CancelledError:
+            # e.g. the slower copy of a hedged request
+            measured = False
+            raise
+        except BaseException as e:
+            overloaded = overloaded or is_endpoint_failure(e)
+            raise
+        finally:
+            if limiter is not None:
+                limiter.release(monotonic() - started if measured else None, overloaded)
 
     async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False) -> Any:
         """
@@ -68,22 +176,19 @@ class AIOHTTPProvider(AsyncProvider):
         :raise JsonRpcError: If the JSON-RPC response contains an error object.
         :raise ValueError: If the response is not valid JSON or missing expected fields.
         """
-        self._request_id += 1
-
-        payload: dict = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "id": self._request_id,
-        }
-        if params is not None:
-            payload["params"] = params
+        if self._single_flight is not None and is_read_method(method):
+            return await self._single_flight.do(request_key(method, params, full_response),
+                                                lambda: self._make_request(method, params, full_response))
+        return await self._make_request(method, params, full_response)
 
+    async def _make_request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                            full_response: bool = False) -> Any:
+        payload = self._make_payload(method, params)
         request_url = self._url.for_rpc(method.split('_')[0])
         try:
-            async with aiohttp.ClientSession() as session:
-                response = await session.post(request_url, json=payload, **self._request_kwargs)
+            async with self._post(request_url, payload) as response:
                 # Raise exception for non-2xx HTTP status codes
-                resp_json = await response.json()
+                resp_json = self._codec.loads(await response.read())
                 if full_response:
                     return resp_json
 
@@ -98,6 +203,43 @@ class AIOHTTPProvider(AsyncProvider):
             raw_response = await response.text()
             raise HTTPError(raw_response, response.status)
 
+    async def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        """
+        Sends the requests in a JSON-RPC batch.
+        Requests for different endpoints (e.g. `debug_*`) are sent in separate batches concurrently.
+
+        :param entries: list of (method, params) to request
+        :param full_response: whether it returns whole responses instead of results
+        :return: results in the order of the requests. It has the exception
+            instead of the result for the failed request.
+        """
+        payloads = [self._make_payload(*entry) for entry in entries]
+        groups: Dict[str, List[int]] = {}
+        for idx, payload in enumerate(payloads):
+            request_url = self._url.for_rpc(payload["method"].split('_')[0])
+            groups.setdefault(request_url, []).append(idx)
+
+        async def send(request_url: str, batch: List[dict]) -> List[Any]:
+            async with self._post(request_url, batch) as response:
+                try:
+                    content = self._codec.loads(await response.read())
+                except JSONDecodeError:
+                    content = None
+                if isinstance(content, (dict, list)):
+                    return map_batch_response([payload["id"] for payload in batch], content, full_response)
+                raw_response = await response.text()
+                return [HTTPError(raw_response, response.status) for _ in batch]
+
+        group_items = list(groups.items())
+        group_results = await asyncio.gather(*[
+            send(request_url, [payloads[idx] for idx in indexes]) for request_url, indexes in group_items
+        ])
+        results: List[Any] = [None] * len(payloads)
+        for (_, indexes), batch_results in zip(group_items, group_results):
+            for idx, result in zip(indexes, batch_results):
+                results[idx] = result
+        return results
+
     async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
         """
         Creates a monitor for receiving real-time events via WebSocket (Not Implemented).
@@ -109,16 +251,19 @@ class AIOHTTPProvider(AsyncProvider):
         """
         ws_url = self._url.for_ws(spec.get_path())
         params = spec.get_request()
-        monitor = AIOWebSocketMonitor(aiohttp.ClientSession(), ws_url, params, keep_alive=keep_alive)
+        monitor = AIOWebSocketMonitor(self._get_session(), ws_url, params, keep_alive=keep_alive, codec=self._codec)
         await monitor._connect()
         return monitor
 
 class AIOWebSocketMonitor(AsyncMonitor):
-    def __init__(self, session: aiohttp.ClientSession, url: str, params: dict, keep_alive: Optional[float] = None):
+    def __init__(self, session: aiohttp.ClientSession, url: str, params: dict, keep_alive: Optional[float] = None,
+                 codec: Union[None, str, JSONCodec] = None):
         self.__session = session
         self.__url = url
         self.__params = params
         self.__keep_alive = keep_alive or 30
+        self.__codec = get_codec(codec)
+        self.__error: Optional[Exception] = None
         self.__ws = None
 
     async def __aenter__(self):
@@ -134,10 +279,10 @@ class AIOWebSocketMonitor(AsyncMonitor):
         if self.__ws is not None:
             raise Exception("WebSocket is already connected")
         self.__ws = await self.__session.ws_connect(self.__url)
-        await self.__ws.send_json(self.__params)
+        await self.__send_json(self.__params)
         result = await self.__read_json(None)
         if 'code' not in result:
-            raise Exception(f'invalid response={json.dumps(result)}')
+            raise Exception(f'invalid response={result!r}')
         if result['code'] != 0:
             raise Exception(f'fail to monitor err={result["message"]}')
 
@@ -147,7 +292,18 @@ class AIOWebSocketMonitor(AsyncMonitor):
             self.__ws = None
             await ws.close()
 
-    async def __read_json(self, timeout: Optional[float] = None) -> any:
+    @property
+    def codec(self) -> JSONCodec:
+        """
+        Codec to decode the frames read without parsing
+        """
+        return self.__codec
+
+    async def __send_json(self, obj: Any):
+        # ICON nodes take text frames only
+        await self.__ws.send_str(self.__codec.dumps(obj).decode())
+
+    async def __read_json(self, timeout: Optional[float] = None, parse: bool = True) -> any:
         now = monotonic()
         limit = None
         if timeout is not None:
@@ -159,17 +315,51 @@ class AIOWebSocketMonitor(AsyncMonitor):
                     timeout_left = min(limit - now, self.__keep_alive)
                 else:
                     timeout_left = self.__keep_alive
-                msg = await self.__ws.receive_json(timeout=timeout_left)
-                return msg
+                if parse:
+                    return await self.__ws.receive_json(loads=self.__codec.loads, timeout=timeout_left)
+                return await self.__ws.receive_str(timeout=timeout_left)
             except asyncio.TimeoutError as e:
                 now = monotonic()
                 if limit is None or now < limit:
-                    await self.__ws.send_json({"keepalive": "0x1"})
+                    await self.__send_json({"keepalive": "0x1"})
                     continue
                 else:
                     raise MonitorTimeoutException()
             except Exception as e:
                 raise e
 
+    def __raise_error(self):
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
     async def read(self, timeout: Optional[float] = None) -> any:
+        self.__raise_error()
         return await self.__read_json(timeout=timeout)
+
+    async def read_many(self, max_items: int = 100, max_wait: Optional[float] = None,
+                        parse: bool = True) -> List[Any]:
+        """
+        Read the notifications received already, waiting for the first one
+
+        :param max_items: max number of notifications to read
+        :param max_wait: timeout to wait for the first notification in fraction of seconds
+        :param parse: whether it decodes the frames. If it's False, it returns the frames as they are,
+            to be decoded later with `codec` if needed.
+        :return: notifications. It's empty if it passes the timeout.
+            An error after reading some notifications is raised on the next read.
+        """
+        self.__raise_error()
+        items = []
+        try:
+            items.append(await self.__read_json(timeout=max_wait, parse=parse))
+            while len(items) < max_items:
+                # received frames are taken without waiting for the timeout
+                items.append(await self.__read_json(timeout=DRAIN_TIMEOUT, parse=parse))
+        except MonitorTimeoutException:
+            pass
+        except Exception as e:
+            if not items:
+                raise
+            self.__error = e
+        return items
@@ -1,7 +1,9 @@
+import asyncio
 from abc import ABCMeta, abstractmethod
 
-from .provider import MonitorSpec
-from typing import Any, Dict, Optional
+from ..exception import IconServiceBaseException
+from .provider import BatchEntry, MonitorSpec, MonitorTimeoutException
+from typing import Any, Dict, List, Optional, Sequence
 
 
 class AsyncMonitor(metaclass=ABCMeta):
@@ -15,6 +17,29 @@ class AsyncMonitor(metaclass=ABCMeta):
         """
         pass
 
+    async def __aiter__(self):
+        """
+        Iterates the notifications, reading them without timeout
+        """
+        while True:
+            yield await self.read()
+
+    async def read_many(self, max_items: int = 100, max_wait: Optional[float] = None) -> List[Any]:
+        """
+        Read the notifications received already, waiting for the first one
+
+        This default implementation reads only the first one.
+        Monitors on sockets take all the frames buffered in them.
+
+        :param max_items: max number of notifications to read
+        :param max_wait: timeout to wait for the first notification in fraction of seconds
+        :return: notifications. It's empty if it passes the timeout.
+        """
+        try:
+            return [await self.read(max_wait)]
+        except MonitorTimeoutException:
+            return []
+
     @abstractmethod
     async def close(self):
         """
@@ -40,6 +65,26 @@ class AsyncProvider(metaclass=ABCMeta):
     async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
         raise NotImplementedError("Providers must implement this method")
 
+    async def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        """
+        Make multiple requests at once
+
+        Providers supporting JSON-RPC 2.0 batch send them in one request.
+        This default implementation sends them concurrently.
+
+        :param entries: list of (method, params) to request
+        :param full_response: whether it returns whole responses instead of results
+        :return: results in the order of the requests. It has the exception
+            instead of the result for the failed request.
+        """
+        async def capture(entry: BatchEntry):
+            try:
+                return await self.make_request(*entry, full_response=full_response)
+            except (Exception, IconServiceBaseException) as e:
+                return e
+
+        return list(await asyncio.gather(*[capture(entry) for entry in entries]))
+
     @abstractmethod
     async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
         """
@@ -47,4 +92,12 @@ class AsyncProvider(metaclass=ABCMeta):
         :param spec: Monitoring spec
         :param keep_alive: Keep-alive message interval in fraction of seconds
         """
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+    async def close(self):
+        """
+        Close the provider
+
+        It releases related resources like pooled connections.
+        """
+        pass
@@ -0,0 +1,560 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import count
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from iconsdk import logger
+from iconsdk.exception import IconServiceBaseException
+from iconsdk.providers.aiohttp_provider import AIOHTTPProvider
+from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.failures import is_endpoint_failure
+from iconsdk.providers.hedging import HedgePolicy
+from iconsdk.providers.http_provider import HTTPProvider
+from iconsdk.providers.methods import is_read_batch, is_read_method
+from iconsdk.providers.provider import BatchEntry, Monitor, MonitorSpec, Provider
+from iconsdk.utils import retrieve_exception
+from iconsdk.utils.converter import hex_to_int
+
+POLICY_ROUND_ROBIN = "round_robin"
+POLICY_LEAST_OUTSTANDING = "least_outstanding"
+POLICY_EWMA = "ewma"
+POLICIES = (POLICY_ROUND_ROBIN, POLICY_LEAST_OUTSTANDING, POLICY_EWMA)
+
+
+class Endpoint:
+    """
+    State of an endpoint in the pool
+    """
+
+    def __init__(self, name: str, provider: Union[Provider, AsyncProvider]):
+        self.name = name
+        self.provider = provider
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.height: Optional[int] = None
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def __repr__(self):
+        return (f"Endpoint(name={self.name!r},outstanding={self.outstanding},latency={self.latency},"
+                f"failures={self.failures},ejections={self.ejections},height={self.height})")
+
+
+class EndpointPool:
+    """
+    Selects endpoints by the policy and ejects unhealthy ones.
+
+    An endpoint is ejected after `max_failures` consecutive failures or when
+    its block height lags behind the others by more than `max_lag`.
+    It becomes available again after the ejection time, which doubles
+    on each ejection in a row up to `max_eject_time`. The first request after it
+    probes the endpoint; a success restores it and a failure ejects it again.
+    """
+
+    def __init__(self, endpoints: Iterable[Endpoint],
+                 policy: str = POLICY_ROUND_ROBIN,
+                 max_failures: int = 3,
+                 eject_time: float = 5.0,
+                 max_eject_time: float = 300.0,
+                 max_lag: int = 10,
+                 ewma_decay: float = 0.3):
+        self.__endpoints = list(endpoints)
+        if not self.__endpoints:
+            raise ValueError("No endpoints")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, it should be one of {POLICIES}")
+        self.__policy = policy
+        self.__max_failures = max_failures
+        self.__eject_time = eject_time
+        self.__max_eject_time = max_eject_time
+        self.__max_lag = max_lag
+        self.__ewma_decay = ewma_decay
+        self.__lock = Lock()
+        self.__sequence = count()
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return list(self.__endpoints)
+
+    def select(self, exclude: Sequence[Endpoint] = ()) -> Optional[Endpoint]:
+        """
+        Selects an endpoint and counts a request on it
+
+        :param exclude: endpoints not to select
+        :return: the endpoint or None if all are excluded. If all the others are ejected,
+            it returns the one to be available first.
+        """
+        now = monotonic()
+        with self.__lock:
+            candidates = [ep for ep in self.__endpoints if ep not in exclude]
+            if not candidates:
+                return None
+            available = [ep for ep in candidates if ep.available(now)]
+            if available:
+                endpoint = self.__choose(available)
+            else:
+                endpoint = min(candidates, key=lambda ep: ep.ejected_until)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def __choose(self, endpoints: List[Endpoint]) -> Endpoint:
+        if self.__policy == POLICY_LEAST_OUTSTANDING:
+            return min(endpoints, key=lambda ep: ep.outstanding)
+        elif self.__policy == POLICY_EWMA:
+            # endpoints without measurement are tried first, and the latency is
+            # weighted by the outstanding requests to spread a burst of requests.
+            return min(endpoints, key=lambda ep: (ep.latency or 0.0) * (ep.outstanding + 1))
+        return endpoints[next(self.__sequence) % len(endpoints)]
+
+    def on_success(self, endpoint: Endpoint, latency: float):
+        with self.__lock:
+            endpoint.outstanding -= 1
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.__ewma_decay * (latency - endpoint.latency)
+            endpoint.failures = 0
+            if endpoint.ejections > 0 and endpoint.available(monotonic()):
+                logger.info(f"Endpoint {endpoint.name} is restored")
+                endpoint.ejections = 0
+
+    def on_failure(self, endpoint: Endpoint, error: BaseException):
+        """
+        Counts the end of the request failed on the endpoint
+
+        :return: whether the error is caused by the endpoint
+        """
+        failure = is_endpoint_failure(error)
+        with self.__lock:
+            endpoint.outstanding -= 1
+            if failure:
+                self.__count_failure(endpoint)
+        return failure
+
+    def on_cancel(self, endpoint: Endpoint):
+        with self.__lock:
+            endpoint.outstanding -= 1
+
+    def __count_failure(self, endpoint: Endpoint):
+        endpoint.failures += 1
+        now = monotonic()
+        probing = endpoint.ejections > 0 and endpoint.available(now)
+        if probing or endpoint.failures >= self.__max_failures:
+            self.__eject(endpoint, now, f"{endpoint.failures} failures")
+
+    def __eject(self, endpoint: Endpoint, now: float, reason: str):
+        eject_time = min(self.__eject_time * (2 ** endpoint.ejections), self.__max_eject_time)
+        endpoint.ejected_until = now + eject_time
+        endpoint.ejections += 1
+        endpoint.failures = 0
+        logger.warning(f"Endpoint {endpoint.name} is ejected for {eject_time}s by {reason}")
+
+    def update_heights(self, heights: Dict[Endpoint, Union[int, BaseException]]):
+        """
+        Updates the block heights of the endpoints and ejects lagging ones
+
+        :param heights: the last block height or the error got from each endpoint
+        """
+        now = monotonic()
+        with self.__lock:
+            for endpoint, height in heights.items():
+                if isinstance(height, BaseException):
+                    if is_endpoint_failure(height):
+                        self.__count_failure(endpoint)
+                else:
+                    endpoint.height = height
+            known = [height for height in heights.values() if not isinstance(height, BaseException)]
+            if not known:
+                return
+            top = max(known)
+            for endpoint, height in heights.items():
+                if isinstance(height, BaseException) or not endpoint.available(now):
+                    continue
+                if top - height > self.__max_lag:
+                    self.__eject(endpoint, now, f"lagging {top - height} blocks")
+
+
+def _make_endpoints(endpoints: Iterable[Union[str, Provider, AsyncProvider]], factory) -> List[Endpoint]:
+    result = []
+    for endpoint in endpoints:
+        if isinstance(endpoint, str):
+            result.append(Endpoint(endpoint, factory(endpoint)))
+        else:
+            result.append(Endpoint(str(endpoint), endpoint))
+    return result
+
+
+class LoadBalancingProvider(Provider):
+    """
+    Provider spreading requests over multiple nodes.
+
+    Each URL is handled by its own HTTPProvider. Read requests failed by an endpoint
+    are sent again to another one. Health of the endpoints is checked
+    in the background if `health_check_interval` is set.
+    """
+
+    def __init__(self, endpoints: Iterable[Union[str, Provider]],
+                 policy: str = POLICY_ROUND_ROBIN,
+                 request_kwargs: Optional[dict] = None,
+                 health_check_interval: Optional[float] = None,
+                 failover: bool = True,
+                 provider_options: Optional[dict] = None,
+                 hedge: Optional[HedgePolicy] = None,
+                 max_hedge_workers: int = 10,
+                 **pool_options):
+        """
+        :param endpoints: full path URLs (e.g. "https://ctz.solidwallet.io/api/v3") or providers of the nodes
+        :param policy: one of "round_robin", "least_outstanding" and "ewma" (lowest latency)
+        :param request_kwargs: kwargs for requests of HTTPProvider made for URLs
+        :param health_check_interval: seconds between checks of the block heights of the endpoints
+        :param failover: whether read requests failed by an endpoint are sent to another
+        :param provider_options: options of HTTPProvider made for URLs (e.g. {'pool_size': 20})
+        :param hedge: policy to send slow read requests to another endpoint as well.
+            The slower answer is discarded, as a running request of HTTPProvider can't be cancelled.
+            Batch requests and monitors aren't hedged.
+        :param max_hedge_workers: max number of threads running the attempts of hedged requests
+        :param pool_options: options of EndpointPool (max_failures, eject_time, max_eject_time, max_lag, ewma_decay)
+        """
+        options = provider_options or {}
+        self._pool = EndpointPool(
+            _make_endpoints(endpoints, lambda url: HTTPProvider(url, request_kwargs=request_kwargs or {}, **options)),
+            policy, **pool_options)
+        self._failover = failover
+        self._hedge = hedge
+        self._max_hedge_workers = max_hedge_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._health_check_interval = health_check_interval
+        self._health_checker: Optional[Thread] = None
+        self._closed = Event()
+        self._lock = Lock()
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return self._pool.endpoints
+
+    def __str__(self):
+        return f"LoadBalancingProvider({', '.join(ep.name for ep in self._pool.endpoints)})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _start_health_check(self):
+        if self._health_check_interval is None or self._health_checker is not None:
+            return
+        with self._lock:
+            if self._health_checker is None and not self._closed.is_set():
+                self._health_checker = Thread(target=self._run_health_check, name="health-check", daemon=True)
+                self._health_checker.start()
+
+    def _run_health_check(self):
+        while not self._closed.wait(self._health_check_interval):
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.warning(f"Health check failed: {e!r}")
+
+    def check_health(self):
+        """
+        Checks the last block heights of all the endpoints
+        """
+        heights = {}
+        for endpoint in self._pool.endpoints:
+            try:
+                heights[endpoint] = hex_to_int(endpoint.provider.make_request('icx_getLastBlock')["height"])
+            except (Exception, IconServiceBaseException) as e:
+                heights[endpoint] = e
+        self._pool.update_heights(heights)
+
+    def _attempt(self, endpoint: Endpoint, method: str, fn, hedge: bool):
+        started = monotonic()
+        try:
+            result = fn(endpoint.provider)
+        except (Exception, IconServiceBaseException) as e:
+            self._pool.on_failure(endpoint, e)
+            raise
+        except BaseException:
+            self._pool.on_cancel(endpoint)
+            raise
+        latency = monotonic() - started
+        self._pool.on_success(endpoint, latency)
+        if hedge:
+            self._hedge.record(method, latency)
+        return result
+
+    def _call(self, method: str, fn, read: bool, hedge: bool = True):
+        """
+        Calls the function with providers of endpoints
+
+        :param method: JSON-RPC method of the request, or a name of the call for logs
+        :param read: whether the call only reads the chain, so it may fail over to another endpoint
+        :param hedge: whether the call may be hedged, recording its latency for the method
+        """
+        self._start_health_check()
+        hedge = hedge and self._hedge is not None and self._hedge.applies_to(method)
+        if hedge and len(self._pool.endpoints) > 1:
+            delay = self._hedge.begin(method)
+            if delay is not None:
+                return self._call_hedged(method, fn, delay)
+        return self._call_with_failover(method, fn, read, [], hedge)
+
+    def _call_with_failover(self, method: str, fn, read: bool, tried: List[Endpoint], hedge: bool):
+        while True:
+            endpoint = self._pool.select(tried)
+            tried.append(endpoint)
+            try:
+                return self._attempt(endpoint, method, fn, hedge)
+            except (Exception, IconServiceBaseException) as e:
+                if self._failover and read and is_endpoint_failure(e) \
+                        and len(tried) < len(self._pool.endpoints):
+                    logger.info(f"Retry {method} on another endpoint by {e!r} from {endpoint.name}")
+                    continue
+                raise
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self._max_hedge_workers, thread_name_prefix="hedge")
+        return self._executor
+
+    def _call_hedged(self, method: str, fn, delay: float):
+        executor = self._get_executor()
+        primary = self._pool.select()
+        attempts = {executor.submit(self._attempt, primary, method, fn, True): primary}
+        done, pending = wait(attempts, timeout=delay)
+        if not done and self._hedge.try_hedge():
+            secondary = self._pool.select([primary])
+            logger.debug(f"Hedge {method} to {secondary.name} after {delay}s")
+            attempts[executor.submit(self._attempt, secondary, method, fn, True)] = secondary
+            pending = set(attempts)
+
+        error = None
+        while pending or done:
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            done, pending = wait(pending, return_when=FIRST_COMPLETED) if pending else (set(), set())
+
+        if self._failover and is_endpoint_failure(error) and len(attempts) < len(self._pool.endpoints):
+            logger.info(f"Retry {method} on another endpoint by {error!r}")
+            return self._call_with_failover(method, fn, True, list(attempts.values()), True)
+        raise error
+
+    def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        return self._call(method, lambda provider: provider.make_request(method, params, full_response),
+                          is_read_method(method))
+
+    def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        return self._call('batch', lambda provider: provider.make_batch_request(entries, full_response),
+                          is_read_batch(entries), hedge=False)
+
+    def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> Monitor:
+        return self._call('monitor', lambda provider: provider.make_monitor(spec, keep_alive),
+                          read=True, hedge=False)
+
+    def close(self):
+        self._closed.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        for endpoint in self._pool.endpoints:
+            endpoint.provider.close()
+
+
+class AsyncLoadBalancingProvider(AsyncProvider):
+    """
+    Async version of LoadBalancingProvider.
+    Each URL is handled by its own AIOHTTPProvider.
+    """
+
+    def __init__(self, endpoints: Iterable[Union[str, AsyncProvider]],
+                 policy: str = POLICY_ROUND_ROBIN,
+                 request_kwargs: Optional[dict] = None,
+                 health_check_interval: Optional[float] = None,
+                 failover: bool = True,
+                 provider_options: Optional[dict] = None,
+                 hedge: Optional[HedgePolicy] = None,
+                 **pool_options):
+        """
+        :param endpoints: full path URLs (e.g. "https://ctz.solidwallet.io/api/v3") or providers of the nodes
+        :param policy: one of "round_robin", "least_outstanding" and "ewma" (lowest latency)
+        :param request_kwargs: kwargs for requests of AIOHTTPProvider made for URLs
+        :param health_check_interval: seconds between checks of the block heights of the endpoints
+        :param failover: whether read requests failed by an endpoint are sent to another
+        :param provider_options: options of AIOHTTPProvider made for URLs (e.g. {'limit_per_host': 20})
+        :param hedge: policy to send slow read requests to another endpoint as well.
+            The slower request is cancelled. Batch requests and monitors aren't hedged.
+        :param pool_options: options of EndpointPool (max_failures, eject_time, max_eject_time, max_lag, ewma_decay)
+        """
+        options = provider_options or {}
+        self._pool = EndpointPool(
+            _make_endpoints(endpoints, lambda url: AIOHTTPProvider(url, request_kwargs=request_kwargs or {}, **options)),
+            policy, **pool_options)
+        self._failover = failover
+        self._hedge = hedge
+        self._health_check_interval = health_check_interval
+        self._health_checker: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return self._pool.endpoints
+
+    def __str__(self):
+        return f"AsyncLoadBalancingProvider({', '.join(ep.name for ep in self._pool.endpoints)})"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _start_health_check(self):
+        if self._health_check_interval is None or self._health_checker is not None or self._closed:
+            return
+        self._health_checker = asyncio.ensure_future(self._run_health_check())
+
+    async def _run_health_check(self):
+        while True:
+            await asyncio.sleep(self._health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.warning(f"Health check failed: {e!r}")
+
+    async def check_health(self):
+        """
+        Checks the last block heights of all the endpoints
+        """
+        endpoints = self._pool.endpoints
+
+        async def height_of(endpoint: Endpoint):
+            try:
+                block = await endpoint.provider.make_request('icx_getLastBlock')
+                return hex_to_int(block["height"])
+            except (Exception, IconServiceBaseException) as e:
+                return e
+
+        heights = await asyncio.gather(*[height_of(endpoint) for endpoint in endpoints])
+        self._pool.update_heights(dict(zip(endpoints, heights)))
+
+    async def _attempt(self, endpoint: Endpoint, method: str, fn, hedge: bool):
+        started = monotonic()
+        try:
+            result = await fn(endpoint.provider)
+        except (Exception, IconServiceBaseException) as e:
+            self._pool.on_failure(endpoint, e)
+            raise
+        except BaseException:
+            self._pool.on_cancel(endpoint)
+            raise
+        latency = monotonic() - started
+        self._pool.on_success(endpoint, latency)
+        if hedge:
+            self._hedge.record(method, latency)
+        return result
+
+    async def _call(self, method: str, fn, read: bool, hedge: bool = True):
+        """
+        Calls the function with providers of endpoints
+
+        :param method: JSON-RPC method of the request, or a name of the call for logs
+        :param read: whether the call only reads the chain, so it may fail over to another endpoint
+        :param hedge: whether the call may be hedged, recording its latency for the method
+        """
+        self._start_health_check()
+        hedge = hedge and self._hedge is not None and self._hedge.applies_to(method)
+        if hedge and len(self._pool.endpoints) > 1:
+            delay = self._hedge.begin(method)
+            if delay is not None:
+                return await self._call_hedged(method, fn, delay)
+        return await self._call_with_failover(method, fn, read, [], hedge)
+
+    async def _call_with_failover(self, method: str, fn, read: bool, tried: List[Endpoint], hedge: bool):
+        while True:
+            endpoint = self._pool.select(tried)
+            tried.append(endpoint)
+            try:
+                return await self._attempt(endpoint, method, fn, hedge)
+            except (Exception, IconServiceBaseException) as e:
+                if self._failover and read and is_endpoint_failure(e) \
+                        and len(tried) < len(self._pool.endpoints):
+                    logger.info(f"Retry {method} on another endpoint by {e!r} from {endpoint.name}")
+                    continue
+                raise
+
+    async def _call_hedged(self, method: str, fn, delay: float):
+        primary = self._pool.select()
+        attempts = {asyncio.ensure_future(self._attempt(primary, method, fn, True)): primary}
+        for task in attempts:
+            task.add_done_callback(retrieve_exception)
+        try:
+            done, pending = await asyncio.wait(attempts, timeout=delay)
+            if not done and self._hedge.try_hedge():
+                secondary = self._pool.select([primary])
+                logger.debug(f"Hedge {method} to {secondary.name} after {delay}s")
+                hedged = asyncio.ensure_future(self._attempt(secondary, method, fn, True))
+                hedged.add_done_callback(retrieve_exception)
+                attempts[hedged] = secondary
+                pending = set(attempts)
+
+            error = None
+            while pending or done:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED) \
+                    if pending else (set(), set())
+        finally:
+            for task in attempts:
+                task.cancel()
+
+        if self._failover and is_endpoint_failure(error) and len(attempts) < len(self._pool.endpoints):
+            logger.info(f"Retry {method} on another endpoint by {error!r}")
+            return await self._call_with_failover(method, fn, True, list(attempts.values()), True)
+        raise error
+
+    async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        return await self._call(method, lambda provider: provider.make_request(method, params, full_response),
+                                is_read_method(method))
+
+    async def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        return await self._call('batch', lambda provider: provider.make_batch_request(entries, full_response),
+                                is_read_batch(entries), hedge=False)
+
+    async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
+        return await self._call('monitor', lambda provider: provider.make_monitor(spec, keep_alive),
+                                read=True, hedge=False)
+
+    async def close(self):
+        self._closed = True
+        if self._health_checker is not None:
+            self._health_checker.cancel()
+            self._health_checker = None
+        for endpoint in self._pool.endpoints:
+            await endpoint.provider.close()
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from threading import Lock, local
+from typing import Any, List, NamedTuple, Optional, Union
+
+from iconsdk.providers.codec import JSONCodec, get_codec
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class Cache(metaclass=ABCMeta):
+    """
+    Cache of JSON values by string keys.
+    Each `get()` returns a new copy of the value, so it can be modified by the caller.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        :return: the value or None if it's not cached
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class LRUCache(Cache):
+    """
+    In-memory cache evicting the least recently used values.
+    Values are kept encoded, so the size limit is on the actual bytes of them.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024,
+                 max_entries: Optional[int] = None,
+                 codec: Union[None, str, JSONCodec] = None):
+        """
+        :param max_bytes: max total size of the encoded values
+        :param max_entries: max number of the values. No limit by default
+        :param codec: codec encoding the values
+        """
+        if max_bytes < 1:
+            raise ValueError(f"Invalid max_bytes {max_bytes}")
+        self.__max_bytes = max_bytes
+        self.__max_entries = max_entries
+        self.__codec = get_codec(codec)
+        self.__entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__lock = Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__entries
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.get_bytes(key)
+        return None if data is None else self.__codec.loads(data)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        with self.__lock:
+            data = self.__entries.get(key)
+            if data is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return data
+
+    def set(self, key: str, value: Any):
+        self.set_bytes(key, self.__codec.dumps(value))
+
+    def set_bytes(self, key: str, data: bytes):
+        if len(data) > self.__max_bytes:
+            return
+        with self.__lock:
+            old = self.__entries.pop(key, None)
+            if old is not None:
+                self.__size -= len(old)
+            self.__entries[key] = data
+            self.__size += len(data)
+            while self.__size > self.__max_bytes or \
+                    (self.__max_entries is not None and len(self.__entries) > self.__max_entries):
+                _, evicted = self.__entries.popitem(last=False)
+                self.__size -= len(evicted)
+                self.__evictions += 1
+
+    def stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(self.__hits, self.__misses, self.__evictions, len(self.__entries), self.__size)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+
+class SQLiteCache(Cache):
+    """
+    Cache in a SQLite database file, which can be shared by processes.
+
+    The database is in WAL mode so readers don't block a writer. When the total size
+    of the values exceeds `max_bytes`, the values stored earliest are evicted.
+    Call `compact()` to give the space of evicted values back to the file system.
+    """
+    # number of values stored between checks of the size
+    CHECK_INTERVAL = 100
+
+    def __init__(self, path: str,
+                 max_bytes: Optional[int] = None,
+                 codec: Union[None, str, JSONCodec] = None,
+                 timeout: float = 30.0):
+        """
+        :param path: path of the database file
+        :param max_bytes: max total size of the encoded values. No limit by default
+        :param codec: codec encoding the values
+        :param timeout: seconds to wait for a lock of the database held by others
+        """
+        self.__path = path
+        self.__max_bytes = max_bytes
+        self.__codec = get_codec(codec)
+        self.__timeout = timeout
+        self.__local = local()
+        self.__connections: List[sqlite3.Connection] = []
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__stored = 0
+        conn = self.__connection()
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                         "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, stored REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_stored ON cache (stored)")
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def __connection(self) -> sqlite3.Connection:
+        conn = getattr(self.__local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.__path, timeout=self.__timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.__local.conn = conn
+            with self.__lock:
+                self.__connections.append(conn)
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.get_bytes(key)
+        return None if data is None else self.__codec.loads(data)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        row = self.__connection().execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        with self.__lock:
+            if row is None:
+                self.__misses += 1
+                return None
+            self.__hits += 1
+        return row[0]
+
+    def set(self, key: str, value: Any):
+        self.set_bytes(key, self.__codec.dumps(value))
+
+    def set_bytes(self, key: str, data: bytes):
+        if self.__max_bytes is not None and len(data) > self.__max_bytes:
+            return
+        conn = self.__connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO cache (key, value, size, stored) VALUES (?, ?, ?, ?)",
+                         (key, sqlite3.Binary(data), len(data), time.time()))
+        with self.__lock:
+            self.__stored += 1
+            check = self.__stored % self.CHECK_INTERVAL == 1
+        if check and self.__max_bytes is not None:
+            self.evict()
+
+    def evict(self):
+        """
+        Evicts the values stored earliest until the total size is under 90% of `max_bytes`
+        """
+        if self.__max_bytes is None:
+            return
+        conn = self.__connection()
+        with conn:
+            total = conn.execute("SELECT total(size) FROM cache").fetchone()[0]
+            if total <= self.__max_bytes:
+                return
+            excess = total - self.__max_bytes * 0.9
+            keys = []
+            for key, size in conn.execute("SELECT key, size FROM cache ORDER BY stored"):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM cache WHERE key = ?", keys)
+        with self.__lock:
+            self.__evictions += len(keys)
+
+    def compact(self):
+        """
+        Shrinks the database file, releasing the space of removed values
+        """
+        conn = self.__connection()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+    def stats(self) -> CacheStats:
+        entries, size = self.__connection().execute("SELECT count(*), total(size) FROM cache").fetchone()
+        with self.__lock:
+            return CacheStats(self.__hits, self.__misses, self.__evictions, entries, int(size))
+
+    def clear(self):
+        conn = self.__connection()
+        with conn:
+            conn.execute("DELETE FROM cache")
+
+    def close(self):
+        with self.__lock:
+            connections, self.__connections = self.__connections, []
+        for conn in connections:
+            conn.close()
+        self.__local = local()
+
+
+class TieredCache(Cache):
+    """
+    Cache looking up a fast cache first and a large one next,
+    like LRUCache in front of SQLiteCache.
+    Values found in the large cache are copied to the fast one.
+    """
+
+    def __init__(self, fast: Cache, large: Cache):
+        self.__fast = fast
+        self.__large = large
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.__fast.get(key)
+        if value is None:
+            value = self.__large.get(key)
+            if value is not None:
+                self.__fast.set(key, value)
+        with self.__lock:
+            if value is None:
+                self.__misses += 1
+            else:
+                self.__hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        self.__fast.set(key, value)
+        self.__large.set(key, value)
+
+    def stats(self) -> CacheStats:
+        """
+        :return: hits of both caches, and the evictions, entries and size of the large one
+        """
+        large = self.__large.stats()
+        with self.__lock:
+            return CacheStats(self.__hits, self.__misses, large.evictions, large.entries, large.size)
+
+    def clear(self):
+        self.__fast.clear()
+        self.__large.clear()
+
+    def close(self):
+        self.__fast.close()
+        self.__large.close()
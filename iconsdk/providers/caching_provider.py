@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.cache import Cache
+from iconsdk.providers.methods import canonical_params
+from iconsdk.providers.provider import BatchEntry, Monitor, MonitorSpec, Provider
+
+# Methods whose results never change once they are returned
+IMMUTABLE_METHODS = frozenset({
+    "icx_getBlockByHeight",
+    "icx_getBlockByHash",
+    "icx_getTransactionByHash",
+    "icx_getTransactionResult",
+    "icx_getDataByHash",
+    "icx_getBlockHeaderByHeight",
+    "icx_getVotesByHeight",
+})
+
+# Methods whose results are fixed when they are requested at a height
+HEIGHT_PINNED_METHODS = frozenset({
+    "icx_call",
+    "icx_getBalance",
+    "icx_getScoreApi",
+    "icx_getScoreStatus",
+    "icx_getTotalSupply",
+    "btp_getNetworkInfo",
+    "btp_getNetworkTypeInfo",
+    "btp_getMessages",
+    "btp_getHeader",
+    "btp_getProof",
+})
+
+# Methods whose results are final only after the transaction is in a block
+_TRANSACTION_METHODS = frozenset({
+    "icx_getTransactionByHash",
+    "icx_getTransactionResult",
+})
+
+
+def _canonical_height(height: Any) -> Any:
+    try:
+        return hex(int(height, 16) if isinstance(height, str) else height)
+    except (TypeError, ValueError):
+        return height
+
+
+def cache_key(method: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Returns the key to cache the result of the request.
+    Queries of the state are cached only if they are pinned to a height.
+
+    :return: the key or None if the result may change
+    """
+    if method == "icx_getBlock":
+        # the last block is requested without height and hash
+        if not params or not ("height" in params or "hash" in params):
+            return None
+    elif method in HEIGHT_PINNED_METHODS:
+        if not params or params.get("height") is None:
+            return None
+        params = dict(params, height=_canonical_height(params["height"]))
+    elif method not in IMMUTABLE_METHODS:
+        return None
+    return f"{method}:{canonical_params(params)}"
+
+
+def is_final(method: str, result: Any) -> bool:
+    """
+    Returns whether the result of the cacheable request won't change
+    """
+    if result is None:
+        return False
+    if method in _TRANSACTION_METHODS:
+        return isinstance(result, dict) and "blockHeight" in result
+    return True
+
+
+class CachingProvider(Provider):
+    """
+    Provider caching results of requests for data which never changes,
+    like blocks by height or hash, transactions and their results,
+    and queries of the state at a height (e.g. icx_call with height).
+    Requests for full responses aren't cached.
+    """
+
+    def __init__(self, provider: Provider, cache: Cache):
+        """
+        :param provider: provider to send requests
+        :param cache: cache of the results (e.g. LRUCache())
+        """
+        self.__provider = provider
+        self.__cache = cache
+
+    @property
+    def provider(self) -> Provider:
+        return self.__provider
+
+    @property
+    def cache(self) -> Cache:
+        return self.__cache
+
+    def __str__(self):
+        return f"CachingProvider({self.__provider})"
+
+    def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        key = None if full_response else cache_key(method, params)
+        if key is None:
+            return self.__provider.make_request(method, params, full_response)
+        result = self.__cache.get(key)
+        if result is None:
+            result = self.__provider.make_request(method, params, full_response)
+            if is_final(method, result):
+                self.__cache.set(key, result)
+        return result
+
+    def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        """
+        Sends the requests whose results are not cached in a batch
+        """
+        if full_response:
+            return self.__provider.make_batch_request(entries, full_response)
+        results, keys, misses = _lookup(self.__cache, entries)
+        if misses:
+            fetched = self.__provider.make_batch_request([entries[idx] for idx in misses])
+            _store(self.__cache, entries, results, keys, misses, fetched)
+        return results
+
+    def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> Monitor:
+        return self.__provider.make_monitor(spec, keep_alive)
+
+    def close(self):
+        self.__provider.close()
+
+
+class AsyncCachingProvider(AsyncProvider):
+    """
+    Async version of CachingProvider
+    """
+
+    def __init__(self, provider: AsyncProvider, cache: Cache):
+        """
+        :param provider: provider to send requests
+        :param cache: cache of the results (e.g. LRUCache())
+        """
+        self.__provider = provider
+        self.__cache = cache
+
+    @property
+    def provider(self) -> AsyncProvider:
+        return self.__provider
+
+    @property
+    def cache(self) -> Cache:
+        return self.__cache
+
+    def __str__(self):
+        return f"AsyncCachingProvider({self.__provider})"
+
+    async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        key = None if full_response else cache_key(method, params)
+        if key is None:
+            return await self.__provider.make_request(method, params, full_response)
+        result = self.__cache.get(key)
+        if result is None:
+            result = await self.__provider.make_request(method, params, full_response)
+            if is_final(method, result):
+                self.__cache.set(key, result)
+        return result
+
+    async def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        """
+        Sends the requests whose results are not cached in a batch
+        """
+        if full_response:
+            return await self.__provider.make_batch_request(entries, full_response)
+        results, keys, misses = _lookup(self.__cache, entries)
+        if misses:
+            fetched = await self.__provider.make_batch_request([entries[idx] for idx in misses])
+            _store(self.__cache, entries, results, keys, misses, fetched)
+        return results
+
+    async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
+        return await self.__provider.make_monitor(spec, keep_alive)
+
+    async def close(self):
+        await self.__provider.close()
+
+
+def _lookup(cache: Cache, entries: Sequence[BatchEntry]):
+    results: List[Any] = [None] * len(entries)
+    keys: List[Optional[str]] = []
+    misses: List[int] = []
+    for idx, entry in enumerate(entries):
+        key = cache_key(*entry)
+        keys.append(key)
+        cached = None if key is None else cache.get(key)
+        if cached is None:
+            misses.append(idx)
+        else:
+            results[idx] = cached
+    return results, keys, misses
+
+
+def _store(cache: Cache, entries: Sequence[BatchEntry], results: List[Any],
+           keys: List[Optional[str]], misses: List[int], fetched: List[Any]):
+    for idx, result in zip(misses, fetched):
+        results[idx] = result
+        key = keys[idx]
+        if key is not None and not isinstance(result, BaseException) and is_final(entries[idx][0], result):
+            cache.set(key, result)
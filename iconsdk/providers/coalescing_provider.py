@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..exception import IconServiceBaseException
+from .async_provider import AsyncMonitor, AsyncProvider
+from .provider import BatchEntry, MonitorSpec
+
+
+class CoalescingAsyncProvider(AsyncProvider):
+    """
+    Async provider collecting requests made within a short window
+    and sending them in one JSON-RPC batch request through the wrapped provider.
+
+    Callers use it like any other provider. Each gets its own result or exception.
+    """
+
+    def __init__(self, provider: AsyncProvider, max_delay: float = 0.002, max_batch_size: int = 100):
+        """
+        :param provider: provider sending the batch requests (e.g. AIOHTTPProvider)
+        :param max_delay: seconds to wait for other requests after the first one of a batch
+        :param max_batch_size: number of requests sending the batch immediately
+        """
+        if max_delay < 0:
+            raise ValueError(f"Invalid max_delay {max_delay}")
+        if max_batch_size < 1:
+            raise ValueError(f"Invalid max_batch_size {max_batch_size}")
+        self.__provider = provider
+        self.__max_delay = max_delay
+        self.__max_batch_size = max_batch_size
+        # pending requests and their timers by full_response flag, which applies to a whole batch
+        self.__pending: Dict[bool, List[Tuple[BatchEntry, asyncio.Future]]] = {False: [], True: []}
+        self.__timers: Dict[bool, Optional[asyncio.TimerHandle]] = {False: None, True: None}
+        self.__tasks: Set[asyncio.Task] = set()
+
+    @property
+    def provider(self) -> AsyncProvider:
+        return self.__provider
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self.__pending[full_response]
+        pending.append(((method, params), future))
+        if len(pending) >= self.__max_batch_size:
+            self.__flush(full_response)
+        elif self.__timers[full_response] is None:
+            self.__timers[full_response] = loop.call_later(self.__max_delay, self.__flush, full_response)
+        return await future
+
+    async def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        return await self.__provider.make_batch_request(entries, full_response)
+
+    def __flush(self, full_response: bool):
+        timer = self.__timers[full_response]
+        if timer is not None:
+            timer.cancel()
+            self.__timers[full_response] = None
+        pending = self.__pending[full_response]
+        self.__pending[full_response] = []
+        # skip requests whose callers are gone
+        pending = [(entry, future) for entry, future in pending if not future.done()]
+        if not pending:
+            return
+        task = asyncio.ensure_future(self.__send(pending, full_response))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __send(self, pending: List[Tuple[BatchEntry, asyncio.Future]], full_response: bool):
+        try:
+            if len(pending) == 1:
+                entry, future = pending[0]
+                results = [await self.__provider.make_request(*entry, full_response=full_response)]
+            else:
+                results = await self.__provider.make_batch_request([entry for entry, _ in pending], full_response)
+        except (Exception, IconServiceBaseException) as e:
+            results = [e] * len(pending)
+        except asyncio.CancelledError:
+            for _, future in pending:
+                future.cancel()
+            raise
+
+        for (_, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
+        return await self.__provider.make_monitor(spec, keep_alive)
+
+    async def close(self):
+        """
+        Sends pending requests, waits for them and closes the wrapped provider.
+        """
+        for full_response in (False, True):
+            self.__flush(full_response)
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+        await self.__provider.close()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from json import JSONDecodeError
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+class JSONCodec:
+    """
+    Encodes and decodes JSON messages.
+    Decoding works on bytes as well as str, and invalid JSON raises `JSONDecodeError`.
+    """
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    JSON codec using orjson.
+    Values orjson can't encode (e.g. integers over 64 bits) are encoded by the standard json module.
+    Note that orjson decodes integers over 64 bits as floats. ICON JSON-RPC encodes numbers
+    as hex strings, so it matters only for custom data in them.
+    """
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    JSON codec using msgspec
+    """
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self.__encoder = msgspec.json.Encoder()
+        self.__decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self.__encoder.encode(obj)
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        try:
+            return self.__decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+
+
+CODECS = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+}
+
+_default_codec: Optional[JSONCodec] = None
+
+
+def default_codec() -> JSONCodec:
+    """
+    Returns the codec of the standard json module, used unless a codec is chosen.
+    Faster codecs are opt-in, as orjson decodes integers over 64 bits as floats.
+    """
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = JSONCodec()
+    return _default_codec
+
+
+def get_codec(codec: Union[None, str, JSONCodec] = None) -> JSONCodec:
+    """
+    Returns the codec
+
+    :param codec: codec, name of the codec ("json", "orjson" or "msgspec") or None for the default codec
+    """
+    if codec is None:
+        return default_codec()
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}, it should be one of {tuple(CODECS)}")
+        return CODECS[codec]()
+    return codec
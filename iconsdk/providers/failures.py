@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import socket
+
+import aiohttp
+import requests
+from urllib3.exceptions import NewConnectionError
+from websocket import (WebSocketAddressException, WebSocketBadStatusException, WebSocketException,
+                       WebSocketProxyException)
+
+from iconsdk.exception import HTTPError
+
+# HTTP status codes meaning that the node is unavailable or overloaded
+UNAVAILABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def is_endpoint_failure(e: BaseException) -> bool:
+    """
+    Returns whether the error is caused by the endpoint rather than the request,
+    like connection failures, timeouts and 5xx responses.
+    Socket errors and WebSocket errors of monitors are failures of the endpoint as well.
+    JSON-RPC errors answered by the node are not failures of the endpoint.
+    """
+    if isinstance(e, HTTPError):
+        return e.status in UNAVAILABLE_STATUS
+    if isinstance(e, requests.RequestException):
+        # they are OSError, but some of them like InvalidURL are errors of the request
+        return isinstance(e, (requests.ConnectionError, requests.Timeout))
+    return isinstance(e, (OSError, WebSocketException, aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def is_connect_error(e: BaseException) -> bool:
+    """
+    Returns whether the request failed before the connection to the endpoint is made,
+    so the endpoint hasn't got the request.
+    """
+    if isinstance(e, (requests.ConnectTimeout, aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)):
+        return True
+    if isinstance(e, (ConnectionRefusedError, socket.gaierror, WebSocketAddressException,
+                      WebSocketBadStatusException, WebSocketProxyException)):
+        # the socket or the handshake of a WebSocket failed
+        return True
+    if isinstance(e, requests.ConnectionError) and e.args:
+        return isinstance(getattr(e.args[0], "reason", e.args[0]), NewConnectionError)
+    return False
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from threading import Lock, Thread
+from weakref import WeakKeyDictionary
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from iconsdk import logger
+from iconsdk.exception import IconServiceBaseException
+from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.codec import JSONCodec, get_codec
+from iconsdk.providers.provider import BatchEntry, Monitor, MonitorSpec, Provider
+
+# Methods returning the last block; icx_getBlock does it without params
+HEAD_METHODS = frozenset({
+    "icx_getLastBlock",
+    "icx_getBlock",
+})
+
+
+def height_of(block: Dict[str, Any]) -> int:
+    """
+    Returns the height of the block or the notification.
+    It's an int in blocks of version 0.1a and a hex string in others.
+    """
+    height = block["height"]
+    return int(height, 16) if isinstance(height, str) else height
+
+
+class _Head:
+    def __init__(self):
+        self.data: Optional[bytes] = None
+        self.height = -1
+        self.fetched_at = 0.0
+        self.lock = Lock()
+        # asyncio locks by event loop
+        self.async_locks: WeakKeyDictionary = WeakKeyDictionary()
+
+
+class HeadCache:
+    """
+    Cache of the last block for a short time.
+
+    Only one thread or coroutine requests the last block when it has expired,
+    and the others get the same block. With `follow()` or `afollow()`,
+    notifications of a block monitor make it expire as soon as a new block is made.
+    """
+
+    def __init__(self, ttl: float = 0.5, codec: Union[None, str, JSONCodec] = None, max_silence: float = 10.0):
+        """
+        :param ttl: seconds to keep the last block
+        :param codec: codec keeping the block, so each caller gets its own copy
+        :param max_silence: seconds to trust the last notified height while a monitor is followed.
+            A monitor which stalls without closing notifies nothing, so the last block is requested after it.
+        """
+        self.__ttl = ttl
+        self.__max_silence = max_silence
+        self.__codec = get_codec(codec)
+        self.__heads: Dict[str, _Head] = {method: _Head() for method in HEAD_METHODS}
+        self.__notified_height = -1
+        self.__notified_at = 0.0
+        self.__following = 0
+        self.__lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self) -> float:
+        return self.__ttl
+
+    @property
+    def notified_height(self) -> Optional[int]:
+        """
+        The last height notified within `max_silence` while a monitor is followed, or within the ttl after it
+        """
+        if self.__notified_height < 0:
+            return None
+        max_age = self.__max_silence if self.__following > 0 else self.__ttl
+        if monotonic() - self.__notified_at > max_age:
+            return None
+        return self.__notified_height
+
+    def __set_following(self, delta: int):
+        with self.__lock:
+            self.__following += delta
+
+    def __fresh(self, head: _Head) -> Optional[Any]:
+        if head.data is None or monotonic() - head.fetched_at > self.__ttl:
+            return None
+        if head.height < self.__notified_height and head.fetched_at < self.__notified_at:
+            return None
+        return self.__codec.loads(head.data)
+
+    def __store(self, head: _Head, block: Any, started: float):
+        head.data = self.__codec.dumps(block)
+        head.height = height_of(block)
+        head.fetched_at = started
+
+    def __count(self, hit: bool):
+        with self.__lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, method: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the last block, calling `fetch` to get it if it's expired
+
+        :param method: method of the request of the last block
+        :param fetch: function requesting the last block
+        """
+        head = self.__heads[method]
+        block = self.__fresh(head)
+        if block is None:
+            with head.lock:
+                block = self.__fresh(head)
+                if block is None:
+                    started = monotonic()
+                    block = fetch()
+                    self.__store(head, block, started)
+                    self.__count(False)
+                    return block
+        self.__count(True)
+        return block
+
+    async def get_async(self, method: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of `get()`
+        """
+        head = self.__heads[method]
+        block = self.__fresh(head)
+        if block is None:
+            loop = asyncio.get_running_loop()
+            lock = head.async_locks.get(loop)
+            if lock is None:
+                lock = head.async_locks[loop] = asyncio.Lock()
+            async with lock:
+                block = self.__fresh(head)
+                if block is None:
+                    started = monotonic()
+                    block = await fetch()
+                    self.__store(head, block, started)
+                    self.__count(False)
+                    return block
+        self.__count(True)
+        return block
+
+    def notify(self, height: int):
+        """
+        Tells that a block of the height is made, so cached blocks under it expire
+        """
+        with self.__lock:
+            if height >= self.__notified_height:
+                self.__notified_height = height
+                self.__notified_at = monotonic()
+
+    def follow(self, monitor: Monitor) -> Thread:
+        """
+        Reads notifications of the block monitor in a daemon thread until it's closed
+
+        :param monitor: monitor made with BlockMonitorSpec
+        :return: the thread reading the monitor
+        """
+        def run():
+            self.__set_following(1)
+            try:
+                while True:
+                    self.notify(height_of(monitor.read()))
+            except (Exception, IconServiceBaseException) as e:
+                logger.info(f"Stop following blocks by {e!r}")
+            finally:
+                self.__set_following(-1)
+
+        thread = Thread(target=run, name="head-follower", daemon=True)
+        thread.start()
+        return thread
+
+    def afollow(self, monitor: AsyncMonitor) -> asyncio.Task:
+        """
+        Reads notifications of the block monitor in a task until it's closed or the task is cancelled
+
+        :param monitor: monitor made with BlockMonitorSpec
+        :return: the task reading the monitor
+        """
+        async def run():
+            self.__set_following(1)
+            try:
+                while True:
+                    self.notify(height_of(await monitor.read()))
+            except (Exception, IconServiceBaseException) as e:
+                logger.info(f"Stop following blocks by {e!r}")
+            finally:
+                self.__set_following(-1)
+
+        task = asyncio.ensure_future(run())
+        return task
+
+
+def _is_head_request(method: str, params: Optional[Dict[str, Any]], full_response: bool) -> bool:
+    return method in HEAD_METHODS and not params and not full_response
+
+
+class HeadCachingProvider(Provider):
+    """
+    Provider sharing the last block among callers within the ttl of the HeadCache
+    """
+
+    def __init__(self, provider: Provider, head: HeadCache):
+        self.__provider = provider
+        self.__head = head
+
+    @property
+    def provider(self) -> Provider:
+        return self.__provider
+
+    @property
+    def head(self) -> HeadCache:
+        return self.__head
+
+    def __str__(self):
+        return f"HeadCachingProvider({self.__provider})"
+
+    def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        if _is_head_request(method, params, full_response):
+            return self.__head.get(method, lambda: self.__provider.make_request(method))
+        return self.__provider.make_request(method, params, full_response)
+
+    def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        return self.__provider.make_batch_request(entries, full_response)
+
+    def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> Monitor:
+        return self.__provider.make_monitor(spec, keep_alive)
+
+    def close(self):
+        self.__provider.close()
+
+
+class AsyncHeadCachingProvider(AsyncProvider):
+    """
+    Async version of HeadCachingProvider
+    """
+
+    def __init__(self, provider: AsyncProvider, head: HeadCache):
+        self.__provider = provider
+        self.__head = head
+
+    @property
+    def provider(self) -> AsyncProvider:
+        return self.__provider
+
+    @property
+    def head(self) -> HeadCache:
+        return self.__head
+
+    def __str__(self):
+        return f"AsyncHeadCachingProvider({self.__provider})"
+
+    async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        if _is_head_request(method, params, full_response):
+            return await self.__head.get_async(method, lambda: self.__provider.make_request(method))
+        return await self.__provider.make_request(method, params, full_response)
+
+    async def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        return await self.__provider.make_batch_request(entries, full_response)
+
+    async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
+        return await self.__provider.make_monitor(spec, keep_alive)
+
+    async def close(self):
+        await self.__provider.close()
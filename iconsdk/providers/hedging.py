@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Optional
+
+from iconsdk.providers.methods import LONG_POLLING_METHODS, is_read_method
+
+
+class LatencyHistogram:
+    """
+    Latencies of the recent requests
+    """
+
+    def __init__(self, size: int = 1000):
+        self.__samples: Deque[float] = deque(maxlen=size)
+        self.__sorted: Optional[list] = None
+
+    def __len__(self):
+        return len(self.__samples)
+
+    def record(self, latency: float):
+        self.__samples.append(latency)
+        self.__sorted = None
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Returns the latency under which `p` percent of the recent requests have been answered
+
+        :param p: percentile between 0 and 100
+        :return: the latency in seconds or None if there's no sample
+        """
+        if not self.__samples:
+            return None
+        if self.__sorted is None:
+            self.__sorted = sorted(self.__samples)
+        index = min(int(len(self.__sorted) * p / 100), len(self.__sorted) - 1)
+        return self.__sorted[index]
+
+
+class HedgePolicy:
+    """
+    Decides when to send a second copy of a read request to another endpoint.
+
+    The copy is sent when the first one isn't answered within the `percentile`
+    of the latencies recorded for the method. Hedging is limited to `max_rate`
+    of the requests, with bursts of up to `max_burst` copies.
+    """
+
+    def __init__(self, percentile: float = 95,
+                 max_rate: float = 0.05,
+                 max_burst: float = 10,
+                 min_delay: float = 0.01,
+                 min_samples: int = 20,
+                 window: int = 1000):
+        """
+        :param percentile: percentile of latencies to wait before hedging
+        :param max_rate: max ratio of hedged requests to all the requests
+        :param max_burst: max number of hedged requests in a row
+        :param min_delay: min seconds to wait before hedging
+        :param min_samples: requests to be measured before hedging a method
+        :param window: number of recent latencies kept for each method
+        """
+        if not 0 < percentile < 100:
+            raise ValueError(f"Invalid percentile {percentile}")
+        self.__percentile = percentile
+        self.__max_rate = max_rate
+        self.__max_burst = max_burst
+        self.__min_delay = min_delay
+        self.__min_samples = min_samples
+        self.__window = window
+        self.__histograms: Dict[str, LatencyHistogram] = {}
+        self.__budget = 0.0
+        self.__lock = Lock()
+        self.hedged = 0
+
+    @staticmethod
+    def applies_to(method: str) -> bool:
+        return is_read_method(method) and method not in LONG_POLLING_METHODS
+
+    def histogram(self, method: str) -> LatencyHistogram:
+        with self.__lock:
+            histogram = self.__histograms.get(method)
+            if histogram is None:
+                histogram = self.__histograms[method] = LatencyHistogram(self.__window)
+            return histogram
+
+    def begin(self, method: str) -> Optional[float]:
+        """
+        Counts a request of the method
+
+        :return: seconds to wait before hedging it or None not to hedge
+        """
+        histogram = self.histogram(method)
+        with self.__lock:
+            self.__budget = min(self.__budget + self.__max_rate, self.__max_burst)
+            if len(histogram) < self.__min_samples:
+                return None
+            return max(histogram.percentile(self.__percentile), self.__min_delay)
+
+    def try_hedge(self) -> bool:
+        """
+        Takes a hedge from the budget
+
+        :return: whether a hedged request can be sent
+        """
+        with self.__lock:
+            if self.__budget < 1:
+                return False
+            self.__budget -= 1
+            self.hedged += 1
+            return True
+
+    def record(self, method: str, latency: float):
+        histogram = self.histogram(method)
+        with self.__lock:
+            histogram.record(latency)
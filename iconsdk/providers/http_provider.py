@@ -12,54 +12,149 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
+import select
+import ssl
+from itertools import count
 from json.decoder import JSONDecodeError
-from time import time, monotonic
-from typing import Union, Optional
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, List, Sequence, Union, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from multimethod import multimethod
-from websocket import WebSocket, WebSocketTimeoutException
+from websocket import ABNF, WebSocket, WebSocketTimeoutException
 
 from iconsdk.exception import JSONRPCException, HTTPError
-from iconsdk.providers.provider import Provider, MonitorSpec, Monitor, MonitorTimeoutException
+from iconsdk.providers.codec import JSONCodec, get_codec
+from iconsdk.providers.failures import is_endpoint_failure
+from iconsdk.providers.methods import is_long_polling_payload, is_read_method, is_write_payload, request_key
+from iconsdk.providers.provider import (Provider, MonitorSpec, Monitor, MonitorTimeoutException,
+                                       BatchEntry, map_batch_response)
+from iconsdk.providers.single_flight import SingleFlight
+from iconsdk.providers.throttle import OVERLOAD_STATUS, AdaptiveConcurrencyLimiter, RateLimiter
 from iconsdk.providers.url_map import URLMap
 from iconsdk.utils import to_dict
 
+# ids of requests, unique in the process
+_request_ids = count(1)
+
+# timeout to read the rest of the frames buffered in the socket
+DRAIN_TIMEOUT = 0.01
+
 
 class HTTPProvider(Provider):
     """
     The HTTPProvider takes the full URI where the server can be found.
     For local development this would be something like 'http://localhost:9000'.
+
+    Requests are sent through a long-lived `requests.Session` whose connection
+    pool is shared by all threads using the provider, so TCP and TLS connections
+    are kept alive between calls. Call `close()` or use the provider as a context
+    manager to release the pooled connections.
     """
+    DEFAULT_POOL_SIZE = 10
 
     @multimethod
-    def __init__(self, base_domain_url: str, version: int, request_kwargs: dict = None):
+    def __init__(self, base_domain_url: str, version: int, request_kwargs: dict = None, **options):
         """
         The initializer to be set with base domain URL and version.
 
         :param base_domain_url: base domain URL as like <scheme>://<host>:<port>
         :param version: version for RPC server
         :param request_kwargs: kwargs for setting to head of request
+        :param options: options of the provider (see `_init_options`)
         """
         self._url = URLMap(base_domain_url, version, None)
         self._request_kwargs = request_kwargs or {}
+        self._init_options(**options)
 
     @multimethod
-    def __init__(self, full_path_url: str, request_kwargs: dict = None):
+    def __init__(self, full_path_url: str, request_kwargs: dict = None, **options):
         """
         The initializer to be set with full path url as like <scheme>://<host>:<port>/api/v3.
         If you need to use a channel, you can use it such as <scheme>://<host>:<port>/api/v3/{channel}.
 
         :param full_path_url: full path URL as like <scheme>://<host>:<port>/api/v3
         :param request_kwargs: kwargs for setting to head of request
+        :param options: options of the provider (see `_init_options`)
         """
         self._url = URLMap(full_path_url)
         self._request_kwargs = request_kwargs or {}
+        self._init_options(**options)
+
+    def _init_options(self,
+                      pool_size: int = DEFAULT_POOL_SIZE,
+                      pool_block: bool = False,
+                      keep_alive: bool = True,
+                      single_flight: bool = False,
+                      rate_limiter: Optional[RateLimiter] = None,
+                      concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                      codec: Union[None, str, JSONCodec] = None):
+        """
+        Sets the options of the provider. The session itself is created on the first request.
+
+        :param pool_size: maximum number of connections kept alive per host.
+            It should be at least the number of threads sharing the provider.
+        :param pool_block: whether a request waits for a free connection when the pool is exhausted
+            instead of opening a throwaway connection
+        :param keep_alive: whether connections are reused between requests
+        :param single_flight: whether identical read requests made at the same time
+            are sent once and share the response. The shared result must not be modified.
+        :param rate_limiter: rate limits of requests to the endpoint
+        :param concurrency_limiter: limit of requests in flight to the endpoint.
+            Requests over the limit wait for others to end.
+        :param codec: JSON codec or its name ("json", "orjson" or "msgspec").
+            The standard json module by default.
+        """
+        if pool_size < 1:
+            raise ValueError(f"Invalid pool size {pool_size}")
+        self._pool_size = pool_size
+        self._pool_block = pool_block
+        self._keep_alive = keep_alive
+        self._session: Optional[requests.Session] = None
+        self._session_lock = Lock()
+        self._single_flight = SingleFlight() if single_flight else None
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._codec = get_codec(codec)
 
     def __str__(self):
         return "RPC connection to {0}".format(self._url.serverUri)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_session(self) -> requests.Session:
+        session = self._session
+        if session is not None:
+            return session
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self._pool_size,
+                                      pool_maxsize=self._pool_size,
+                                      pool_block=self._pool_block)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                if not self._keep_alive:
+                    session.headers['Connection'] = 'close'
+                self._session = session
+            return self._session
+
+    def close(self):
+        """
+        Closes the pooled connections.
+        The provider can still be used after it; a new pool is created on the next request.
+        """
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
     @to_dict
     def _get_request_kwargs(self) -> dict:
         if 'headers' not in self._request_kwargs:
@@ -67,17 +162,29 @@ class HTTPProvider(Provider):
         for key, value in self._request_kwargs.items():
             yield key, value
 
-    @staticmethod
-    def _make_post_request(request_url: str, data: dict, **kwargs) -> requests.Response:
+    def _make_post_request(self, request_url: str, data: Union[dict, list], **kwargs) -> requests.Response:
         kwargs.setdefault('timeout', 10)
-        with requests.Session() as session:
-            response = session.post(url=request_url, data=json.dumps(data), **kwargs)
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(is_write_payload(data))
+        limiter = self._concurrency_limiter
+        if limiter is None:
+            return self._get_session().post(url=request_url, data=self._codec.dumps(data), **kwargs)
+
+        measured = not is_long_polling_payload(data)
+        limiter.acquire()
+        started = monotonic()
+        try:
+            response = self._get_session().post(url=request_url, data=self._codec.dumps(data), **kwargs)
+        except BaseException as e:
+            limiter.release(monotonic() - started if measured else None, is_endpoint_failure(e))
+            raise
+        limiter.release(monotonic() - started if measured else None, response.status_code in OVERLOAD_STATUS)
         return response
 
     def _make_id(self) -> int:
-        return int(time())
+        return next(_request_ids)
 
-    def make_request(self, method: str, params=None, full_response: bool = False) -> Union[str, list, dict]:
+    def _make_rpc_dict(self, method: str, params=None) -> dict:
         rpc_dict = {
             'jsonrpc': '2.0',
             'method': method,
@@ -85,7 +192,16 @@ class HTTPProvider(Provider):
         }
         if params:
             rpc_dict['params'] = params
+        return rpc_dict
+
+    def make_request(self, method: str, params=None, full_response: bool = False) -> Union[str, list, dict]:
+        if self._single_flight is not None and is_read_method(method):
+            return self._single_flight.do(request_key(method, params, full_response),
+                                          lambda: self._make_request(method, params, full_response))
+        return self._make_request(method, params, full_response)
 
+    def _make_request(self, method: str, params=None, full_response: bool = False) -> Union[str, list, dict]:
+        rpc_dict = self._make_rpc_dict(method, params)
         request_url = self._url.for_rpc(method.split('_')[0])
         response = self._make_post_request(request_url, rpc_dict, **self._get_request_kwargs())
         try:
@@ -94,9 +210,37 @@ class HTTPProvider(Provider):
             raw_response = response.content.decode()
             raise HTTPError(raw_response, response.status_code)
 
-    @staticmethod
-    def _return_custom_response(response: requests.Response, full_response: bool = False) -> Union[str, list, dict]:
-        content = json.loads(response.content)
+    def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        """
+        Sends the requests in a JSON-RPC batch.
+        Requests for different endpoints (e.g. `debug_*`) are sent in separate batches.
+        """
+        rpc_dicts = [self._make_rpc_dict(*entry) for entry in entries]
+        groups: Dict[str, List[int]] = {}
+        for idx, rpc_dict in enumerate(rpc_dicts):
+            request_url = self._url.for_rpc(rpc_dict['method'].split('_')[0])
+            groups.setdefault(request_url, []).append(idx)
+
+        results: List[Any] = [None] * len(rpc_dicts)
+        for request_url, indexes in groups.items():
+            batch = [rpc_dicts[idx] for idx in indexes]
+            response = self._make_post_request(request_url, batch, **self._get_request_kwargs())
+            try:
+                content = self._codec.loads(response.content)
+            except JSONDecodeError:
+                content = None
+            if isinstance(content, (dict, list)):
+                group_results = map_batch_response([rpc_dict['id'] for rpc_dict in batch], content, full_response)
+            else:
+                raw_response = response.content.decode()
+                group_results = [HTTPError(raw_response, response.status_code) for _ in batch]
+            for idx, result in zip(indexes, group_results):
+                results[idx] = result
+        return results
+
+    def _return_custom_response(self, response: requests.Response,
+                                full_response: bool = False) -> Union[str, list, dict]:
+        content = self._codec.loads(response.content)
         if full_response:
             return content
         if response.ok:
@@ -110,25 +254,54 @@ class HTTPProvider(Provider):
     def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> Monitor:
         ws_url = self._url.for_ws(spec.get_path())
         params = spec.get_request()
-        return WebSocketMonitor(ws_url, params, keep_alive=keep_alive)
+        return WebSocketMonitor(ws_url, params, keep_alive=keep_alive, codec=self._codec)
 
 
 class WebSocketMonitor(Monitor):
-    def __init__(self, url: str, params: dict, keep_alive: Optional[float] = None):
+    def __init__(self, url: str, params: dict, keep_alive: Optional[float] = None,
+                 codec: Union[None, str, JSONCodec] = None):
         self.__client = WebSocket()
         self.__keep_alive = keep_alive or 30
+        self.__codec = get_codec(codec)
+        self.__error: Optional[Exception] = None
         self.__client.connect(url)
-        self.__client.send(json.dumps(params))
+        self.__send_json(params)
         result = self.__read_json(None)
         if 'code' not in result:
-            raise Exception(f'invalid response={json.dumps(result)}')
+            raise Exception(f'invalid response={result!r}')
         if result['code'] != 0:
             raise Exception(f'fail to monitor err={result["message"]}')
 
     def close(self):
         self.__client.close()
 
-    def __read_json(self, timeout: Optional[float] = None) -> any:
+    @property
+    def codec(self) -> JSONCodec:
+        """
+        Codec to decode the frames read without parsing
+        """
+        return self.__codec
+
+    def __send_json(self, obj: Any):
+        self.__client.send(self.__codec.dumps(obj), ABNF.OPCODE_TEXT)
+
+    def __recv_json(self, parse: bool = True) -> Any:
+        with self.__client.readlock:
+            opcode, data = self.__client.recv_data()
+        if opcode not in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+            data = b''
+        return self.__codec.loads(data) if parse else data
+
+    def __buffered(self) -> bool:
+        sock = self.__client.sock
+        if sock is None:
+            return False
+        # SSL sockets may have decrypted data not visible to select
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+        return bool(select.select([sock], [], [], 0)[0])
+
+    def __read_json(self, timeout: Optional[float] = None, parse: bool = True) -> any:
         now = monotonic()
         limit = None
         if timeout is not None:
@@ -140,14 +313,53 @@ class WebSocketMonitor(Monitor):
                     self.__client.timeout = min(limit - now, self.__keep_alive)
                 else:
                     self.__client.timeout = self.__keep_alive
-                return json.loads(self.__client.recv())
+                return self.__recv_json(parse)
             except WebSocketTimeoutException as e:
                 now = monotonic()
                 if limit is None or now < limit:
-                    self.__client.send(json.dumps({"keepalive": "0x1"}))
+                    self.__send_json({"keepalive": "0x1"})
                     continue
                 else:
                     raise MonitorTimeoutException()
 
+    def __drain_json(self, parse: bool) -> Any:
+        # a control frame or the rest of a frame may not arrive soon
+        self.__client.timeout = DRAIN_TIMEOUT
+        try:
+            return self.__recv_json(parse)
+        except WebSocketTimeoutException:
+            raise MonitorTimeoutException()
+
+    def __raise_error(self):
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
     def read(self, timeout: Optional[float] = None) -> any:
+        self.__raise_error()
         return self.__read_json(timeout=timeout)
+
+    def read_many(self, max_items: int = 100, max_wait: Optional[float] = None, parse: bool = True) -> List[Any]:
+        """
+        Read the notifications buffered in the socket, waiting for the first one
+
+        :param max_items: max number of notifications to read
+        :param max_wait: timeout to wait for the first notification in fraction of seconds
+        :param parse: whether it decodes the frames. If it's False, it returns the frames as they are,
+            to be decoded later with `codec` if needed.
+        :return: notifications. It's empty if it passes the timeout.
+            An error after reading some notifications is raised on the next read.
+        """
+        self.__raise_error()
+        items = []
+        try:
+            items.append(self.__read_json(timeout=max_wait, parse=parse))
+            while len(items) < max_items and self.__buffered():
+                items.append(self.__drain_json(parse))
+        except MonitorTimeoutException:
+            pass
+        except Exception as e:
+            if not items:
+                raise
+            self.__error = e
+        return items
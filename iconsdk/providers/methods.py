@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+# JSON-RPC methods which only read the state of the chain.
+# They can be repeated or shared without any side effect.
+READ_METHODS = frozenset({
+    "icx_getLastBlock",
+    "icx_getBlockByHeight",
+    "icx_getBlockByHash",
+    "icx_getBlock",
+    "icx_call",
+    "icx_getBalance",
+    "icx_getScoreApi",
+    "icx_getScoreStatus",
+    "icx_getTotalSupply",
+    "icx_getTransactionResult",
+    "icx_waitTransactionResult",
+    "icx_getTransactionByHash",
+    "icx_getDataByHash",
+    "icx_getBlockHeaderByHeight",
+    "icx_getVotesByHeight",
+    "icx_getProofForResult",
+    "icx_getProofForEvents",
+    "icx_getNetworkInfo",
+    "btp_getNetworkInfo",
+    "btp_getNetworkTypeInfo",
+    "btp_getMessages",
+    "btp_getHeader",
+    "btp_getProof",
+    "btp_getSourceInformation",
+    "debug_getTrace",
+    "debug_estimateStep",
+})
+
+# JSON-RPC methods changing the state of the chain
+WRITE_METHODS = frozenset({
+    "icx_sendTransaction",
+    "icx_sendTransactionAndWait",
+})
+
+# JSON-RPC methods which wait for a change of the chain, so their latency isn't the one of the node
+LONG_POLLING_METHODS = frozenset({
+    "icx_waitTransactionResult",
+    "icx_sendTransactionAndWait",
+})
+
+
+def is_read_method(method: str) -> bool:
+    return method in READ_METHODS
+
+
+def is_read_batch(entries: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> bool:
+    """
+    Returns whether all the requests in the batch are reads
+    """
+    return all(is_read_method(entry[0]) for entry in entries)
+
+
+def is_write_payload(payload: Union[dict, list]) -> bool:
+    """
+    Returns whether the JSON-RPC request or a request in the batch request sends a transaction
+    """
+    requests = payload if isinstance(payload, list) else [payload]
+    return any(request["method"] in WRITE_METHODS for request in requests)
+
+
+def is_long_polling_payload(payload: Union[dict, list]) -> bool:
+    """
+    Returns whether the JSON-RPC request or a request in the batch request waits for a change of the chain
+    """
+    requests = payload if isinstance(payload, list) else [payload]
+    return any(request["method"] in LONG_POLLING_METHODS for request in requests)
+
+
+def canonical_params(params: Optional[Dict[str, Any]]) -> str:
+    """
+    Returns a string identifying the params regardless of the order of the keys
+    """
+    if not params:
+        return ""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+def request_key(method: str, params: Optional[Dict[str, Any]], full_response: bool = False) -> Tuple[str, str, bool]:
+    """
+    Returns a key identifying the request
+    """
+    return method, canonical_params(params), full_response
@@ -14,7 +14,49 @@
 # limitations under the License.
 
 from abc import ABCMeta, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
+
+from iconsdk.exception import IconServiceBaseException, JSONRPCException
+
+# An entry of a batch request; (method,) or (method, params)
+BatchEntry = Union[Tuple[str], Tuple[str, Optional[Dict[str, Any]]]]
+
+
+def error_to_exception(error: Dict[str, Any]) -> JSONRPCException:
+    return JSONRPCException(
+        error.get("message"),
+        error.get("code"),
+        error.get("data", None),
+    )
+
+
+def map_batch_response(ids: Sequence[Any], content: Any, full_response: bool = False) -> List[Any]:
+    """
+    Maps responses of a JSON-RPC batch request to its requests by id
+
+    :param ids: ids of the requests in the batch
+    :param content: decoded response of the batch
+    :param full_response: whether it returns whole responses instead of results
+    :return: results in the order of ids. It has the exception for the failed one.
+    """
+    if isinstance(content, dict):
+        # the batch itself is rejected (e.g. parse error)
+        return [error_to_exception(content.get("error") or {}) for _ in ids]
+
+    responses = {item.get("id"): item for item in content if isinstance(item, dict)}
+    results = []
+    for _id in ids:
+        item = responses.get(_id)
+        if item is None:
+            results.append(JSONRPCException(f"No response for the request(id={_id})",
+                                            JSONRPCException.RPC_INTERNAL_ERROR))
+        elif full_response:
+            results.append(item)
+        elif "error" in item:
+            results.append(error_to_exception(item["error"]))
+        else:
+            results.append(item.get("result"))
+    return results
 
 
 class MonitorSpec(metaclass=ABCMeta):
@@ -32,6 +74,12 @@ class MonitorSpec(metaclass=ABCMeta):
         """
         raise NotImplementedError("MonitorSpec must implement this method")
 
+    def with_height(self, height: int) -> "MonitorSpec":
+        """
+        Returns the same spec starting from the height, to resume monitoring
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't change the height")
+
 
 class MonitorTimeoutException(Exception):
     pass
@@ -57,6 +105,29 @@ class Monitor(metaclass=ABCMeta):
         """
         pass
 
+    def __iter__(self):
+        """
+        Iterates the notifications, reading them without timeout
+        """
+        while True:
+            yield self.read()
+
+    def read_many(self, max_items: int = 100, max_wait: Optional[float] = None) -> List[Any]:
+        """
+        Read the notifications received already, waiting for the first one
+
+        This default implementation reads only the first one.
+        Monitors on sockets take all the frames buffered in them.
+
+        :param max_items: max number of notifications to read
+        :param max_wait: timeout to wait for the first notification in fraction of seconds
+        :return: notifications. It's empty if it passes the timeout.
+        """
+        try:
+            return [self.read(max_wait)]
+        except MonitorTimeoutException:
+            return []
+
 
 class Provider(metaclass=ABCMeta):
     """The provider defines how the IconService connects to RPC server."""
@@ -65,6 +136,26 @@ class Provider(metaclass=ABCMeta):
     def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
         raise NotImplementedError("Providers must implement this method")
 
+    def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        """
+        Make multiple requests at once
+
+        Providers supporting JSON-RPC 2.0 batch send them in one request.
+        This default implementation sends them one by one.
+
+        :param entries: list of (method, params) to request
+        :param full_response: whether it returns whole responses instead of results
+        :return: results in the order of the requests. It has the exception
+            instead of the result for the failed request.
+        """
+        results = []
+        for entry in entries:
+            try:
+                results.append(self.make_request(*entry, full_response=full_response))
+            except (Exception, IconServiceBaseException) as e:
+                results.append(e)
+        return results
+
     @abstractmethod
     def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> Monitor:
         """
@@ -74,3 +165,11 @@ class Provider(metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def close(self):
+        """
+        Close the provider
+
+        It releases related resources like pooled connections.
+        """
+        pass
+
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import random
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence
+
+from iconsdk import logger
+from iconsdk.exception import CircuitOpenException, IconServiceBaseException
+from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.failures import is_connect_error, is_endpoint_failure
+from iconsdk.providers.methods import is_read_batch, is_read_method
+from iconsdk.providers.provider import BatchEntry, Monitor, MonitorSpec, Provider
+
+
+class RetryPolicy:
+    """
+    Decides whether and when to retry a failed request.
+
+    Read methods are retried on failures of the endpoint, and others only when
+    the connection couldn't be made, so the request hasn't reached the endpoint.
+    Delays grow exponentially with full jitter not to retry in lockstep with other clients.
+    Retries are limited to `budget_ratio` of the requests, with bursts of up to `max_budget` retries.
+    """
+
+    def __init__(self, max_attempts: int = 3,
+                 base_delay: float = 0.1,
+                 max_delay: float = 5.0,
+                 budget_ratio: float = 0.2,
+                 max_budget: float = 10):
+        """
+        :param max_attempts: max number of attempts including the first one
+        :param base_delay: max seconds to wait before the first retry
+        :param max_delay: max seconds to wait before a retry
+        :param budget_ratio: max ratio of retries to the requests
+        :param max_budget: max number of retries in a row
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.__budget_ratio = budget_ratio
+        self.__max_budget = max_budget
+        self.__budget = float(max_budget)
+        self.__lock = Lock()
+
+    @staticmethod
+    def is_retryable(read: bool, error: BaseException) -> bool:
+        if isinstance(error, CircuitOpenException):
+            return False
+        if read:
+            return is_endpoint_failure(error)
+        return is_connect_error(error)
+
+    def on_request(self):
+        with self.__lock:
+            self.__budget = min(self.__budget + self.__budget_ratio, self.__max_budget)
+
+    def should_retry(self, read: bool, error: BaseException, attempt: int) -> bool:
+        """
+        Returns whether to retry the request, taking a retry from the budget
+
+        :param read: whether the request only reads the chain.
+            Other requests are retried only if they aren't sent.
+        :param error: error of the last attempt
+        :param attempt: number of the attempts made
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(read, error):
+            return False
+        with self.__lock:
+            if self.__budget < 1:
+                logger.warning(f"Retry budget is exhausted, the request failed by {error!r}")
+                return False
+            self.__budget -= 1
+            return True
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns seconds to wait before the retry after the attempt
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Blocks requests to an endpoint after `failure_threshold` failures in a row.
+    After `reset_timeout`, a trial request is allowed; its success closes the circuit again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__state = self.CLOSED
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__lock = Lock()
+
+    @property
+    def state(self) -> str:
+        return self.__state
+
+    def before_request(self):
+        """
+        :raise CircuitOpenException: if the request isn't allowed
+        """
+        with self.__lock:
+            if self.__state == self.CLOSED:
+                return
+            if self.__state == self.OPEN and time.monotonic() >= self.__opened_at + self.__reset_timeout:
+                self.__state = self.HALF_OPEN
+                return
+        raise CircuitOpenException()
+
+    def on_success(self):
+        with self.__lock:
+            self.__failures = 0
+            self.__state = self.CLOSED
+
+    def on_failure(self, error: BaseException):
+        if not is_endpoint_failure(error):
+            self.on_success()
+            return
+        with self.__lock:
+            self.__failures += 1
+            if self.__state == self.HALF_OPEN or self.__failures >= self.__failure_threshold:
+                if self.__state != self.OPEN:
+                    logger.warning(f"Circuit is open by {error!r}")
+                self.__state = self.OPEN
+                self.__opened_at = time.monotonic()
+
+    def on_cancel(self):
+        with self.__lock:
+            if self.__state == self.HALF_OPEN:
+                # let another request try
+                self.__state = self.OPEN
+                self.__opened_at = 0.0
+
+
+class RetryProvider(Provider):
+    """
+    Provider retrying failed requests of another provider.
+    For a circuit per endpoint, wrap the provider of each endpoint.
+    """
+
+    def __init__(self, provider: Provider,
+                 policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        :param provider: provider to send requests
+        :param policy: retry policy. RetryPolicy() by default
+        :param breaker: circuit breaker of the endpoint. No circuit breaker by default
+        """
+        self.__provider = provider
+        self.__policy = policy or RetryPolicy()
+        self.__breaker = breaker
+
+    @property
+    def provider(self) -> Provider:
+        return self.__provider
+
+    def __str__(self):
+        return f"RetryProvider({self.__provider})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _call(self, method: str, fn, read: bool):
+        self.__policy.on_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.__breaker is not None:
+                self.__breaker.before_request()
+            try:
+                result = fn()
+            except (Exception, IconServiceBaseException) as e:
+                if self.__breaker is not None:
+                    self.__breaker.on_failure(e)
+                if not self.__policy.should_retry(read, e, attempt):
+                    raise
+                delay = self.__policy.backoff(attempt)
+                logger.info(f"Retry {method} in {delay:.3f}s by {e!r}")
+                time.sleep(delay)
+                continue
+            except BaseException:
+                if self.__breaker is not None:
+                    self.__breaker.on_cancel()
+                raise
+            if self.__breaker is not None:
+                self.__breaker.on_success()
+            return result
+
+    def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        return self._call(method, lambda: self.__provider.make_request(method, params, full_response),
+                          is_read_method(method))
+
+    def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        return self._call('batch', lambda: self.__provider.make_batch_request(entries, full_response),
+                          is_read_batch(entries))
+
+    def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> Monitor:
+        return self._call('monitor', lambda: self.__provider.make_monitor(spec, keep_alive), read=True)
+
+    def close(self):
+        self.__provider.close()
+
+
+class AsyncRetryProvider(AsyncProvider):
+    """
+    Async version of RetryProvider
+    """
+
+    def __init__(self, provider: AsyncProvider,
+                 policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        :param provider: provider to send requests
+        :param policy: retry policy. RetryPolicy() by default
+        :param breaker: circuit breaker of the endpoint. No circuit breaker by default
+        """
+        self.__provider = provider
+        self.__policy = policy or RetryPolicy()
+        self.__breaker = breaker
+
+    @property
+    def provider(self) -> AsyncProvider:
+        return self.__provider
+
+    def __str__(self):
+        return f"AsyncRetryProvider({self.__provider})"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _call(self, method: str, fn, read: bool):
+        self.__policy.on_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.__breaker is not None:
+                self.__breaker.before_request()
+            try:
+                result = await fn()
+            except (Exception, IconServiceBaseException) as e:
+                if self.__breaker is not None:
+                    self.__breaker.on_failure(e)
+                if not self.__policy.should_retry(read, e, attempt):
+                    raise
+                delay = self.__policy.backoff(attempt)
+                logger.info(f"Retry {method} in {delay:.3f}s by {e!r}")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if self.__breaker is not None:
+                    self.__breaker.on_cancel()
+                raise
+            if self.__breaker is not None:
+                self.__breaker.on_success()
+            return result
+
+    async def make_request(self, method: str, params: Optional[Dict[str, Any]] = None, full_response: bool = False):
+        return await self._call(method, lambda: self.__provider.make_request(method, params, full_response),
+                                is_read_method(method))
+
+    async def make_batch_request(self, entries: Sequence[BatchEntry], full_response: bool = False) -> List[Any]:
+        return await self._call('batch', lambda: self.__provider.make_batch_request(entries, full_response),
+                                is_read_batch(entries))
+
+    async def make_monitor(self, spec: MonitorSpec, keep_alive: Optional[float] = None) -> AsyncMonitor:
+        return await self._call('monitor', lambda: self.__provider.make_monitor(spec, keep_alive), read=True)
+
+    async def close(self):
+        await self.__provider.close()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Runs only one call for a key at a time.
+    Callers with the same key while the call is running get its result.
+    """
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__calls: Dict[Hashable, Future] = {}
+
+    def __len__(self):
+        return len(self.__calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self.__lock:
+            future = self.__calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.__calls[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    Async version of SingleFlight.
+    The call isn't cancelled even if one of its callers is cancelled.
+    """
+
+    def __init__(self):
+        self.__calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self):
+        return len(self.__calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.__calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self.__calls[key] = task
+
+            def done(_task: asyncio.Future):
+                self.__calls.pop(key, None)
+                if not _task.cancelled():
+                    # retrieved here in case all the callers are cancelled
+                    _task.exception()
+
+            task.add_done_callback(done)
+        return await asyncio.shield(task)
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from collections import deque
+from threading import Condition, Lock
+from typing import Deque, List, Optional
+
+from iconsdk import logger
+
+# HTTP status codes meaning that the node is overloaded.
+# 500 isn't one of them as nodes answer some JSON-RPC errors with it.
+OVERLOAD_STATUS = frozenset({429, 502, 503, 504})
+
+# weights of a latency in the recent average and in the long-term average of latencies
+LATENCY_WEIGHT = 0.1
+BASE_LATENCY_WEIGHT = 0.01
+
+
+class TokenBucket:
+    """
+    Limits the rate of requests to `rate` per second with bursts of up to `burst` requests.
+    Waiting requests are served in the order of arrival.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        :param rate: requests per second
+        :param burst: max number of requests at once. `rate` (but at least 1) by default
+        """
+        if rate <= 0:
+            raise ValueError(f"Invalid rate {rate}")
+        self.__rate = rate
+        self.__burst = burst if burst is not None else max(rate, 1)
+        self.__tokens = self.__burst
+        self.__updated = time.monotonic()
+        self.__lock = Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    def __refill(self, now: float):
+        self.__tokens = min(self.__burst, self.__tokens + (now - self.__updated) * self.__rate)
+        self.__updated = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token, borrowing it from the future if there's none
+
+        :return: seconds to wait until the token is available
+        """
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.__tokens -= 1
+            return max(0.0, -self.__tokens / self.__rate)
+
+    def try_acquire(self) -> bool:
+        with self.__lock:
+            self.__refill(time.monotonic())
+            if self.__tokens < 1:
+                return False
+            self.__tokens -= 1
+            return True
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    Token bucket rate limits of an endpoint.
+    A request waits for the bucket of all the requests and the one of its method class.
+    """
+
+    def __init__(self, total: Optional[TokenBucket] = None,
+                 read: Optional[TokenBucket] = None,
+                 write: Optional[TokenBucket] = None):
+        """
+        :param total: limit of all the requests
+        :param read: limit of requests except transactions
+        :param write: limit of transactions (icx_sendTransaction and icx_sendTransactionAndWait)
+        """
+        self.__total = total
+        self.__read = read
+        self.__write = write
+
+    def _buckets(self, write: bool) -> List[TokenBucket]:
+        bucket = self.__write if write else self.__read
+        return [b for b in (self.__total, bucket) if b is not None]
+
+    def acquire(self, write: bool = False):
+        """
+        Waits for the buckets of a request
+
+        :param write: whether the request sends a transaction
+        """
+        delay = max([bucket.reserve() for bucket in self._buckets(write)], default=0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, write: bool = False):
+        delay = max([bucket.reserve() for bucket in self._buckets(write)], default=0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of requests in flight, adapting the limit by AIMD.
+
+    The limit grows by one per `limit` successful requests while it's in use,
+    and is multiplied by `backoff` when the endpoint looks overloaded: responses
+    with 429/502/503/504, connection errors or timeouts, or the recent average of latencies
+    over `tolerance` times the long-term average. It shrinks at most once per latency period,
+    so a burst of failures of the requests sent together counts once.
+    Averages smooth out the jitter of a healthy endpoint, and long polling or cancelled
+    requests don't count as their latency isn't the one of the endpoint.
+
+    It can be shared by threads with `acquire()`, or by tasks in event loops with `acquire_async()`.
+    """
+
+    def __init__(self, initial_limit: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 200,
+                 backoff: float = 0.5,
+                 tolerance: float = 2.0):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(f"Invalid limits min={min_limit} initial={initial_limit} max={max_limit}")
+        self.__limit = float(initial_limit)
+        self.__min_limit = min_limit
+        self.__max_limit = max_limit
+        self.__backoff = backoff
+        self.__tolerance = tolerance
+        self.__inflight = 0
+        self.__latency: Optional[float] = None
+        self.__base_latency: Optional[float] = None
+        self.__last_decrease = 0.0
+        self.__lock = Lock()
+        self.__condition = Condition(self.__lock)
+        self.__waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self.__limit)
+
+    @property
+    def inflight(self) -> int:
+        return self.__inflight
+
+    def acquire(self):
+        with self.__condition:
+            while self.__inflight >= int(self.__limit):
+                self.__condition.wait()
+            self.__inflight += 1
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.__lock:
+                if self.__inflight < int(self.__limit):
+                    self.__inflight += 1
+                    return
+                waiter = loop.create_future()
+                self.__waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self.__lock:
+                    if waiter in self.__waiters:
+                        self.__waiters.remove(waiter)
+                    else:
+                        # pass the wakeup on to another waiter
+                        self.__wake()
+                raise
+
+    def __wake(self):
+        self.__condition.notify_all()
+        available = int(self.__limit) - self.__inflight
+        while available > 0 and self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(_set_waiter, waiter)
+                available -= 1
+
+    def release(self, latency: Optional[float], overloaded: bool = False):
+        """
+        Ends a request, adapting the limit by its outcome
+
+        :param latency: seconds taken by the request, or None if it doesn't tell the load
+            of the endpoint, like long polling or cancelled requests
+        :param overloaded: whether the response says that the endpoint is overloaded
+        """
+        now = time.monotonic()
+        with self.__lock:
+            inflight = self.__inflight
+            self.__inflight -= 1
+            slow = False
+            if latency is not None:
+                if self.__base_latency is None:
+                    self.__latency = self.__base_latency = latency
+                else:
+                    self.__latency += (latency - self.__latency) * LATENCY_WEIGHT
+                    self.__base_latency += (latency - self.__base_latency) * BASE_LATENCY_WEIGHT
+                    slow = self.__latency > self.__base_latency * self.__tolerance
+            if overloaded or slow:
+                if now - self.__last_decrease > (self.__latency or 0.0):
+                    self.__last_decrease = now
+                    limit = max(self.__min_limit, self.__limit * self.__backoff)
+                    if int(limit) < int(self.__limit):
+                        logger.info(f"Concurrency limit decreases to {int(limit)}"
+                                    f" (latency={latency:.3f}s, overloaded={overloaded})")
+                    self.__limit = limit
+            elif latency is not None and inflight * 2 >= self.__limit:
+                self.__limit = min(self.__max_limit, self.__limit + 1 / self.__limit)
+            self.__wake()
+
+
+def _set_waiter(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
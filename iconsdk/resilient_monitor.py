@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import random
+import time
+from typing import Any, List, Optional, Tuple
+
+from iconsdk import logger
+from iconsdk.exception import IconServiceBaseException
+from iconsdk.providers.async_provider import AsyncMonitor
+from iconsdk.providers.provider import Monitor, MonitorSpec, MonitorTimeoutException
+from iconsdk.utils.converter import hex_to_int
+
+
+class MonitorPosition:
+    """
+    Position of the notifications delivered by a monitor, deciding where to resume it
+    and which notifications of the resumed one are already delivered.
+
+    Block notifications resume from the next height. Event notifications resume from
+    their height, as other events of the block may follow, skipping the events up to
+    the delivered index. Progress notifications resume from the height of the progress.
+    """
+
+    def __init__(self):
+        self.height: Optional[int] = None
+        self.index: Optional[int] = None
+        self.progress: Optional[int] = None
+
+    @property
+    def next_height(self) -> Optional[int]:
+        """
+        Height to resume monitoring from, or None if nothing is delivered
+        """
+        height = None
+        if self.height is not None:
+            height = self.height if self.index is not None else self.height + 1
+        if self.progress is not None and (height is None or self.progress > height):
+            height = self.progress
+        return height
+
+    def __key(self, height: int, index: Optional[int]) -> Tuple[int, int]:
+        return height, -1 if index is None else index
+
+    def accept(self, notification: Any) -> bool:
+        """
+        Records the notification, or returns False if it's already delivered
+        """
+        if not isinstance(notification, dict):
+            return True
+        if "progress" in notification:
+            progress = hex_to_int(notification["progress"])
+            if self.progress is None or progress > self.progress:
+                self.progress = progress
+            return True
+        if notification.get("height") is None:
+            return True
+        height = hex_to_int(notification["height"])
+        index = notification.get("index")
+        index = None if index is None else hex_to_int(index)
+        if self.height is not None and self.__key(height, index) <= self.__key(self.height, self.index):
+            return False
+        self.height, self.index = height, index
+        return True
+
+
+class ResilientMonitor(Monitor):
+    """
+    Monitor reconnecting on errors of the connection.
+
+    It resubscribes with the spec from the height after the last delivered notification,
+    waiting for a jittered exponential backoff before each reconnect, and skips
+    notifications delivered before reconnecting. The backoff grows with the failures
+    since the last delivered notification, whether connecting or reading failed.
+    Specs of notifications without heights like BTPMonitorSpec resume from their own height.
+
+    It connects on the first read, raising errors of the first connection
+    as they're usually the ones of the spec, unless `retry_first` is set.
+
+    Example::
+
+        monitor = ResilientMonitor(icon_service, EventMonitorSpec(height, event_filter))
+        while True:
+            notification = monitor.read()
+    """
+
+    def __init__(self, service, spec: MonitorSpec, keep_alive: Optional[float] = None,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0,
+                 max_attempts: Optional[int] = None,
+                 position: Optional[MonitorPosition] = None,
+                 retry_first: bool = False):
+        """
+        :param service: IconService to make monitors
+        :param spec: monitor specification
+        :param keep_alive: interval to send keep-alive while it reads a message in fraction of seconds
+        :param base_delay: max seconds to wait before the first reconnect
+        :param max_delay: max seconds to wait before a reconnect
+        :param max_attempts: max number of reconnects in a row without delivering a notification,
+            raising the error after them. Unlimited by default.
+        :param position: position of the notifications delivered before, to skip them
+        :param retry_first: whether it retries the first connection as well, for a spec known to be valid
+        """
+        self.__service = service
+        self.__spec = spec
+        self.__keep_alive = keep_alive
+        self.__base_delay = base_delay
+        self.__max_delay = max_delay
+        self.__max_attempts = max_attempts
+        self.__position = MonitorPosition() if position is None else position
+        self.__retry_first = retry_first
+        self.__closed = False
+        self.__connected = False
+        self.__failures = 0
+        self.reconnects = 0
+        self.skipped = 0
+        # it connects on the first read
+        self.__monitor: Optional[Monitor] = None
+
+    @property
+    def last_height(self) -> Optional[int]:
+        """
+        Height of the last delivered notification
+        """
+        return self.__position.height
+
+    @property
+    def next_height(self) -> Optional[int]:
+        """
+        Height to resume monitoring from
+        """
+        return self.__position.next_height
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Returns the number of blocks of the chain after the last delivered notification,
+        or None if nothing is delivered
+        """
+        if self.last_height is None:
+            return None
+        return self.__service.get_last_height() - self.last_height
+
+    def __backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.__max_delay, self.__base_delay * (2 ** (attempt - 1))))
+
+    def __disconnect(self):
+        monitor, self.__monitor = self.__monitor, None
+        if monitor is not None:
+            try:
+                monitor.close()
+            except (Exception, IconServiceBaseException) as e:
+                logger.debug(f"Fail to close the monitor by {e!r}")
+
+    def __fail(self, e: BaseException):
+        """
+        Counts the failure, raising the error after max_attempts failures in a row
+        """
+        self.__failures += 1
+        if self.__max_attempts is not None and self.__failures > self.__max_attempts:
+            raise e
+
+    def __reconnect(self, resubscribe: bool = False):
+        while True:
+            if self.__closed:
+                raise Exception("Monitor is closed")
+            if self.__failures > 0:
+                delay = self.__backoff(self.__failures)
+                logger.info(f"Reconnect the monitor in {delay:.3f}s after {self.__failures} failures")
+                time.sleep(delay)
+            next_height = self.next_height
+            spec = self.__spec if next_height is None else self.__spec.with_height(next_height)
+            try:
+                self.__monitor = self.__service.monitor(spec, self.__keep_alive)
+                if self.__connected and not resubscribe:
+                    self.reconnects += 1
+                    logger.info(f"Reconnected the monitor from {next_height}")
+                self.__connected = True
+                return
+            except (Exception, IconServiceBaseException) as e:
+                if not self.__connected and not self.__retry_first:
+                    raise
+                logger.info(f"Fail to reconnect the monitor by {e!r}")
+                self.__fail(e)
+
+    def resubscribe(self, spec: MonitorSpec):
+        """
+        Changes the spec, resubscribing from the height to resume monitoring
+        """
+        self.__spec = spec
+        self.__disconnect()
+        self.__reconnect(resubscribe=True)
+
+    def close(self):
+        self.__closed = True
+        self.__disconnect()
+
+    def read(self, timeout: Optional[float] = None) -> any:
+        notifications = self.read_many(1, timeout)
+        if not notifications:
+            raise MonitorTimeoutException()
+        return notifications[0]
+
+    def read_many(self, max_items: int = 100, max_wait: Optional[float] = None) -> List[Any]:
+        limit = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            if self.__closed:
+                raise Exception("Monitor is closed")
+            if self.__monitor is None:
+                self.__reconnect()
+            left = None if limit is None else limit - time.monotonic()
+            if left is not None and left <= 0:
+                return []
+            try:
+                notifications = self.__monitor.read_many(max_items, left)
+            except (Exception, IconServiceBaseException) as e:
+                if self.__closed:
+                    raise
+                logger.warning(f"Monitor is disconnected by {e!r}")
+                self.__disconnect()
+                self.__fail(e)
+                continue
+            if not notifications:
+                return notifications
+            accepted = [notification for notification in notifications if self.__position.accept(notification)]
+            self.skipped += len(notifications) - len(accepted)
+            if accepted:
+                self.__failures = 0
+                return accepted
+
+
+class AsyncResilientMonitor(AsyncMonitor):
+    """
+    AsyncMonitor reconnecting on errors of the connection, as ResilientMonitor does.
+    It connects on the first read too, raising errors of the first connection.
+
+    Example::
+
+        async with AsyncResilientMonitor(service, EventMonitorSpec(height, event_filter)) as monitor:
+            while True:
+                notification = await monitor.read()
+    """
+
+    def __init__(self, service, spec: MonitorSpec, keep_alive: Optional[float] = None,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0,
+                 max_attempts: Optional[int] = None,
+                 position: Optional[MonitorPosition] = None,
+                 retry_first: bool = False):
+        """
+        :param service: AsyncIconService to make monitors
+        :param spec: monitor specification
+        :param keep_alive: interval to send keep-alive while it reads a message in fraction of seconds
+        :param base_delay: max seconds to wait before the first reconnect
+        :param max_delay: max seconds to wait before a reconnect
+        :param max_attempts: max number of reconnects in a row without delivering a notification,
+            raising the error after them. Unlimited by default.
+        :param position: position of the notifications delivered before, to skip them
+        :param retry_first: whether it retries the first connection as well, for a spec known to be valid
+        """
+        self.__service = service
+        self.__spec = spec
+        self.__keep_alive = keep_alive
+        self.__base_delay = base_delay
+        self.__max_delay = max_delay
+        self.__max_attempts = max_attempts
+        self.__position = MonitorPosition() if position is None else position
+        self.__retry_first = retry_first
+        self.__closed = False
+        self.__connected = False
+        self.__failures = 0
+        self.reconnects = 0
+        self.skipped = 0
+        # it connects on the first read
+        self.__monitor: Optional[AsyncMonitor] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def last_height(self) -> Optional[int]:
+        """
+        Height of the last delivered notification
+        """
+        return self.__position.height
+
+    @property
+    def next_height(self) -> Optional[int]:
+        """
+        Height to resume monitoring from
+        """
+        return self.__position.next_height
+
+    async def get_lag(self) -> Optional[int]:
+        """
+        Returns the number of blocks of the chain after the last delivered notification,
+        or None if nothing is delivered
+        """
+        if self.last_height is None:
+            return None
+        return await self.__service.get_last_height() - self.last_height
+
+    def __backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.__max_delay, self.__base_delay * (2 ** (attempt - 1))))
+
+    async def __disconnect(self):
+        monitor, self.__monitor = self.__monitor, None
+        if monitor is not None:
+            try:
+                await monitor.close()
+            except (Exception, IconServiceBaseException) as e:
+                logger.debug(f"Fail to close the monitor by {e!r}")
+
+    def __fail(self, e: BaseException):
+        self.__failures += 1
+        if self.__max_attempts is not None and self.__failures > self.__max_attempts:
+            raise e
+
+    async def __reconnect(self, resubscribe: bool = False):
+        while True:
+            if self.__closed:
+                raise Exception("Monitor is closed")
+            if self.__failures > 0:
+                delay = self.__backoff(self.__failures)
+                logger.info(f"Reconnect the monitor in {delay:.3f}s after {self.__failures} failures")
+                await asyncio.sleep(delay)
+            next_height = self.next_height
+            spec = self.__spec if next_height is None else self.__spec.with_height(next_height)
+            try:
+                self.__monitor = await self.__service.monitor(spec, self.__keep_alive)
+                if self.__connected and not resubscribe:
+                    self.reconnects += 1
+                    logger.info(f"Reconnected the monitor from {next_height}")
+                self.__connected = True
+                return
+            except (Exception, IconServiceBaseException) as e:
+                if not self.__connected and not self.__retry_first:
+                    raise
+                logger.info(f"Fail to reconnect the monitor by {e!r}")
+                self.__fail(e)
+
+    async def resubscribe(self, spec: MonitorSpec):
+        """
+        Changes the spec, resubscribing from the height to resume monitoring
+        """
+        self.__spec = spec
+        await self.__disconnect()
+        await self.__reconnect(resubscribe=True)
+
+    async def close(self):
+        self.__closed = True
+        await self.__disconnect()
+
+    async def read(self, timeout: Optional[float] = None) -> any:
+        notifications = await self.read_many(1, timeout)
+        if not notifications:
+            raise MonitorTimeoutException()
+        return notifications[0]
+
+    async def read_many(self, max_items: int = 100, max_wait: Optional[float] = None) -> List[Any]:
+        limit = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            if self.__closed:
+                raise Exception("Monitor is closed")
+            if self.__monitor is None:
+                await self.__reconnect()
+            left = None if limit is None else limit - time.monotonic()
+            if left is not None and left <= 0:
+                return []
+            try:
+                notifications = await self.__monitor.read_many(max_items, left)
+            except (Exception, IconServiceBaseException) as e:
+                if self.__closed:
+                    raise
+                logger.warning(f"Monitor is disconnected by {e!r}")
+                await self.__disconnect()
+                self.__fail(e)
+                continue
+            if not notifications:
+                return notifications
+            accepted = [notification for notification in notifications if self.__position.accept(notification)]
+            self.skipped += len(notifications) - len(accepted)
+            if accepted:
+                self.__failures = 0
+                return accepted
@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from iconsdk import logger
+from iconsdk.exception import DataTypeException, IconServiceBaseException
+from iconsdk.monitor import EventFilter, EventMonitorSpec
+from iconsdk.providers.provider import MonitorTimeoutException
+from iconsdk.resilient_monitor import AsyncResilientMonitor, MonitorPosition, ResilientMonitor
+from iconsdk.utils.converter import hex_to_int
+
+# put into the queue of a subscription when it's closed
+_CLOSED = object()
+
+
+def _filters_of(filters: Union[EventFilter, List[EventFilter]]) -> List[EventFilter]:
+    filters = [filters] if isinstance(filters, EventFilter) else list(filters)
+    if not filters:
+        raise DataTypeException("No event filters")
+    return filters
+
+
+def _logs_of(notification: Dict[str, Any]) -> List[Tuple[int, dict]]:
+    """
+    Returns (index, event log) of the events in the notification ordered by the index.
+    With `eventFilters`, events and logs are lists for each filter.
+    """
+    events = notification.get("events") or []
+    logs = notification.get("logs") or []
+    if events and isinstance(events[0], list):
+        events = [index for indexes in events for index in indexes]
+        logs = [log for filter_logs in logs for log in filter_logs]
+    return sorted({hex_to_int(index): log for index, log in zip(events, logs)}.items(), key=lambda item: item[0])
+
+
+def route(notification: Dict[str, Any], subscriptions: List[Any]) -> List[Tuple[Any, Dict[str, Any]]]:
+    """
+    Returns each subscription with the notification of the events matching its filters
+
+    :param notification: event notification including logs
+    :param subscriptions: subscriptions having `filters`
+    :return: list of (subscription, notification)
+    """
+    logs = _logs_of(notification)
+    routes = []
+    for subscription in subscriptions:
+        matched = [(index, log) for index, log in logs if any(f.matches(log) for f in subscription.filters)]
+        if matched:
+            routes.append((subscription, {
+                "hash": notification.get("hash"),
+                "height": notification.get("height"),
+                "index": notification.get("index"),
+                "events": [hex(index) for index, _ in matched],
+                "logs": [log for _, log in matched],
+            }))
+    return routes
+
+
+class Subscription:
+    """
+    Subscription of a SubscriptionHub with a bounded queue of notifications.
+    Notifications have the events matching the filters of the subscription in `events` and `logs`.
+    """
+
+    def __init__(self, hub: 'SubscriptionHub', filters: List[EventFilter], max_queue: int):
+        self.__hub = hub
+        self.filters = filters
+        self.__queue = queue.Queue(max_queue)
+        self.__error: Optional[BaseException] = None
+        self.dropped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _put(self, notification: Dict[str, Any]):
+        try:
+            self.__queue.put_nowait(notification)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Drop a notification of {notification.get('height')} for the full queue")
+
+    def _stop(self, error: Optional[BaseException] = None):
+        self.__error = error
+        while True:
+            try:
+                self.__queue.put_nowait(_CLOSED)
+                return
+            except queue.Full:
+                self.__queue.get_nowait()
+
+    def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Returns the next notification
+
+        :param timeout: timeout to wait for the notification in fraction of seconds
+        :except MonitorTimeoutException: if it passes the timeout
+        """
+        try:
+            notification = self.__queue.get(timeout=timeout)
+        except queue.Empty:
+            raise MonitorTimeoutException()
+        if notification is _CLOSED:
+            self.__queue.put_nowait(_CLOSED)
+            if self.__error is not None:
+                raise self.__error
+            raise Exception("Subscription is closed")
+        return notification
+
+    def __iter__(self):
+        while True:
+            yield self.get()
+
+    def close(self):
+        self.__hub.unsubscribe(self)
+
+
+class SubscriptionHub:
+    """
+    Shares a monitor of events among subscriptions in the process.
+
+    Event filters of the subscriptions are merged into an EventMonitorSpec with logs,
+    and each notification is routed to the subscriptions with the filters matching its logs.
+    When subscriptions are added or removed, it resubscribes from the height to resume monitoring.
+    The monitor is a ResilientMonitor, reconnecting on errors of the connection,
+    including the first one.
+    If a queue of a subscription is full, notifications for it are dropped and counted in `dropped`.
+
+    Example::
+
+        with SubscriptionHub(icon_service) as hub:
+            with hub.subscribe(EventFilter("Transfer(Address,Address,int)", token, 0)) as transfers:
+                while True:
+                    notification = transfers.get()
+    """
+
+    def __init__(self, service, height: Optional[int] = None,
+                 max_queue: int = 1000,
+                 max_batch: int = 100,
+                 poll_interval: float = 1.0,
+                 progress_interval: int = 0,
+                 **options):
+        """
+        :param service: IconService to make monitors
+        :param height: height to start monitoring. The next height of the last block by default.
+        :param max_queue: max number of notifications in the queue of a subscription
+        :param max_batch: max number of notifications read from the monitor at once
+        :param poll_interval: max seconds to apply changes of the subscriptions
+        :param progress_interval: progress interval of the monitor to keep the height to resume
+        :param options: other options of ResilientMonitor
+        """
+        self.__service = service
+        self.__height = height
+        self.__max_queue = max_queue
+        self.__max_batch = max_batch
+        self.__poll_interval = poll_interval
+        self.__progress_interval = progress_interval
+        self.__options = options
+        self.__subscriptions: List[Subscription] = []
+        self.__position = MonitorPosition()
+        self.__lock = threading.Lock()
+        self.__wakeup = threading.Event()
+        self.__changed = False
+        self.__closed = False
+        self.__thread: Optional[threading.Thread] = None
+        self.__monitor: Optional[ResilientMonitor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def next_height(self) -> Optional[int]:
+        """
+        Height to resume monitoring from
+        """
+        next_height = self.__position.next_height
+        return self.__height if next_height is None else next_height
+
+    def subscribe(self, filters: Union[EventFilter, List[EventFilter]],
+                  max_queue: Optional[int] = None) -> Subscription:
+        """
+        Adds a subscription of the events matching any of the filters
+
+        :param filters: one event filter or list of event filters
+        :param max_queue: max number of notifications in the queue. `max_queue` of the hub by default.
+        """
+        subscription = Subscription(self, _filters_of(filters), max_queue or self.__max_queue)
+        with self.__lock:
+            if self.__closed:
+                raise Exception("SubscriptionHub is closed")
+            self.__subscriptions.append(subscription)
+            self.__changed = True
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="SubscriptionHub", daemon=True)
+                self.__thread.start()
+        self.__wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.__lock:
+            if subscription not in self.__subscriptions:
+                return
+            self.__subscriptions.remove(subscription)
+            self.__changed = True
+        subscription._stop()
+        self.__wakeup.set()
+
+    def close(self):
+        with self.__lock:
+            self.__closed = True
+            subscriptions, self.__subscriptions = self.__subscriptions, []
+            thread = self.__thread
+            monitor = self.__monitor
+        for subscription in subscriptions:
+            subscription._stop()
+        self.__wakeup.set()
+        if monitor is not None:
+            # stops reconnecting
+            monitor.close()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __spec(self, subscriptions: List[Subscription]) -> EventMonitorSpec:
+        filters = [f for subscription in subscriptions for f in subscription.filters]
+        return EventMonitorSpec(self.next_height, filters, logs=True, progress_interval=self.__progress_interval)
+
+    def __apply(self, monitor: Optional[ResilientMonitor]) -> Tuple[Optional[ResilientMonitor], List[Subscription]]:
+        with self.__lock:
+            self.__changed = False
+            subscriptions = list(self.__subscriptions)
+        if not subscriptions:
+            if monitor is not None:
+                monitor.close()
+            self.__monitor = None
+            return None, subscriptions
+        if self.__height is None:
+            self.__height = self.__service.get_last_height() + 1
+        spec = self.__spec(subscriptions)
+        if monitor is None:
+            # the spec is made of valid filters, so failures of the first connection are retried too
+            monitor = ResilientMonitor(self.__service, spec, position=self.__position, retry_first=True,
+                                       **self.__options)
+            with self.__lock:
+                self.__monitor = monitor
+                if self.__closed:
+                    monitor.close()
+        else:
+            monitor.resubscribe(spec)
+        return monitor, subscriptions
+
+    def __run(self):
+        monitor: Optional[ResilientMonitor] = None
+        subscriptions: List[Subscription] = []
+        try:
+            while not self.__closed:
+                if self.__changed:
+                    monitor, subscriptions = self.__apply(monitor)
+                if monitor is None:
+                    self.__wakeup.wait(self.__poll_interval)
+                    self.__wakeup.clear()
+                    continue
+                for notification in monitor.read_many(self.__max_batch, self.__poll_interval):
+                    if "progress" in notification:
+                        continue
+                    for subscription, routed in route(notification, subscriptions):
+                        subscription._put(routed)
+        except (Exception, IconServiceBaseException) as e:
+            if self.__closed:
+                return
+            logger.error(f"SubscriptionHub stops by {e!r}")
+            with self.__lock:
+                self.__closed = True
+                subscriptions, self.__subscriptions = self.__subscriptions, []
+            for subscription in subscriptions:
+                subscription._stop(e)
+        finally:
+            if monitor is not None:
+                monitor.close()
+
+
+class AsyncSubscription:
+    """
+    Subscription of an AsyncSubscriptionHub with a bounded queue of notifications
+    """
+
+    def __init__(self, hub: 'AsyncSubscriptionHub', filters: List[EventFilter], max_queue: int):
+        self.__hub = hub
+        self.filters = filters
+        self.__queue = asyncio.Queue(max_queue)
+        self.__error: Optional[BaseException] = None
+        self.dropped = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _put(self, notification: Dict[str, Any]):
+        try:
+            self.__queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Drop a notification of {notification.get('height')} for the full queue")
+
+    def _stop(self, error: Optional[BaseException] = None):
+        self.__error = error
+        while True:
+            try:
+                self.__queue.put_nowait(_CLOSED)
+                return
+            except asyncio.QueueFull:
+                self.__queue.get_nowait()
+
+    async def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Returns the next notification
+
+        :param timeout: timeout to wait for the notification in fraction of seconds
+        :except MonitorTimeoutException: if it passes the timeout
+        """
+        try:
+            notification = await asyncio.wait_for(self.__queue.get(), timeout)
+        except asyncio.TimeoutError:
+            raise MonitorTimeoutException()
+        if notification is _CLOSED:
+            self.__queue.put_nowait(_CLOSED)
+            if self.__error is not None:
+                raise self.__error
+            raise Exception("Subscription is closed")
+        return notification
+
+    async def __aiter__(self):
+        while True:
+            yield await self.get()
+
+    async def close(self):
+        await self.__hub.unsubscribe(self)
+
+
+class AsyncSubscriptionHub:
+    """
+    SubscriptionHub for AsyncIconService, routing notifications in a task
+    """
+
+    def __init__(self, service, height: Optional[int] = None,
+                 max_queue: int = 1000,
+                 max_batch: int = 100,
+                 poll_interval: float = 1.0,
+                 progress_interval: int = 0,
+                 **options):
+        """
+        :param service: AsyncIconService to make monitors
+        :param height: height to start monitoring. The next height of the last block by default.
+        :param max_queue: max number of notifications in the queue of a subscription
+        :param max_batch: max number of notifications read from the monitor at once
+        :param poll_interval: max seconds to apply changes of the subscriptions
+        :param progress_interval: progress interval of the monitor to keep the height to resume
+        :param options: other options of AsyncResilientMonitor
+        """
+        self.__service = service
+        self.__height = height
+        self.__max_queue = max_queue
+        self.__max_batch = max_batch
+        self.__poll_interval = poll_interval
+        self.__progress_interval = progress_interval
+        self.__options = options
+        self.__subscriptions: List[AsyncSubscription] = []
+        self.__position = MonitorPosition()
+        self.__wakeup = asyncio.Event()
+        self.__changed = False
+        self.__closed = False
+        self.__task: Optional[asyncio.Task] = None
+        self.__monitor: Optional[AsyncResilientMonitor] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def next_height(self) -> Optional[int]:
+        """
+        Height to resume monitoring from
+        """
+        next_height = self.__position.next_height
+        return self.__height if next_height is None else next_height
+
+    def subscribe(self, filters: Union[EventFilter, List[EventFilter]],
+                  max_queue: Optional[int] = None) -> AsyncSubscription:
+        """
+        Adds a subscription of the events matching any of the filters
+
+        :param filters: one event filter or list of event filters
+        :param max_queue: max number of notifications in the queue. `max_queue` of the hub by default.
+        """
+        if self.__closed:
+            raise Exception("AsyncSubscriptionHub is closed")
+        subscription = AsyncSubscription(self, _filters_of(filters), max_queue or self.__max_queue)
+        self.__subscriptions.append(subscription)
+        self.__changed = True
+        if self.__task is None:
+            self.__task = asyncio.ensure_future(self.__run())
+        self.__wakeup.set()
+        return subscription
+
+    async def unsubscribe(self, subscription: AsyncSubscription):
+        if subscription not in self.__subscriptions:
+            return
+        self.__subscriptions.remove(subscription)
+        self.__changed = True
+        subscription._stop()
+        self.__wakeup.set()
+
+    async def close(self):
+        self.__closed = True
+        subscriptions, self.__subscriptions = self.__subscriptions, []
+        for subscription in subscriptions:
+            subscription._stop()
+        self.__wakeup.set()
+        if self.__monitor is not None:
+            # stops reconnecting
+            await self.__monitor.close()
+        if self.__task is not None:
+            await self.__task
+
+    def __spec(self, subscriptions: List[AsyncSubscription]) -> EventMonitorSpec:
+        filters = [f for subscription in subscriptions for f in subscription.filters]
+        return EventMonitorSpec(self.next_height, filters, logs=True, progress_interval=self.__progress_interval)
+
+    async def __apply(self, monitor: Optional[AsyncResilientMonitor]) \
+            -> Tuple[Optional[AsyncResilientMonitor], List[AsyncSubscription]]:
+        self.__changed = False
+        subscriptions = list(self.__subscriptions)
+        if not subscriptions:
+            if monitor is not None:
+                await monitor.close()
+            self.__monitor = None
+            return None, subscriptions
+        if self.__height is None:
+            self.__height = await self.__service.get_last_height() + 1
+        spec = self.__spec(subscriptions)
+        if monitor is None:
+            monitor = self.__monitor = AsyncResilientMonitor(self.__service, spec, position=self.__position,
+                                                             retry_first=True, **self.__options)
+        else:
+            await monitor.resubscribe(spec)
+        return monitor, subscriptions
+
+    async def __run(self):
+        monitor: Optional[AsyncResilientMonitor] = None
+        subscriptions: List[AsyncSubscription] = []
+        try:
+            while not self.__closed:
+                if self.__changed:
+                    monitor, subscriptions = await self.__apply(monitor)
+                if monitor is None:
+                    try:
+                        await asyncio.wait_for(self.__wakeup.wait(), self.__poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self.__wakeup.clear()
+                    continue
+                for notification in await monitor.read_many(self.__max_batch, self.__poll_interval):
+                    if "progress" in notification:
+                        continue
+                    for subscription, routed in route(notification, subscriptions):
+                        subscription._put(routed)
+        except (Exception, IconServiceBaseException) as e:
+            if self.__closed:
+                return
+            logger.error(f"AsyncSubscriptionHub stops by {e!r}")
+            self.__closed = True
+            subscriptions, self.__subscriptions = self.__subscriptions, []
+            for subscription in subscriptions:
+                subscription._stop(e)
+        finally:
+            if monitor is not None:
+                await monitor.close()
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
 from functools import wraps
 from logging import Formatter, StreamHandler
@@ -71,3 +72,11 @@ def set_logger(level, handler=StreamHandler(),
 def get_timestamp() -> str:
     """Returns the timestamp in microseconds since the epoch"""
     return hex(int(time() * 10 ** 6))
+
+
+def retrieve_exception(future: asyncio.Future) -> None:
+    """Retrieves the exception of a done future, so asyncio doesn't log it as never retrieved.
+    It's used as a done callback of tasks which may be left behind.
+    """
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Logs bloom of blocks and transaction results.
+
+An event log adds the SCORE address with the index 0xff and each indexed item
+(the event signature is the item 0) with its index to the bloom.
+An item sets 3 bits chosen by the first 6 bytes of sha3_256(index + item bytes).
+So a bloom not having all the bits of an event filter can't contain the event.
+"""
+
+from hashlib import sha3_256
+from typing import Any, Iterable, List, Optional, Union
+
+from iconsdk.exception import DataTypeException
+from iconsdk.monitor import EventFilter
+from iconsdk.utils.hexadecimal import is_0x_prefixed, remove_0x_prefix
+from iconsdk.wallet.wallet import Wallet
+
+BLOOM_BITS = 2048
+BLOOM_BYTES = BLOOM_BITS // 8
+ADDRESS_INDEX = 0xff
+
+
+def int_to_bytes(value: int) -> bytes:
+    """
+    Returns the shortest big-endian two's complement bytes of the integer
+    """
+    length = ((value if value >= 0 else ~value).bit_length() // 8) + 1
+    return value.to_bytes(length, "big", signed=True)
+
+
+def address_to_bytes(address: str) -> bytes:
+    """
+    Returns 21 bytes of the address, 0x00 or 0x01 for `hx` or `cx` followed by its body
+    """
+    if len(address) != 42 or address[:2] not in ("hx", "cx"):
+        raise DataTypeException(f"Invalid address {address!r}")
+    return (b"\x01" if address[:2] == "cx" else b"\x00") + bytes.fromhex(address[2:])
+
+
+def get_param_types(signature: str) -> List[str]:
+    """
+    Returns the parameter types of an event signature like `Transfer(Address,Address,int,bytes)`
+    """
+    start = signature.find("(")
+    if start < 0 or not signature.endswith(")"):
+        raise DataTypeException(f"Invalid event signature {signature!r}")
+    params = signature[start + 1:-1]
+    return params.split(",") if params else []
+
+
+def item_to_bytes(value: Any, param_type: Optional[str] = None) -> bytes:
+    """
+    Returns bytes of an indexed item as stored in the event log.
+    Values may be python values or strings of them as the node returns,
+    like '0x10' for int 16.
+
+    :param value: value of the item
+    :param param_type: type in the event signature. It's guessed by the value without it.
+    :return: bytes of the item
+    """
+    if isinstance(value, Wallet):
+        value = value.get_address()
+    if isinstance(value, (bool, int)):
+        return int_to_bytes(int(value))
+    if isinstance(value, bytes):
+        return value
+    if not isinstance(value, str):
+        raise DataTypeException(f"Unsupported item {value!r}")
+
+    if param_type == "str":
+        return value.encode("utf-8")
+    if param_type == "Address":
+        return address_to_bytes(value)
+    if param_type in ("int", "bool"):
+        return int_to_bytes(int(value, 0))
+    if param_type == "bytes":
+        return bytes.fromhex(remove_0x_prefix(value))
+    # without the type
+    if len(value) == 42 and value[:2] in ("hx", "cx"):
+        return address_to_bytes(value)
+    if is_0x_prefixed(value):
+        return bytes.fromhex(remove_0x_prefix(value))
+    return value.encode("utf-8")
+
+
+class LogsBloom:
+    """
+    Bloom of event logs. `a in b` is true if `b` has all the bits of `a`.
+    """
+
+    def __init__(self, value: Union[int, bytes, str, None] = None):
+        """
+        :param value: bits of the bloom as an integer, bytes, or a hex string prefixed with '0x'
+        """
+        if value is None:
+            value = 0
+        elif isinstance(value, str):
+            value = int(remove_0x_prefix(value) or "0", 16)
+        elif isinstance(value, (bytes, bytearray)):
+            value = int.from_bytes(value, "big")
+        self.__bits = value
+
+    @property
+    def bits(self) -> int:
+        return self.__bits
+
+    def to_bytes(self) -> bytes:
+        return self.__bits.to_bytes(BLOOM_BYTES, "big")
+
+    def add_item(self, index: int, item: bytes):
+        digest = sha3_256(bytes([index]) + item).digest()
+        for i in range(0, 6, 2):
+            self.__bits |= 1 << (int.from_bytes(digest[i:i + 2], "big") & (BLOOM_BITS - 1))
+
+    def add_event(self, addr: Optional[str], indexed: Iterable[Any]):
+        """
+        Adds an event log to the bloom.
+        Items which are None are skipped, so an event filter with them sets bits of the others.
+
+        :param addr: address of the SCORE
+        :param indexed: event signature followed by indexed items
+        """
+        indexed = list(indexed)
+        if not indexed:
+            raise DataTypeException("No event signature")
+        if addr is not None:
+            self.add_item(ADDRESS_INDEX, address_to_bytes(addr))
+        param_types = get_param_types(indexed[0])
+        self.add_item(0, indexed[0].encode("utf-8"))
+        for i, value in enumerate(indexed[1:], 1):
+            if value is not None:
+                param_type = param_types[i - 1] if i - 1 < len(param_types) else None
+                self.add_item(i, item_to_bytes(value, param_type))
+
+    def __contains__(self, other: 'LogsBloom') -> bool:
+        return self.__bits & other.__bits == other.__bits
+
+    def __or__(self, other: 'LogsBloom') -> 'LogsBloom':
+        return LogsBloom(self.__bits | other.__bits)
+
+    def __eq__(self, other):
+        return isinstance(other, LogsBloom) and self.__bits == other.__bits
+
+    def __repr__(self):
+        return f"LogsBloom(0x{self.to_bytes().hex()})"
+
+    @classmethod
+    def from_event_filter(cls, event_filter: EventFilter) -> 'LogsBloom':
+        """
+        Returns the bloom which a block or a transaction result
+        containing an event of the filter must have
+        """
+        bloom = cls()
+        bloom.add_event(event_filter.addr, [event_filter.event] + event_filter.indexed)
+        return bloom
+
+    @classmethod
+    def from_event_logs(cls, event_logs: Iterable[dict]) -> 'LogsBloom':
+        """
+        Returns the bloom of event logs of transaction results like `{"scoreAddress": .., "indexed": [..]}`
+        """
+        bloom = cls()
+        for event_log in event_logs:
+            bloom.add_event(event_log["scoreAddress"], event_log["indexed"])
+        return bloom
+
+
+def may_contain_events(target: dict, event_filters: Union[EventFilter, Iterable[EventFilter]]) -> bool:
+    """
+    Returns whether a block or a transaction result may contain an event of the filters
+    by its `logsBloom`. It's always true without `logsBloom`.
+
+    Example::
+
+        results = [result for result in results if may_contain_events(result, event_filter)]
+
+    :param target: block or transaction result, converted or not
+    :param event_filters: one event filter or list of event filters
+    :return: False if it can't contain any event of the filters
+    """
+    value = target.get("logsBloom")
+    if not value:
+        return True
+    if isinstance(event_filters, EventFilter):
+        event_filters = [event_filters]
+    bloom = LogsBloom(value)
+    return any(LogsBloom.from_event_filter(f) in bloom for f in event_filters)
@@ -16,11 +16,12 @@
 import copy
 import logging
 import traceback
+from typing import Any, Optional
 
 from iconsdk.exception import DataTypeException
 from iconsdk.utils.hexadecimal import remove_0x_prefix
 from iconsdk.utils.templates import (ValueType, ConvertKeyName, RemoveKey, ExceptionHandle, BLOCK_0_1a,
-                                     TRANSACTIONS_OF_GENESIS_BLOCK)
+                                     BLOCK_0_3, BLOCK_0_1A_VERSION, TRANSACTIONS_OF_GENESIS_BLOCK)
 from iconsdk.utils.type import is_str
 
 
@@ -127,6 +128,28 @@ def _to_int(value):
         return int(value, 16)
 
 
+def hex_to_int(value: Any) -> Optional[int]:
+    """
+    Returns the integer of a hex string like '0x10' as nodes answer.
+    Integers are returned as they are, and None or an empty string as None.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
+
+
+def json_default(value: Any) -> Any:
+    """
+    Returns bytes as a hex string prefixed with '0x'. It's `default` of `json.dumps()`
+    for converted values.
+    """
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    raise TypeError(f"Unsupported type: {type(value)}")
+
+
 def _to_bytes(value: str) -> bytes:
     """Converts hex string prefixed with '0x' into bytes."""
     if is_str(value):
@@ -166,3 +189,32 @@ def get_block_template_to_convert_transactions_for_genesis(block, block_template
         buf_block_template["confirmed_transaction_list" if block_template == BLOCK_0_1a else "transactions"] \
             = TRANSACTIONS_OF_GENESIS_BLOCK
     return buf_block_template
+
+
+def convert_block(block: dict, block_version: str = BLOCK_0_1A_VERSION) -> dict:
+    """
+    Converts a block from ICON JSON-RPC API v3 as `IconService.get_block` does
+
+    :param block: block from the node
+    :param block_version: format version of the block
+    :return: converted block
+    """
+    if block_version == BLOCK_0_1A_VERSION:
+        block_template, full_print = BLOCK_0_1a, False
+    else:
+        block_template, full_print = BLOCK_0_3, True
+    block_template = get_block_template_to_convert_transactions_for_genesis(block, block_template)
+    return convert(block, block_template, full_print)
+
+
+def get_transaction_hashes(block: dict) -> list:
+    """
+    Returns the hashes of the transactions in a block, converted or not, of any version
+
+    :param block: block from the node or `IconService.get_block`
+    :return: list of the transaction hashes in the order of the block
+    """
+    transactions = block.get("confirmed_transaction_list")
+    if transactions is None:
+        transactions = block.get("transactions") or []
+    return [tx["txHash"] if "txHash" in tx else tx["tx_hash"] for tx in transactions]
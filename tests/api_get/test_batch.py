@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from unittest import main
+
+import requests_mock
+
+from iconsdk.exception import AddressException, DataTypeException, JSONRPCException, HTTPError
+from tests.api_send.test_send_super import TestSendSuper
+
+
+def batch_callback(results: dict):
+    """Makes a callback answering each request in a batch in the reversed order"""
+
+    def callback(request, context):
+        responses = []
+        for item in reversed(request.json()):
+            value = results[item["method"]]
+            if isinstance(value, JSONRPCException):
+                responses.append({"jsonrpc": "2.0", "id": item["id"],
+                                  "error": {"code": value.rpc_code, "message": value.message}})
+            else:
+                responses.append({"jsonrpc": "2.0", "id": item["id"], "result": value})
+        return responses
+
+    return callback
+
+
+class TestBatch(TestSendSuper):
+
+    def test_make_batch_request(self):
+        provider = self.icon_service._IconService__provider
+        with requests_mock.Mocker() as m:
+            m.post(self.matcher, json=batch_callback({
+                "icx_getBalance": "0x10",
+                "icx_getTotalSupply": "0x20",
+                "icx_getScoreApi": JSONRPCException("no score", -32602),
+            }))
+            results = provider.make_batch_request([
+                ("icx_getBalance", {"address": self.setting["from"]}),
+                ("icx_getTotalSupply",),
+                ("icx_getScoreApi", {"address": self.setting["to_governance"]}),
+            ])
+            self.assertEqual(1, m.call_count)
+            requests = json.loads(m.last_request.text)
+            self.assertEqual(3, len(requests))
+            self.assertEqual(3, len(set(request["id"] for request in requests)))
+
+        self.assertEqual(["0x10", "0x20"], results[:2])
+        self.assertIsInstance(results[2], JSONRPCException)
+        self.assertEqual(-32602, results[2].rpc_code)
+
+    def test_make_batch_request_rejected(self):
+        provider = self.icon_service._IconService__provider
+        with requests_mock.Mocker() as m:
+            m.post(self.matcher, status_code=400,
+                   json={"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "parse error"}})
+            results = provider.make_batch_request([("icx_getTotalSupply",), ("icx_getLastBlock",)])
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertIsInstance(result, JSONRPCException)
+            self.assertEqual(-32700, result.rpc_code)
+
+        with requests_mock.Mocker() as m:
+            m.post(self.matcher, status_code=502, text="Bad Gateway")
+            results = provider.make_batch_request([("icx_getTotalSupply",)])
+        self.assertIsInstance(results[0], HTTPError)
+        self.assertEqual(502, results[0].status)
+
+    def test_batch(self):
+        with requests_mock.Mocker() as m:
+            m.post(self.matcher, json=batch_callback({
+                "icx_getBalance": "0x10",
+                "icx_getTotalSupply": "0x20",
+                "icx_getTransactionResult": JSONRPCException("pending", JSONRPCException.SYSTEM_TX_PENDING),
+            }))
+            with self.icon_service.batch() as batch:
+                balance = batch.get_balance(self.setting["from"], height=10)
+                supply = batch.get_total_supply()
+                tx_result = batch.get_transaction_result(
+                    "0xb903239f8543d04b5dc1ba6579132b143087c68db1b2168786408fcbce568238")
+                self.assertFalse(balance.done())
+                with self.assertRaises(AddressException):
+                    batch.get_balance("hx1234")
+                self.assertEqual(3, len(batch))
+            self.assertEqual(1, m.call_count)
+            requests = json.loads(m.last_request.text)
+            self.assertEqual({"address": self.setting["from"], "height": hex(10)}, requests[0]["params"])
+
+        self.assertEqual(0x10, balance.result())
+        self.assertEqual(0x20, supply.result())
+        self.assertIsInstance(tx_result.exception(), JSONRPCException)
+        with self.assertRaises(JSONRPCException):
+            tx_result.result()
+        with self.assertRaises(DataTypeException):
+            batch.execute()
+
+    def test_batch_full_response(self):
+        with requests_mock.Mocker() as m:
+            m.post(self.matcher, json=batch_callback({
+                "icx_getBalance": "0x10",
+                "icx_getTotalSupply": "0x20",
+            }))
+            with self.icon_service.batch() as batch:
+                balance = batch.get_balance(self.setting["from"], full_response=True)
+                supply = batch.get_total_supply()
+            self.assertEqual(2, m.call_count)
+
+        self.assertEqual("0x10", balance.result()["result"])
+        self.assertEqual(0x20, supply.result())
+
+
+if __name__ == "__main__":
+    main()
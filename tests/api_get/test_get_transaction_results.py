@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import random
+import threading
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+import requests_mock
+
+from iconsdk.async_service import AsyncIconService
+from iconsdk.exception import DataTypeException, JSONRPCException
+from iconsdk.icon_service import IconService
+from iconsdk.monitor import EventFilter
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.http_provider import HTTPProvider
+from iconsdk.utils.bloom import LogsBloom
+from tests.example_chain import ChainProvider
+
+URL = "http://localhost:9000/api/v3"
+TOKEN = "cx" + "1" * 40
+TRANSFER = "Mint(int)"
+TX_HASHES = [f"0x{i:064x}" for i in range(1, 24)]
+MISSING = TX_HASHES[5]
+
+
+def make_block(height):
+    return {
+        "version": "0.3",
+        "height": hex(height),
+        "hash": "0x" + f"{height:064x}",
+        "transactions": [{"txHash": tx_hash, "version": "0x3"} for tx_hash in TX_HASHES if tx_hash != MISSING],
+    }
+
+
+def make_result(tx_hash):
+    return {"txHash": tx_hash, "status": "0x1", "blockHeight": "0x10", "txIndex": hex(TX_HASHES.index(tx_hash))}
+
+
+def answer(item):
+    if item["method"] == "icx_getBlock":
+        return {"jsonrpc": "2.0", "id": item["id"], "result": make_block(int(item["params"]["height"], 16))}
+    tx_hash = item["params"]["txHash"]
+    if tx_hash == MISSING:
+        return {"jsonrpc": "2.0", "id": item["id"], "error": {"code": -32602, "message": "not found"}}
+    return {"jsonrpc": "2.0", "id": item["id"], "result": make_result(tx_hash)}
+
+
+def callback(request, context):
+    time.sleep(random.random() * 0.01)
+    body = request.json()
+    if isinstance(body, list):
+        return [answer(item) for item in reversed(body)]
+    response = answer(body)
+    if "error" in response:
+        context.status_code = 400
+    return response
+
+
+class TestGetTransactionResults(TestCase):
+
+    def test_batch(self):
+        hashes = [h for h in TX_HASHES if h != MISSING]
+        with requests_mock.Mocker() as m, IconService(HTTPProvider(URL)) as icon_service:
+            m.post(URL, json=callback)
+            results = icon_service.get_transaction_results(hashes, batch_size=5, max_workers=3)
+            self.assertEqual(5, m.call_count)
+            self.assertTrue(all(isinstance(json.loads(r.text), list) for r in m.request_history))
+        self.assertEqual(hashes, [result["txHash"] for result in results])
+        self.assertEqual(1, results[0]["status"])
+
+    def test_errors(self):
+        with requests_mock.Mocker() as m, IconService(HTTPProvider(URL)) as icon_service:
+            m.post(URL, json=callback)
+            for batch_size in (1, 4):
+                results = icon_service.get_transaction_results(TX_HASHES, batch_size=batch_size,
+                                                               return_exceptions=True)
+                self.assertIsInstance(results[5], JSONRPCException)
+                self.assertEqual(TX_HASHES[6:], [result["txHash"] for result in results[6:]])
+                with self.assertRaises(JSONRPCException):
+                    icon_service.get_transaction_results(TX_HASHES, batch_size=batch_size)
+
+            self.assertRaises(DataTypeException, icon_service.get_transaction_results, ["0x1234"])
+            self.assertEqual([], icon_service.get_transaction_results([]))
+
+    def test_block_with_results(self):
+        with requests_mock.Mocker() as m, IconService(HTTPProvider(URL)) as icon_service:
+            m.post(URL, json=callback)
+            block, results = icon_service.get_block_with_results(16, block_version="0.3", batch_size=10)
+        self.assertEqual(16, block["height"])
+        self.assertEqual(22, len(results))
+        self.assertEqual([tx["txHash"] for tx in block["transactions"]], [r["txHash"] for r in results])
+
+    def test_block_with_results_by_bloom(self):
+        bloom = LogsBloom.from_event_logs([{"scoreAddress": TOKEN, "indexed": [TRANSFER, "0x1"]}])
+
+        def bloom_callback(request, context):
+            response = callback(request, context)
+            if not isinstance(response, list) and response["result"].get("transactions"):
+                response["result"]["logsBloom"] = "0x" + bloom.to_bytes().hex()
+            return response
+
+        with requests_mock.Mocker() as m, IconService(HTTPProvider(URL)) as icon_service:
+            m.post(URL, json=bloom_callback)
+            block, results = icon_service.get_block_with_results(
+                16, block_version="0.3", event_filters=EventFilter(TRANSFER, TOKEN, 1, 2))
+            self.assertEqual(1, m.call_count)
+            self.assertEqual([None] * len(block["transactions"]), results)
+
+            block, results = icon_service.get_block_with_results(
+                16, block_version="0.3", event_filters=[EventFilter(TRANSFER, TOKEN, 1, 2),
+                                                        EventFilter(TRANSFER, TOKEN, 1, 1)])
+            self.assertEqual([tx["txHash"] for tx in block["transactions"]], [r["txHash"] for r in results])
+
+    def test_map_block_with_results(self):
+        # the calls fetch their results with the threads running them
+        heights = list(range(1, 10))
+        outputs = []
+        with IconService(ChainProvider(last_height=20), max_workers=2) as icon_service:
+            thread = threading.Thread(daemon=True, target=lambda: outputs.extend(icon_service.map(
+                "get_block_with_results", [{"value": h, "block_version": "0.3", "batch_size": 1} for h in heights])))
+            thread.start()
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(heights, [block["height"] for block, _ in outputs])
+        self.assertEqual([[tx["txHash"] for tx in block["transactions"]] for block, _ in outputs],
+                         [[r["txHash"] for r in results] for _, results in outputs])
+
+
+class ResultProvider(AsyncProvider):
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.batches = 0
+
+    async def make_request(self, method, params=None, full_response=False):
+        response = answer({"id": 1, "method": method, "params": params})
+        await asyncio.sleep(random.random() * 0.01)
+        if "error" in response:
+            raise JSONRPCException(response["error"]["message"], response["error"]["code"], None)
+        return response["result"]
+
+    async def make_batch_request(self, entries, full_response=False):
+        self.batches += 1
+        self.running += 1
+        self.max_running = max(self.running, self.max_running)
+        try:
+            return await super().make_batch_request(entries, full_response)
+        finally:
+            self.running -= 1
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class TestAsyncGetTransactionResults(IsolatedAsyncioTestCase):
+
+    async def test_results(self):
+        provider = ResultProvider()
+        service = AsyncIconService(provider)
+        results = await service.get_transaction_results(TX_HASHES, batch_size=2, concurrency=3,
+                                                        return_exceptions=True)
+        self.assertEqual(12, provider.batches)
+        self.assertLessEqual(provider.max_running, 3)
+        self.assertIsInstance(results[5], JSONRPCException)
+        del results[5]
+        self.assertEqual([h for h in TX_HASHES if h != MISSING], [result["txHash"] for result in results])
+
+        with self.assertRaises(JSONRPCException):
+            await service.get_transaction_results(TX_HASHES, batch_size=1)
+
+    async def test_block_with_results(self):
+        service = AsyncIconService(ResultProvider())
+        block, results = await service.get_block_with_results(16, block_version="0.3", batch_size=30)
+        self.assertEqual([tx["txHash"] for tx in block["transactions"]], [r["txHash"] for r in results])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import random
+import threading
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+from iconsdk.async_service import AsyncIconService
+from iconsdk.exception import JSONRPCException
+from iconsdk.icon_service import IconService
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.provider import Provider
+
+LAST_HEIGHT = 100
+
+
+def make_block(height):
+    return {"version": "0.3", "height": hex(height), "hash": "0x" + f"{height:064x}", "transactions": []}
+
+
+class BlockProvider(Provider):
+    """Returns blocks after a random delay, failing `failures` times on the heights in `failing`"""
+
+    def __init__(self, failing=(), failures=1):
+        self.failing = {h: failures for h in failing}
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.requested = []
+
+    def make_request(self, method, params=None, full_response=False):
+        if method == "icx_getLastBlock":
+            return make_block(LAST_HEIGHT)
+        height = int(params["height"], 16)
+        with self.lock:
+            self.requested.append(height)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(random.random() * 0.01)
+            with self.lock:
+                if self.failing.get(height, 0) > 0:
+                    self.failing[height] -= 1
+                    raise JSONRPCException("fail", -31000, None)
+            return make_block(height)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class TestIterBlocks(TestCase):
+
+    def test_order(self):
+        provider = BlockProvider()
+        with IconService(provider, max_workers=8) as icon_service:
+            heights = [block["height"] for block in icon_service.iter_blocks(10, 59, concurrency=4,
+                                                                             block_version="0.3")]
+        self.assertEqual(list(range(10, 60)), heights)
+        self.assertLessEqual(provider.max_running, 4)
+
+    def test_to_last(self):
+        with IconService(BlockProvider()) as icon_service:
+            heights = [block["height"] for block in icon_service.iter_blocks(95, block_version="0.3")]
+        self.assertEqual(list(range(95, LAST_HEIGHT + 1)), heights)
+
+    def test_retry(self):
+        provider = BlockProvider(failing=[12, 15], failures=2)
+        with IconService(provider) as icon_service:
+            blocks = icon_service.iter_blocks(10, 19, block_version="0.3", retries=2)
+            heights = [block["height"] for block in blocks]
+        self.assertEqual(list(range(10, 20)), heights)
+        self.assertEqual(3, provider.requested.count(12))
+
+    def test_resume(self):
+        provider = BlockProvider(failing=[15], failures=2)
+        with IconService(provider) as icon_service:
+            blocks = icon_service.iter_blocks(10, 19, block_version="0.3", retries=0)
+            heights = []
+            with self.assertRaises(JSONRPCException):
+                for block in blocks:
+                    heights.append(block["height"])
+            self.assertEqual(list(range(10, 15)), heights)
+            self.assertEqual(15, blocks.next_height)
+
+            # iterating again retries the failed height
+            with self.assertRaises(JSONRPCException):
+                next(blocks)
+            # a new iterator resumes from the checkpoint
+            heights += [block["height"] for block in icon_service.iter_blocks(blocks.next_height, 19,
+                                                                              block_version="0.3")]
+        self.assertEqual(list(range(10, 20)), heights)
+
+    def test_invalid(self):
+        with IconService(BlockProvider()) as icon_service:
+            self.assertRaises(ValueError, icon_service.iter_blocks, 10, 5)
+            self.assertRaises(ValueError, icon_service.iter_blocks, 10, 20, concurrency=0)
+            self.assertEqual([], list(icon_service.iter_blocks(10, 9)))
+
+
+class AsyncBlockProvider(AsyncProvider):
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.running = 0
+        self.max_running = 0
+
+    async def make_request(self, method, params=None, full_response=False):
+        if method == "icx_getLastBlock":
+            return make_block(LAST_HEIGHT)
+        height = int(params["height"], 16)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(random.random() * 0.01)
+            if height in self.failing:
+                self.failing.remove(height)
+                raise JSONRPCException("fail", -31000, None)
+            return make_block(height)
+        finally:
+            self.running -= 1
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class TestAsyncIterBlocks(IsolatedAsyncioTestCase):
+
+    async def test_order(self):
+        provider = AsyncBlockProvider(failing=[33])
+        service = AsyncIconService(provider)
+        heights = [int(block["height"], 16)
+                   async for block in await service.iter_blocks(10, 59, concurrency=4, block_version="0.3")]
+        self.assertEqual(list(range(10, 60)), heights)
+        self.assertLessEqual(provider.max_running, 4)
+
+    async def test_resume(self):
+        service = AsyncIconService(AsyncBlockProvider(failing=[15]))
+        blocks = await service.iter_blocks(10, 19, block_version="0.3", retries=0)
+        heights = []
+        with self.assertRaises(JSONRPCException):
+            async for block in blocks:
+                heights.append(int(block["height"], 16))
+        self.assertEqual(15, blocks.next_height)
+        heights += [int(block["height"], 16) async for block in blocks]
+        self.assertEqual(list(range(10, 20)), heights)
+
+    async def test_to_last(self):
+        service = AsyncIconService(AsyncBlockProvider())
+        async with await service.iter_blocks(98) as blocks:
+            heights = [int(block["height"], 16) async for block in blocks]
+        self.assertEqual(list(range(98, LAST_HEIGHT + 1)), heights)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from unittest import TestCase, main
+
+import requests_mock
+
+from iconsdk.exception import AddressException, JSONRPCException
+from iconsdk.icon_service import IconService
+from iconsdk.parallel import ParallelExecutor
+from iconsdk.providers.http_provider import HTTPProvider
+
+URL = "http://localhost:9000/api/v3"
+ADDRESSES = [f"hx{i:040x}" for i in range(1, 21)]
+
+
+def balance_callback(request, context):
+    body = request.json()
+    address = body["params"]["address"]
+    if address == ADDRESSES[3]:
+        context.status_code = 400
+        return {"jsonrpc": "2.0", "id": body["id"], "error": {"code": -32602, "message": "invalid"}}
+    time.sleep(0.01)
+    return {"jsonrpc": "2.0", "id": body["id"], "result": hex(int(address[2:], 16))}
+
+
+class TestParallel(TestCase):
+
+    def test_map(self):
+        with requests_mock.Mocker() as m, IconService(HTTPProvider(URL), max_workers=8) as icon_service:
+            m.post(URL, json=balance_callback)
+            results = list(icon_service.map("get_balance", ADDRESSES, return_exceptions=True))
+        self.assertEqual(len(ADDRESSES), len(results))
+        self.assertIsInstance(results[3], JSONRPCException)
+        expected = [i + 1 for i in range(len(ADDRESSES))]
+        del results[3], expected[3]
+        self.assertEqual(expected, results)
+
+    def test_map_raise(self):
+        with requests_mock.Mocker() as m:
+            m.post(URL, json=balance_callback)
+            icon_service = IconService(HTTPProvider(URL))
+            results = icon_service.map("get_balance", ADDRESSES)
+            self.assertEqual([1, 2, 3], [next(results) for _ in range(3)])
+            with self.assertRaises(JSONRPCException):
+                next(results)
+
+            # arguments are validated in the calls
+            with self.assertRaises(AddressException):
+                list(icon_service.map("get_balance", [("hx1", None)]))
+        with self.assertRaises(AttributeError):
+            icon_service.map("_IconService__provider", [])
+
+    def test_submit(self):
+        with requests_mock.Mocker() as m:
+            m.post(URL, json=balance_callback)
+            icon_service = IconService(HTTPProvider(URL))
+            futures = [icon_service.submit("get_balance", address) for address in ADDRESSES[:3]]
+            self.assertEqual([1, 2, 3], [future.result() for future in futures])
+
+    def test_backpressure(self):
+        executor = ParallelExecutor(max_workers=2, max_pending=2)
+        release = threading.Event()
+        futures = [executor.submit(release.wait) for _ in range(2)]
+        blocked = threading.Thread(target=executor.submit, args=(release.wait,))
+        blocked.start()
+        blocked.join(0.05)
+        self.assertTrue(blocked.is_alive())
+        release.set()
+        blocked.join(1)
+        self.assertFalse(blocked.is_alive())
+        self.assertTrue(all(future.result() for future in futures))
+        executor.shutdown()
+
+    def test_map_window(self):
+        executor = ParallelExecutor(max_workers=8)
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def work(i):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.005)
+            with lock:
+                running[0] -= 1
+            return i * 2
+
+        self.assertEqual([i * 2 for i in range(20)], list(executor.map(work, range(20), max_workers=3)))
+        self.assertLessEqual(peak[0], 3)
+        executor.shutdown()
+
+    def test_nested(self):
+        executor = ParallelExecutor(max_workers=2, max_pending=2)
+
+        def work(i):
+            # waiting for calls of the same executor in all its threads
+            return sum(executor.map(lambda j: i * j, range(4)))
+
+        results = []
+        thread = threading.Thread(target=lambda: results.extend(executor.map(work, range(8))), daemon=True)
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([i * 6 for i in range(8)], results)
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, main
+
+from iconsdk.async_service import AsyncIconService
+from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.provider import MonitorTimeoutException
+
+
+def make_block(height):
+    return {"version": "0.3", "height": hex(height), "hash": "0x" + f"{height:064x}", "transactions": []}
+
+
+class ScriptedMonitor(AsyncMonitor):
+    """Notifies the heights of the script, then raises the error after the chain grows to `height_after`"""
+
+    def __init__(self, provider, script, error, height_after):
+        self.provider = provider
+        self.script = list(script)
+        self.error = error
+        self.height_after = height_after
+        self.closed = False
+
+    async def read(self, timeout=None):
+        await asyncio.sleep(0)
+        if not self.script:
+            if self.height_after is not None:
+                self.provider.height = self.height_after
+            raise self.error
+        height = self.script.pop(0)
+        self.provider.height = max(self.provider.height, height)
+        return {"height": hex(height), "hash": "0x" + f"{height:064x}"}
+
+    async def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class ChainProvider(AsyncProvider):
+    """Chain growing by notifications. Each monitor takes the next script, or fails without it"""
+
+    def __init__(self, height, scripts):
+        self.height = height
+        self.scripts = list(scripts)
+        self.monitors = []
+        self.monitored_heights = []
+
+    async def make_request(self, method, params=None, full_response=False):
+        if method == "icx_getLastBlock":
+            return make_block(self.height)
+        height = int(params["height"], 16)
+        assert height <= self.height, f"block {height} is not made yet"
+        await asyncio.sleep(0.001)
+        return make_block(height)
+
+    async def make_monitor(self, spec, keep_alive=None):
+        self.monitored_heights.append(int(spec.get_request()["height"], 16))
+        if not self.scripts:
+            raise ConnectionError("monitor is not available")
+        monitor = ScriptedMonitor(self, *self.scripts.pop(0))
+        self.monitors.append(monitor)
+        return monitor
+
+
+async def take(stream, count):
+    blocks = []
+    async for block in stream:
+        blocks.append(block)
+        if len(blocks) == count:
+            break
+    return blocks
+
+
+class TestStreamBlocks(IsolatedAsyncioTestCase):
+
+    async def test_catch_up_then_tail(self):
+        provider = ChainProvider(20, [
+            # stale, new, duplicated and skipped heights, then the socket drops after the chain grows
+            ([19, 21, 21, 23], ConnectionError("dropped"), 25),
+        ])
+        service = AsyncIconService(provider)
+        async with service.stream_blocks(10, poll_interval=0.01, reconnect_delay=0.05) as stream:
+            blocks = await take(stream, 16)
+            self.assertEqual(26, stream.next_height)
+        self.assertEqual(list(range(10, 26)), [block["height"] for block in blocks])
+        self.assertEqual(21, provider.monitored_heights[0])
+        self.assertTrue(all(monitor.closed for monitor in provider.monitors))
+
+    async def test_reconnect_by_timeout(self):
+        provider = ChainProvider(5, [
+            ([6], MonitorTimeoutException(), 8),
+            ([9, 10], ConnectionError("dropped"), None),
+        ])
+        service = AsyncIconService(provider)
+        stream = service.stream_blocks(0, convert=False, poll_interval=0.01, reconnect_delay=0.05)
+        blocks = await take(stream, 11)
+        await stream.aclose()
+        self.assertEqual([hex(h) for h in range(0, 11)], [block["height"] for block in blocks])
+        # the monitor is started again from the next height after catching up
+        self.assertEqual([6, 9], provider.monitored_heights)
+        self.assertTrue(all(monitor.closed for monitor in provider.monitors))
+
+    async def test_resume(self):
+        service = AsyncIconService(ChainProvider(30, []))
+        stream = service.stream_blocks(10, poll_interval=0.01)
+        await take(stream, 5)
+        await stream.aclose()
+        resumed = await take(service.stream_blocks(stream.next_height, poll_interval=0.01), 5)
+        self.assertEqual(list(range(15, 20)), [block["height"] for block in resumed])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Providers of a made-up chain answering blocks and transaction results from their heights"""
+
+import asyncio
+
+from iconsdk.exception import JSONRPCException
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.provider import Provider
+
+TOKEN = "cx" + "1" * 40
+ALICE = "hx" + "a" * 40
+BOB = "hx" + "b" * 40
+CAROL = "hx" + "c" * 40
+TRANSFER = "Transfer(Address,Address,int,bytes)"
+
+
+def tx_hash_of(height: int, index: int) -> str:
+    return f"0x{height:032x}{index:032x}"
+
+
+def position_of(tx_hash: str) -> tuple:
+    return int(tx_hash[2:34], 16), int(tx_hash[34:], 16)
+
+
+def tx_count_of(height: int) -> int:
+    """Every 5th block is empty, and the others have 2 transactions"""
+    return 0 if height % 5 == 0 else 2
+
+
+def make_block(height: int) -> dict:
+    return {
+        "version": "0.3",
+        "height": hex(height),
+        "hash": f"0x{height:064x}",
+        "prevHash": f"0x{max(height - 1, 0):064x}",
+        "timestamp": hex(1_700_000_000_000_000 + height * 2_000_000),
+        "transactions": [{
+            "version": "0x3",
+            "from": ALICE if index == 0 else BOB,
+            "to": TOKEN,
+            "value": "0x0",
+            "dataType": "call",
+            "txHash": tx_hash_of(height, index),
+        } for index in range(tx_count_of(height))],
+    }
+
+
+def make_result(tx_hash: str) -> dict:
+    height, index = position_of(tx_hash)
+    return {
+        "txHash": tx_hash,
+        "blockHeight": hex(height),
+        "txIndex": hex(index),
+        "to": TOKEN,
+        "status": "0x1",
+        "stepUsed": "0x1000",
+        "eventLogs": [{
+            "scoreAddress": TOKEN,
+            "indexed": [TRANSFER, ALICE if index == 0 else BOB, CAROL, hex(height * 10 + index)],
+            "data": ["0x"],
+        }],
+    }
+
+
+class ChainProvider(Provider):
+
+    def __init__(self, last_height: int = 100, failing=()):
+        self.last_height = last_height
+        self.failing = set(failing)
+        self.requests = 0
+
+    def answer(self, method, params):
+        self.requests += 1
+        if method == "icx_getLastBlock":
+            return make_block(self.last_height)
+        if method == "icx_getBlock":
+            height = int(params["height"], 16)
+        elif method == "icx_getTransactionResult":
+            height = position_of(params["txHash"])[0]
+        else:
+            raise JSONRPCException(f"Unknown method {method}", -32601, None)
+        if height in self.failing or height > self.last_height:
+            raise JSONRPCException(f"Fail to get {height}", -31000, None)
+        return make_block(height) if method == "icx_getBlock" else make_result(params["txHash"])
+
+    def make_request(self, method, params=None, full_response=False):
+        return self.answer(method, params)
+
+    def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class AsyncChainProvider(AsyncProvider):
+
+    def __init__(self, last_height: int = 100, failing=()):
+        self.chain = ChainProvider(last_height, failing)
+
+    async def make_request(self, method, params=None, full_response=False):
+        await asyncio.sleep(0)
+        return self.chain.answer(method, params)
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from importlib.util import find_spec
+from unittest import TestCase, main, skipUnless
+
+from iconsdk.columnar import EventLogColumns, EventLogWriter
+from iconsdk.icon_service import IconService
+from tests.example_chain import ALICE, BOB, CAROL, TOKEN, TRANSFER, ChainProvider, make_block, make_result, \
+    tx_hash_of
+
+APPROVAL = "Approval(Address,Address,int)"
+
+
+def blocks_with_results(start, end):
+    for height in range(start, end + 1):
+        block = make_block(height)
+        yield block, [make_result(tx["txHash"]) for tx in block["transactions"]]
+
+
+class TestEventLogColumns(TestCase):
+
+    def test_columns(self):
+        columns = EventLogColumns()
+        columns.add_blocks(blocks_with_results(1, 4))
+        self.assertEqual(8, len(columns))
+        data = columns.to_pydict()
+        self.assertEqual(columns.column_names, list(data))
+        self.assertEqual([1, 1, 2, 2, 3, 3, 4, 4], data["height"][:8])
+        self.assertEqual([0, 1] * 4, data["tx_index"])
+        self.assertEqual([0] * 8, data["log_index"])
+        self.assertEqual(tx_hash_of(2, 1), data["tx_hash"][3])
+        self.assertEqual([TOKEN] * 8, data["score_address"])
+        self.assertEqual([TRANSFER] * 8, data["signature"])
+        self.assertEqual([ALICE, BOB] * 4, data["indexed_1"])
+        self.assertEqual([CAROL] * 8, data["indexed_2"])
+        self.assertEqual("0xa", data["indexed_3"][0])
+        self.assertEqual(["0x"] * 8, data["data_0"])
+
+        columns.clear()
+        self.assertEqual(0, len(columns))
+
+    def test_decode_ints(self):
+        result = {
+            "txHash": tx_hash_of(7, 0), "blockHeight": "0x7", "txIndex": "0x0",
+            "eventLogs": [
+                {"scoreAddress": TOKEN, "indexed": [TRANSFER, ALICE, BOB, "0x64"], "data": ["0x1234"]},
+                {"scoreAddress": TOKEN, "indexed": [APPROVAL, ALICE, BOB], "data": ["0x" + "f" * 64]},
+                {"scoreAddress": "cx" + "2" * 40, "indexed": ["Vote(int)", "-0x1"], "data": ["0x1", "yes"]},
+            ],
+        }
+        columns = EventLogColumns(decode_ints=True)
+        columns.add_result(result)
+        data = columns.to_pydict()
+        self.assertEqual([7, 7, 7], data["height"])
+        self.assertEqual([0, 1, 2], data["log_index"])
+        self.assertEqual([100, None, None], data["indexed_3"])
+        self.assertEqual([ALICE, ALICE, -1], data["indexed_1"])
+        # bytes stay, ints are decoded by the signature
+        self.assertEqual(["0x1234", 2 ** 256 - 1, "0x1"], data["data_0"])
+        self.assertEqual([None, None, "yes"], data["data_1"])
+
+        columns = EventLogColumns(decode_ints=True, signatures=[APPROVAL])
+        columns.add_result(result)
+        self.assertEqual([1], columns.to_pydict()["log_index"])
+        columns = EventLogColumns(score_addresses=[TOKEN])
+        columns.add_result(result)
+        self.assertEqual(2, len(columns))
+
+    def test_from_service(self):
+        columns = EventLogColumns(decode_ints=True)
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            for height in range(11, 15):
+                columns.add_block(*icon_service.get_block_with_results(height, block_version="0.3"))
+        self.assertEqual([110, 111, 120, 121, 130, 131, 140, 141], columns.to_pydict()["indexed_3"])
+
+    @skipUnless(find_spec("numpy"), "numpy is not installed")
+    def test_to_numpy(self):
+        import numpy as np
+        columns = EventLogColumns(decode_ints=True)
+        columns.add_blocks(blocks_with_results(1, 4))
+        arrays = columns.to_numpy()
+        self.assertEqual(np.int64, arrays["height"].dtype)
+        self.assertEqual(np.int64, arrays["indexed_3"].dtype)
+        self.assertEqual(object, arrays["indexed_1"].dtype)
+        self.assertEqual(204, int(arrays["indexed_3"].sum()))
+
+    @skipUnless(find_spec("pyarrow"), "pyarrow is not installed")
+    def test_writer(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        with tempfile.TemporaryDirectory() as path:
+            with EventLogWriter(path, rows_per_file=4, decode_ints=True) as writer:
+                writer.add_blocks(blocks_with_results(1, 4))
+            self.assertEqual(["events-000001.parquet", "events-000002.parquet"],
+                             [os.path.basename(f) for f in writer.files])
+            table = pq.read_table(writer.files[0])
+            self.assertEqual(pa.int64(), table.schema.field("indexed_3").type)
+            self.assertEqual([10, 11, 20, 21], table.column("indexed_3").to_pylist())
+
+            with EventLogWriter(path, format="arrow") as writer:
+                writer.add_blocks(blocks_with_results(7, 7))
+            self.assertEqual(["events-000001.arrow"], [os.path.basename(f) for f in writer.files])
+            with EventLogWriter(path, rows_per_file=100) as writer:
+                writer.add_blocks(blocks_with_results(7, 7))
+            self.assertEqual(["events-000003.parquet"], [os.path.basename(f) for f in writer.files])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+import os
+import tempfile
+from importlib.util import find_spec
+from unittest import TestCase, main, skipUnless
+
+from iconsdk.exception import DataTypeException, JSONRPCException
+from iconsdk.export.exporter import Exporter
+from iconsdk.icon_service import IconService
+from tests.example_chain import ALICE, CAROL, TOKEN, TRANSFER, ChainProvider, tx_hash_of
+
+
+class BrokenService:
+    """Returns blocks without the hash at the broken heights"""
+
+    def __init__(self, service, broken):
+        self.service = service
+        self.broken = set(broken)
+
+    def get_block(self, height, **kwargs):
+        block = self.service.get_block(height, **kwargs)
+        if height in self.broken:
+            del block["hash"]
+        return block
+
+    def get_last_height(self):
+        return self.service.get_last_height()
+
+
+def read_jsonl(paths):
+    rows = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            rows.extend(json.loads(line) for line in f)
+    return rows
+
+
+class TestExporter(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_blocks(self):
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            exporter = Exporter(icon_service, self.path)
+            self.assertIsNone(exporter.next_height)
+            self.assertEqual(21, exporter.run(start=11))
+        self.assertEqual(21, exporter.next_height)
+        self.assertEqual(["blocks-000000000011-000000000020.jsonl"], [os.path.basename(f) for f in exporter.files])
+        rows = read_jsonl(exporter.files)
+        self.assertEqual(list(range(11, 21)), [row["height"] for row in rows])
+        self.assertEqual({"height": 15, "hash": f"0x{15:064x}", "prev_hash": f"0x{14:064x}",
+                          "timestamp": 1_700_000_030_000_000, "tx_count": 0}, rows[4])
+
+    def test_transactions_csv(self):
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            exporter = Exporter(icon_service, self.path, kind="transactions", format="csv")
+            exporter.run(start=1, end=5)
+        with open(exporter.files[0], newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(8, len(rows))
+        self.assertEqual({"height": "1", "tx_index": "0", "tx_hash": tx_hash_of(1, 0), "timestamp": "",
+                          "from_address": ALICE, "to_address": TOKEN, "value": "0", "step_limit": "",
+                          "data_type": "call", "data": ""}, rows[0])
+
+    def test_events_roll_over(self):
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            exporter = Exporter(icon_service, self.path, kind="events", max_file_bytes=1, batch_rows=3)
+            exporter.run(start=1, end=9)
+        # a file is closed at the block after which the batch is written
+        self.assertEqual(["events-000000000001-000000000002.jsonl",
+                          "events-000000000003-000000000004.jsonl",
+                          "events-000000000005-000000000007.jsonl",
+                          "events-000000000008-000000000009.jsonl"],
+                         [os.path.basename(f) for f in exporter.files])
+        rows = read_jsonl(exporter.files)
+        self.assertEqual(16, len(rows))
+        self.assertEqual({"height": 1, "tx_index": 0, "log_index": 0, "tx_hash": tx_hash_of(1, 0),
+                          "score_address": TOKEN, "signature": TRANSFER,
+                          "indexed": json.dumps([ALICE, CAROL, "0xa"], separators=(",", ":")),
+                          "data": '["0x"]'}, rows[0])
+
+    def test_resume(self):
+        with IconService(ChainProvider(last_height=20, failing=[7])) as icon_service:
+            exporter = Exporter(icon_service, self.path, kind="receipts", concurrency=2)
+            self.assertRaises(JSONRPCException, exporter.run, 1, 10)
+            # the blocks before the failure are kept
+            self.assertEqual(7, exporter.next_height)
+            self.assertEqual(["receipts-000000000001-000000000006.jsonl"],
+                             [os.path.basename(f) for f in exporter.files])
+
+        # a file left by a killed export is removed
+        part = os.path.join(self.path, "receipts-000000000007.jsonl.part")
+        with open(part, "w") as f:
+            f.write("{")
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            exporter = Exporter(icon_service, self.path, kind="receipts")
+            self.assertEqual(11, exporter.run(1, 10))
+        self.assertFalse(os.path.exists(part))
+        self.assertEqual(["receipts-000000000007-000000000010.jsonl"], [os.path.basename(f) for f in exporter.files])
+        rows = read_jsonl(sorted(os.path.join(self.path, f) for f in os.listdir(self.path) if f.endswith(".jsonl")))
+        self.assertEqual([tx_hash_of(h, i) for h in range(1, 11) if h % 5 for i in range(2)],
+                         [row["tx_hash"] for row in rows])
+        self.assertEqual(4096, int(rows[0]["step_used"]))
+
+    def test_broken_block(self):
+        # the first block fails
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            exporter = Exporter(BrokenService(icon_service, [1]), self.path)
+            self.assertRaises(KeyError, exporter.run, 1, 10)
+        self.assertIsNone(exporter.next_height)
+        self.assertEqual([], exporter.files)
+        self.assertEqual([], os.listdir(self.path))
+
+        # the block after a roll over fails
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            exporter = Exporter(BrokenService(icon_service, [3]), self.path, max_file_bytes=1, batch_rows=1)
+            self.assertRaises(KeyError, exporter.run, 1, 10)
+        self.assertEqual(3, exporter.next_height)
+        self.assertEqual(["blocks-000000000001-000000000001.jsonl", "blocks-000000000002-000000000002.jsonl"],
+                         [os.path.basename(f) for f in exporter.files])
+        self.assertEqual([], [f for f in os.listdir(self.path) if f.endswith(".part")])
+
+    def test_invalid(self):
+        self.assertRaises(DataTypeException, Exporter, None, self.path, kind="accounts")
+        self.assertRaises(DataTypeException, Exporter, None, self.path, format="xlsx")
+
+    @skipUnless(find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        with IconService(ChainProvider(last_height=20)) as icon_service:
+            exporter = Exporter(icon_service, self.path, kind="receipts", format="parquet", batch_rows=4)
+            exporter.run(1, 10)
+        table = pq.read_table(exporter.files[0])
+        self.assertEqual(16, table.num_rows)
+        self.assertEqual(pa.int64(), table.schema.field("status").type)
+        self.assertEqual([1] * 16, table.column("status").to_pylist())
+        self.assertEqual(["4096"] * 16, table.column("step_used").to_pylist())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+from iconsdk.async_service import AsyncIconService
+from iconsdk.exception import JSONRPCException
+from iconsdk.icon_service import IconService
+from iconsdk.indexer import AsyncChainIndexer, ChainIndexer, ChainStore
+from tests.example_chain import (ALICE, BOB, CAROL, TOKEN, TRANSFER, AsyncChainProvider, ChainProvider,
+                                 tx_hash_of)
+
+
+class TestChainIndexer(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = ChainStore(os.path.join(self.dir.name, "chain.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.dir.cleanup()
+
+    def test_index(self):
+        with IconService(ChainProvider(last_height=30)) as icon_service:
+            indexer = ChainIndexer(icon_service, self.store, start=10, commit_interval=4)
+            self.assertEqual(10, indexer.next_height)
+            self.assertEqual(30, indexer.run())
+            self.assertEqual(31, indexer.next_height)
+
+        block = self.store.get_block(12)
+        self.assertEqual(f"0x{12:064x}", block["hash"])
+        self.assertEqual(2, len(block["transactions"]))
+        self.assertEqual(block, self.store.get_block_by_hash(f"{12:064x}"))
+        self.assertIsNone(self.store.get_block(9))
+
+        tx = self.store.get_transaction(tx_hash_of(12, 1))
+        self.assertEqual((12, 1), (tx["height"], tx["txIndex"]))
+        self.assertEqual(BOB, tx["transaction"]["from"])
+        self.assertEqual(1, tx["result"]["status"])
+
+        # ALICE sends the first transactions, BOB the second ones, and CAROL receives both
+        txs = self.store.get_transactions(ALICE, 11, 20)
+        self.assertEqual([tx_hash_of(h, 0) for h in range(11, 21) if h % 5], [tx["txHash"] for tx in txs])
+        txs = self.store.get_transactions(CAROL, 11, 12)
+        self.assertEqual([tx_hash_of(11, 0), tx_hash_of(11, 1), tx_hash_of(12, 0), tx_hash_of(12, 1)],
+                         [tx["txHash"] for tx in txs])
+        self.assertEqual(3, len(self.store.get_transactions(TOKEN, limit=3)))
+
+        logs = self.store.get_event_logs(TOKEN, TRANSFER, start=29)
+        self.assertEqual([(29, 0, 0), (29, 1, 0)], [(log["height"], log["txIndex"], log["logIndex"]) for log in logs])
+        self.assertEqual([TRANSFER, BOB, CAROL, hex(291)], logs[1]["indexed"])
+        self.assertEqual([], self.store.get_event_logs(signature="Approval(Address,Address,int)"))
+
+    def test_resume(self):
+        provider = ChainProvider(last_height=30, failing=[17])
+        with IconService(provider) as icon_service:
+            indexer = ChainIndexer(icon_service, self.store, start=10, commit_interval=100)
+            with self.assertRaises(JSONRPCException):
+                indexer.run()
+            # blocks before the failure are stored
+            self.assertEqual(16, self.store.checkpoint)
+            self.assertIsNone(self.store.get_block(17))
+
+            provider.failing.clear()
+            requests = provider.requests
+            self.assertEqual(25, ChainIndexer(icon_service, self.store, start=10).run(25))
+            # a block of 2 transactions takes 3 requests
+            self.assertEqual(sum(3 if h % 5 else 1 for h in range(17, 26)), provider.requests - requests)
+            self.assertEqual(25, ChainIndexer(icon_service, self.store).run(20))
+
+        # the store is reopened at the checkpoint
+        self.store.close()
+        self.store = ChainStore(self.store.path)
+        self.assertEqual(25, self.store.checkpoint)
+        self.assertEqual(len([h for h in range(10, 26) if h % 5]), len(self.store.get_transactions(ALICE)))
+
+
+class TestAsyncChainIndexer(IsolatedAsyncioTestCase):
+
+    async def test_index(self):
+        with tempfile.TemporaryDirectory() as path, ChainStore(os.path.join(path, "chain.db")) as store:
+            service = AsyncIconService(AsyncChainProvider(last_height=20, failing=[15]))
+            indexer = AsyncChainIndexer(service, store, start=1, concurrency=4, commit_interval=3)
+            with self.assertRaises(JSONRPCException):
+                await indexer.run()
+            self.assertEqual(14, store.checkpoint)
+
+            service = AsyncIconService(AsyncChainProvider(last_height=20))
+            self.assertEqual(20, await AsyncChainIndexer(service, store, start=1).run())
+            logs = store.get_event_logs(TOKEN, TRANSFER)
+            self.assertEqual([h for h in range(1, 21) if h % 5 for _ in range(2)], [log["height"] for log in logs])
+            self.assertEqual(hex(161), store.get_transactions(BOB, 16, 16)[0]["result"]["eventLogs"][0]["indexed"][3])
+
+
+if __name__ == "__main__":
+    main()
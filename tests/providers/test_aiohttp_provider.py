@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest import main
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase
+
+from iconsdk.async_service import AsyncIconService
+from iconsdk.exception import AddressException, JSONRPCException
+from iconsdk.providers.aiohttp_provider import AIOHTTPProvider
+
+
+class TestAIOHTTPProvider(AioHTTPTestCase):
+
+    async def get_application(self):
+        self.requests = []
+        self.peers = set()
+
+        def respond(body: dict) -> dict:
+            if body["method"] == "icx_getScoreApi":
+                return {"jsonrpc": "2.0", "error": {"code": -32602, "message": "no score"}, "id": body["id"]}
+            return {"jsonrpc": "2.0", "result": hex(len(self.requests)), "id": body["id"]}
+
+        async def handle(request: web.Request):
+            body = await request.json()
+            self.requests.append(body)
+            if isinstance(body, dict) and body["method"] == "icx_getBlockByHeight":
+                await asyncio.sleep(0.1)
+            self.peers.add(request.transport.get_extra_info('peername'))
+            if isinstance(body, list):
+                return web.json_response([respond(item) for item in reversed(body)])
+            return web.json_response(respond(body))
+
+        app = web.Application()
+        app.router.add_post('/api/v3', handle)
+        return app
+
+    def make_provider(self, **kwargs) -> AIOHTTPProvider:
+        return AIOHTTPProvider(str(self.server.make_url('/api/v3')), **kwargs)
+
+    async def test_shared_session(self):
+        provider = self.make_provider(limit=4)
+        await provider.make_request('icx_getTotalSupply')
+        session = provider._session
+        self.assertIsNotNone(session)
+        self.assertEqual(4, session.connector.limit)
+
+        await asyncio.gather(*[provider.make_request('icx_getTotalSupply') for _ in range(20)])
+        self.assertIs(session, provider._session)
+        self.assertEqual(21, len(self.requests))
+        self.assertLessEqual(len(self.peers), 4)
+
+        await provider.close()
+        self.assertTrue(session.closed)
+        self.assertIsNone(provider._session)
+
+        # it opens a new session after closing it
+        await provider.make_request('icx_getTotalSupply')
+        self.assertIsNot(session, provider._session)
+        await provider.close()
+
+    async def test_external_session(self):
+        provider = self.make_provider(session=self.client.session)
+        async with provider:
+            result = await provider.make_request('icx_getTotalSupply')
+            self.assertEqual('0x1', result)
+        self.assertFalse(self.client.session.closed)
+
+    async def test_service_close(self):
+        provider = self.make_provider()
+        async with AsyncIconService(provider) as service:
+            self.assertEqual(1, await service.get_total_supply())
+            session = provider._session
+        self.assertTrue(session.closed)
+
+    async def test_batch(self):
+        async with self.make_provider() as provider:
+            results = await provider.make_batch_request([
+                ('icx_getTotalSupply',),
+                ('icx_getScoreApi', {'address': 'cx0000000000000000000000000000000000000001'}),
+                ('icx_getLastBlock', None),
+            ])
+            self.assertEqual(1, len(self.requests))
+            self.assertEqual(3, len({item["id"] for item in self.requests[0]}))
+            self.assertEqual('0x1', results[0])
+            self.assertIsInstance(results[1], JSONRPCException)
+            self.assertEqual('0x1', results[2])
+
+            service = AsyncIconService(provider)
+            async with service.batch() as batch:
+                supply = batch.get_total_supply()
+                api = batch.get_score_api('cx0000000000000000000000000000000000000001')
+                with self.assertRaises(AddressException):
+                    batch.get_balance('hx1234')
+            self.assertEqual(2, len(self.requests))
+            self.assertEqual(2, supply.result())
+            with self.assertRaises(JSONRPCException):
+                api.result()
+
+    async def test_single_flight(self):
+        async with self.make_provider(single_flight=True) as provider:
+            results = await asyncio.gather(*[
+                provider.make_request('icx_getBlockByHeight', {'height': '0x64'}) for _ in range(10)
+            ])
+            self.assertEqual(['0x1'] * 10, results)
+            self.assertEqual(1, len(self.requests))
+
+            await asyncio.gather(*[provider.make_request('icx_sendTransaction', {'value': '0x1'}) for _ in range(2)])
+            self.assertEqual(3, len(self.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+import requests
+import requests_mock
+
+from iconsdk.exception import HTTPError, JSONRPCException
+from iconsdk.monitor import BlockMonitorSpec
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.balancer import (
+    AsyncLoadBalancingProvider, Endpoint, EndpointPool, LoadBalancingProvider,
+    POLICY_EWMA, POLICY_LEAST_OUTSTANDING,
+)
+from iconsdk.providers.http_provider import HTTPProvider
+from iconsdk.providers.provider import Provider
+from tests.providers.test_retry import refused_url
+
+URLS = ["http://node1:9000/api/v3", "http://node2:9000/api/v3", "http://node3:9000/api/v3"]
+
+
+def rpc_result(result):
+    return lambda request, context: {"jsonrpc": "2.0", "id": request.json()["id"], "result": result}
+
+
+class TestEndpointPool(TestCase):
+
+    def test_round_robin(self):
+        endpoints = [Endpoint(str(i), None) for i in range(3)]
+        pool = EndpointPool(endpoints)
+        selected = [pool.select() for _ in range(6)]
+        self.assertEqual(endpoints * 2, selected)
+        self.assertEqual(2, endpoints[0].outstanding)
+
+    def test_least_outstanding(self):
+        endpoints = [Endpoint(str(i), None) for i in range(2)]
+        pool = EndpointPool(endpoints, POLICY_LEAST_OUTSTANDING)
+        first = pool.select()
+        self.assertIsNot(first, pool.select())
+        pool.on_success(first, 0.1)
+        self.assertIs(first, pool.select())
+
+    def test_ewma(self):
+        endpoints = [Endpoint(str(i), None) for i in range(2)]
+        pool = EndpointPool(endpoints, POLICY_EWMA)
+        pool.select()
+        pool.select()
+        pool.on_success(endpoints[0], 0.5)
+        pool.on_success(endpoints[1], 0.1)
+        self.assertIs(endpoints[1], pool.select())
+
+    def test_eject_and_probe(self):
+        endpoints = [Endpoint(str(i), None) for i in range(2)]
+        pool = EndpointPool(endpoints, max_failures=2, eject_time=0)
+        error = requests.ConnectionError()
+        for _ in range(2):
+            pool.on_failure(pool.select([endpoints[1]]), error)
+        self.assertEqual(1, endpoints[0].ejections)
+
+        # the probe after the ejection fails
+        pool.on_failure(pool.select([endpoints[1]]), error)
+        self.assertEqual(2, endpoints[0].ejections)
+
+        # the probe succeeds
+        pool.on_success(pool.select([endpoints[1]]), 0.1)
+        self.assertEqual(0, endpoints[0].ejections)
+
+    def test_ignore_rpc_error(self):
+        endpoint = Endpoint("0", None)
+        pool = EndpointPool([endpoint], max_failures=1)
+        pool.select()
+        self.assertFalse(pool.on_failure(endpoint, JSONRPCException("invalid", -32602)))
+        self.assertEqual(0, endpoint.ejections)
+        pool.select()
+        self.assertTrue(pool.on_failure(endpoint, HTTPError("unavailable", 503)))
+        self.assertEqual(1, endpoint.ejections)
+
+    def test_height_lag(self):
+        endpoints = [Endpoint(str(i), None) for i in range(3)]
+        pool = EndpointPool(endpoints, max_lag=5)
+        pool.update_heights({endpoints[0]: 100, endpoints[1]: 94, endpoints[2]: 97})
+        self.assertEqual([0, 1, 0], [ep.ejections for ep in endpoints])
+        self.assertEqual([endpoints[0], endpoints[2]], [pool.select() for _ in range(2)])
+
+
+class MonitorProvider(Provider):
+
+    def make_request(self, method, params=None, full_response=False):
+        raise NotImplementedError()
+
+    def make_monitor(self, spec, keep_alive=None):
+        return spec
+
+
+class TestLoadBalancingProvider(TestCase):
+
+    def test_spread(self):
+        with requests_mock.Mocker() as m:
+            for url in URLS:
+                m.post(url, json=rpc_result(url))
+            provider = LoadBalancingProvider(URLS)
+            results = [provider.make_request("icx_getLastBlock") for _ in range(6)]
+        self.assertEqual(URLS * 2, results)
+
+    def test_failover(self):
+        with requests_mock.Mocker() as m:
+            m.post(URLS[0], exc=requests.ConnectionError)
+            m.post(URLS[1], status_code=503, text="unavailable")
+            m.post(URLS[2], json=rpc_result("0x1"))
+            provider = LoadBalancingProvider(URLS, max_failures=1)
+            self.assertEqual("0x1", provider.make_request("icx_getBalance", {"address": "hx1"}))
+            self.assertEqual(1, provider.endpoints[0].ejections)
+            self.assertEqual(0, provider.endpoints[2].ejections)
+
+            # writes are not sent again
+            provider = LoadBalancingProvider([URLS[0], URLS[2]])
+            calls = m.call_count
+            with self.assertRaises(requests.ConnectionError):
+                provider.make_request("icx_sendTransaction", {})
+            self.assertEqual(calls + 1, m.call_count)
+
+    def test_batch_failover(self):
+        with requests_mock.Mocker() as m:
+            m.post(URLS[0], exc=requests.ConnectionError)
+            m.post(URLS[1], json=lambda request, context: [
+                {"jsonrpc": "2.0", "id": item["id"], "result": "0x1"} for item in request.json()])
+            provider = LoadBalancingProvider(URLS[:2])
+            self.assertEqual(["0x1", "0x1"], provider.make_batch_request(
+                [("icx_getBalance", {"address": "hx1"}), ("icx_getLastBlock", None)]))
+
+            # batches with a write are not sent again
+            provider = LoadBalancingProvider(URLS[:2])
+            calls = m.call_count
+            with self.assertRaises(requests.ConnectionError):
+                provider.make_batch_request([("icx_getBalance", {"address": "hx1"}), ("icx_sendTransaction", {})])
+            self.assertEqual(calls + 1, m.call_count)
+
+    def test_monitor_failover(self):
+        spec = BlockMonitorSpec(1)
+        provider = LoadBalancingProvider([HTTPProvider(refused_url()), MonitorProvider()])
+        self.assertIs(spec, provider.make_monitor(spec))
+        self.assertEqual(1, provider.endpoints[0].failures)
+
+    def test_check_health(self):
+        with requests_mock.Mocker() as m:
+            m.post(URLS[0], json=rpc_result({"height": 100}))
+            m.post(URLS[1], json=rpc_result({"height": 80}))
+            provider = LoadBalancingProvider(URLS[:2], max_lag=10)
+            provider.check_health()
+            self.assertEqual([100, 80], [ep.height for ep in provider.endpoints])
+            self.assertEqual([0, 1], [ep.ejections for ep in provider.endpoints])
+
+
+class FakeProvider(AsyncProvider):
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.count = 0
+        self.closed = False
+
+    async def make_request(self, method, params=None, full_response=False):
+        self.count += 1
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+    async def close(self):
+        self.closed = True
+
+
+class TestAsyncLoadBalancingProvider(IsolatedAsyncioTestCase):
+
+    async def test_failover(self):
+        failing = FakeProvider(error=HTTPError("bad gateway", 502))
+        working = FakeProvider(result={"height": "0x10"})
+        async with AsyncLoadBalancingProvider([failing, working], max_failures=2) as provider:
+            for _ in range(4):
+                self.assertEqual({"height": "0x10"}, await provider.make_request("icx_getLastBlock"))
+            await provider.check_health()
+            self.assertEqual([None, 16], [ep.height for ep in provider.endpoints])
+        # two requests until the ejection and the health check
+        self.assertEqual(3, failing.count)
+        self.assertTrue(failing.closed and working.closed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+import requests_mock
+
+from iconsdk.async_service import AsyncIconService
+from iconsdk.builder.call_builder import CallBuilder
+from iconsdk.icon_service import IconService
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.cache import LRUCache, SQLiteCache, TieredCache
+from iconsdk.providers.caching_provider import CachingProvider, cache_key, is_final
+from iconsdk.providers.http_provider import HTTPProvider
+
+URL = "http://localhost:9000/api/v3"
+TX_HASH = "0x" + "ab" * 32
+
+
+def block_of(height: int) -> dict:
+    return {"version": "0.1a", "height": height, "block_hash": f"{height:064x}", "prev_block_hash": "",
+            "merkle_tree_root_hash": "", "time_stamp": 0, "peer_id": "hx" + "0" * 40, "signature": "",
+            "confirmed_transaction_list": []}
+
+
+def rpc_callback(request, context):
+    body = request.json()
+    if isinstance(body, list):
+        return [{"jsonrpc": "2.0", "id": item["id"], "result": block_of(int(item["params"]["height"], 16))}
+                for item in body]
+    if body["method"] == "icx_getBlockByHeight":
+        result = block_of(int(body["params"]["height"], 16))
+    elif body["method"] == "icx_getLastBlock":
+        result = block_of(100)
+    else:
+        result = {"txHash": TX_HASH, "status": "0x1", "blockHeight": "0x10"}
+    return {"jsonrpc": "2.0", "id": body["id"], "result": result}
+
+
+class TestLRUCache(TestCase):
+
+    def test_lru(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        self.assertEqual({"v": 1}, cache.get("a"))
+        cache.set("c", {"v": 3})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual({"v": 1}, cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((2, 1, 1, 2), (stats.hits, stats.misses, stats.evictions, stats.entries))
+        self.assertAlmostEqual(2 / 3, stats.hit_rate)
+
+    def test_max_bytes(self):
+        cache = LRUCache(max_bytes=100)
+        for i in range(10):
+            cache.set(str(i), "x" * 20)
+        self.assertLessEqual(cache.stats().size, 100)
+        self.assertEqual(4, len(cache))
+        cache.set("big", "x" * 200)
+        self.assertNotIn("big", cache)
+
+    def test_copy(self):
+        cache = LRUCache()
+        cache.set("a", {"list": [1]})
+        cache.get("a")["list"].append(2)
+        self.assertEqual({"list": [1]}, cache.get("a"))
+
+
+class TestSQLiteCache(TestCase):
+
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "cache.db")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_shared(self):
+        writer, reader = SQLiteCache(self.path), SQLiteCache(self.path)
+        writer.set("block:1", block_of(1))
+        self.assertEqual(block_of(1), reader.get("block:1"))
+        self.assertIsNone(reader.get("block:2"))
+        stats = reader.stats()
+        self.assertEqual((1, 1, 1), (stats.hits, stats.misses, stats.entries))
+        writer.close()
+        reader.close()
+
+    def test_max_bytes(self):
+        cache = SQLiteCache(self.path, max_bytes=10000)
+        for i in range(SQLiteCache.CHECK_INTERVAL + 1):
+            cache.set(f"{i}", "x" * 200)
+        stats = cache.stats()
+        self.assertLessEqual(stats.size, 10000)
+        self.assertGreater(stats.evictions, 0)
+        self.assertIsNone(cache.get("0"))
+        self.assertIsNotNone(cache.get(f"{SQLiteCache.CHECK_INTERVAL}"))
+
+        cache.clear()
+        cache.compact()
+        self.assertEqual(0, cache.stats().entries)
+        cache.close()
+
+    def test_tiered(self):
+        large = SQLiteCache(self.path)
+        large.set("a", [1, 2])
+        fast = LRUCache()
+        cache = TieredCache(fast, large)
+        self.assertEqual([1, 2], cache.get("a"))
+        self.assertIn("a", fast)
+        cache.set("b", [3])
+        self.assertEqual([3], large.get("b"))
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual((1, 1), cache.stats()[:2])
+        cache.close()
+
+    def test_icon_service(self):
+        for count in (1, 0):
+            cache = SQLiteCache(self.path)
+            with requests_mock.Mocker() as m:
+                m.post(URL, json=rpc_callback)
+                self.assertEqual(10, IconService(HTTPProvider(URL), cache=cache).get_block(10)["height"])
+                self.assertEqual(count, m.call_count)
+            cache.close()
+
+
+class TestCacheKey(TestCase):
+
+    def test_cache_key(self):
+        self.assertIsNotNone(cache_key("icx_getBlockByHeight", {"height": "0x1"}))
+        self.assertEqual(cache_key("icx_getBlock", {"height": "0x1", "hash": None}),
+                         cache_key("icx_getBlock", {"hash": None, "height": "0x1"}))
+        self.assertIsNone(cache_key("icx_getBlock", None))
+        self.assertIsNone(cache_key("icx_getLastBlock"))
+        self.assertIsNone(cache_key("icx_getBalance", {"address": "hx1"}))
+
+    def test_height_pinned(self):
+        self.assertIsNone(cache_key("icx_getBalance", {"address": "hx1"}))
+        self.assertIsNone(cache_key("icx_getBalance", {"address": "hx1", "height": None}))
+        self.assertEqual(cache_key("icx_getBalance", {"address": "hx1", "height": "0x0010"}),
+                         cache_key("icx_getBalance", {"height": 16, "address": "hx1"}))
+        self.assertNotEqual(cache_key("icx_getBalance", {"address": "hx1", "height": "0x10"}),
+                            cache_key("icx_getBalance", {"address": "hx1", "height": "0x11"}))
+        self.assertIsNotNone(cache_key("icx_call", {"to": "cx1", "dataType": "call", "height": "0x10",
+                                                    "data": {"method": "balanceOf", "params": {"_owner": "hx1"}}}))
+
+    def test_is_final(self):
+        self.assertTrue(is_final("icx_getTransactionResult", {"status": "0x1", "blockHeight": "0x1"}))
+        self.assertFalse(is_final("icx_getTransactionByHash", {"txHash": TX_HASH}))
+
+
+class TestCachingProvider(TestCase):
+
+    def test_icon_service(self):
+        cache = LRUCache()
+        icon_service = IconService(HTTPProvider(URL), cache=cache)
+        with requests_mock.Mocker() as m:
+            m.post(URL, json=rpc_callback)
+            for _ in range(3):
+                self.assertEqual(10, icon_service.get_block(10)["height"])
+                self.assertEqual(100, icon_service.get_block("latest")["height"])
+                self.assertEqual(1, icon_service.get_transaction_result(TX_HASH)["status"])
+            self.assertEqual(2 + 3, m.call_count)
+        self.assertEqual(4, cache.stats().hits)
+
+        # full responses are not cached
+        with requests_mock.Mocker() as m:
+            m.post(URL, json=rpc_callback)
+            icon_service.get_block(10, full_response=True)
+            self.assertEqual(1, m.call_count)
+
+    def test_batch(self):
+        provider = CachingProvider(HTTPProvider(URL), LRUCache())
+        with requests_mock.Mocker() as m:
+            m.post(URL, json=rpc_callback)
+            provider.make_request("icx_getBlockByHeight", {"height": "0x1"})
+            results = provider.make_batch_request([("icx_getBlockByHeight", {"height": hex(h)}) for h in range(1, 4)])
+            self.assertEqual([1, 2, 3], [block["height"] for block in results])
+            self.assertEqual(2, len(m.last_request.json()))
+            results = provider.make_batch_request([("icx_getBlockByHeight", {"height": hex(h)}) for h in range(1, 4)])
+            self.assertEqual([1, 2, 3], [block["height"] for block in results])
+            self.assertEqual(2, m.call_count)
+
+    def test_call_with_height(self):
+        def callback(request, context):
+            body = request.json()
+            return {"jsonrpc": "2.0", "id": body["id"], "result": body["params"].get("height", "0x0")}
+
+        icon_service = IconService(HTTPProvider(URL), cache=LRUCache())
+        pinned = CallBuilder().to("cx" + "1" * 40).method("balanceOf").params({"_owner": "hx" + "2" * 40}) \
+            .height(100).build()
+        latest = CallBuilder().to("cx" + "1" * 40).method("balanceOf").params({"_owner": "hx" + "2" * 40}).build()
+        with requests_mock.Mocker() as m:
+            m.post(URL, json=callback)
+            for _ in range(3):
+                self.assertEqual("0x64", icon_service.call(pinned))
+                self.assertEqual("0x0", icon_service.call(latest))
+                icon_service.get_balance("hx" + "2" * 40, height=100)
+            self.assertEqual(1 + 3 + 1, m.call_count)
+
+
+class CountingProvider(AsyncProvider):
+
+    def __init__(self):
+        self.count = 0
+
+    async def make_request(self, method, params=None, full_response=False):
+        self.count += 1
+        return {"txHash": params["txHash"], "blockHeight": "0x1"}
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class TestAsyncCachingProvider(IsolatedAsyncioTestCase):
+
+    async def test_async_service(self):
+        inner = CountingProvider()
+        service = AsyncIconService(inner, cache=LRUCache())
+        for _ in range(3):
+            self.assertEqual(TX_HASH, (await service.get_transaction(TX_HASH))["txHash"])
+        self.assertEqual(1, inner.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, main
+
+from iconsdk.exception import JSONRPCException
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.coalescing_provider import CoalescingAsyncProvider
+
+
+class EchoProvider(AsyncProvider):
+    """Returns the address param, or fails for an unknown address"""
+
+    def __init__(self):
+        self.requests = []
+        self.batches = []
+        self.closed = False
+
+    @staticmethod
+    def respond(method, params):
+        if params["address"] == "unknown":
+            return JSONRPCException("unknown", -32602)
+        return f"{method}:{params['address']}"
+
+    async def make_request(self, method, params=None, full_response=False):
+        self.requests.append((method, params))
+        result = self.respond(method, params)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def make_batch_request(self, entries, full_response=False):
+        self.batches.append(list(entries))
+        await asyncio.sleep(0)
+        return [self.respond(*entry) for entry in entries]
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+    async def close(self):
+        self.closed = True
+
+
+class TestCoalescingAsyncProvider(IsolatedAsyncioTestCase):
+
+    async def test_coalesce(self):
+        inner = EchoProvider()
+        provider = CoalescingAsyncProvider(inner, max_delay=0.01, max_batch_size=100)
+        addresses = [f"hx{i}" for i in range(30)] + ["unknown"]
+        results = await asyncio.gather(*[provider.make_request("icx_getBalance", {"address": address})
+                                         for address in addresses], return_exceptions=True)
+        self.assertEqual(1, len(inner.batches))
+        self.assertEqual(31, len(inner.batches[0]))
+        self.assertEqual([f"icx_getBalance:{address}" for address in addresses[:-1]], results[:-1])
+        self.assertIsInstance(results[-1], JSONRPCException)
+
+    async def test_max_batch_size(self):
+        inner = EchoProvider()
+        provider = CoalescingAsyncProvider(inner, max_delay=10, max_batch_size=4)
+        results = await asyncio.wait_for(asyncio.gather(*[
+            provider.make_request("icx_getBalance", {"address": f"hx{i}"}) for i in range(8)
+        ]), 1)
+        self.assertEqual(2, len(inner.batches))
+        self.assertEqual(8, len(results))
+
+    async def test_single_request(self):
+        inner = EchoProvider()
+        async with CoalescingAsyncProvider(inner, max_delay=0) as provider:
+            self.assertEqual("icx_getBalance:hx1",
+                             await provider.make_request("icx_getBalance", {"address": "hx1"}))
+            with self.assertRaises(JSONRPCException):
+                await provider.make_request("icx_getBalance", {"address": "unknown"})
+        self.assertEqual(0, len(inner.batches))
+        self.assertEqual(2, len(inner.requests))
+        self.assertTrue(inner.closed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from json import JSONDecodeError
+from unittest import TestCase, main, skipIf
+
+import requests_mock
+
+from iconsdk.exception import HTTPError
+from iconsdk.providers import codec as codec_module
+from iconsdk.providers.codec import JSONCodec, MsgspecCodec, OrjsonCodec, default_codec, get_codec
+from iconsdk.providers.http_provider import HTTPProvider
+
+URL = "http://localhost:9000/api/v3"
+MESSAGE = {"jsonrpc": "2.0", "id": 1, "result": {"height": "0x10", "list": [1, "a", None, True], "name": "아이콘"}}
+
+
+def installed_codecs():
+    codecs = [JSONCodec()]
+    if codec_module.orjson is not None:
+        codecs.append(OrjsonCodec())
+    if codec_module.msgspec is not None:
+        codecs.append(MsgspecCodec())
+    return codecs
+
+
+class TestCodec(TestCase):
+
+    def test_round_trip(self):
+        for codec in installed_codecs():
+            with self.subTest(codec=codec.name):
+                data = codec.dumps(MESSAGE)
+                self.assertIsInstance(data, bytes)
+                self.assertEqual(MESSAGE, codec.loads(data))
+                self.assertEqual(MESSAGE, codec.loads(data.decode()))
+                self.assertEqual(MESSAGE, codec.loads(memoryview(data)))
+
+    def test_big_int(self):
+        for codec in installed_codecs():
+            with self.subTest(codec=codec.name):
+                self.assertEqual({"value": 10 ** 30}, JSONCodec().loads(codec.dumps({"value": 10 ** 30})))
+
+    def test_decode_error(self):
+        for codec in installed_codecs():
+            with self.subTest(codec=codec.name):
+                with self.assertRaises(JSONDecodeError):
+                    codec.loads(b"<html>Bad Gateway</html>")
+
+    def test_get_codec(self):
+        self.assertIs(default_codec(), get_codec())
+        self.assertIsInstance(get_codec("json"), JSONCodec)
+        codec = JSONCodec()
+        self.assertIs(codec, get_codec(codec))
+        with self.assertRaises(ValueError):
+            get_codec("pickle")
+
+    def test_default(self):
+        # faster codecs installed are used only when chosen
+        self.assertIs(type(default_codec()), JSONCodec)
+        self.assertEqual({"value": 10 ** 30}, default_codec().loads(b'{"value":1000000000000000000000000000000}'))
+
+    @skipIf(codec_module.orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        self.assertIsInstance(get_codec("orjson"), OrjsonCodec)
+
+    def test_provider(self):
+        for codec in installed_codecs():
+            with self.subTest(codec=codec.name), requests_mock.Mocker() as m:
+                m.post(URL, json=MESSAGE)
+                provider = HTTPProvider(URL, codec=codec)
+                self.assertEqual(MESSAGE["result"], provider.make_request("icx_getLastBlock"))
+                self.assertEqual("icx_getLastBlock", JSONCodec().loads(m.last_request.body)["method"])
+
+                m.post(URL, status_code=502, text="<html>Bad Gateway</html>")
+                with self.assertRaises(HTTPError):
+                    provider.make_request("icx_getLastBlock")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+from iconsdk.async_service import AsyncIconService
+from iconsdk.icon_service import IconService
+from iconsdk.providers.async_provider import AsyncMonitor, AsyncProvider
+from iconsdk.providers.head_cache import HeadCache
+from iconsdk.providers.provider import Monitor, Provider
+
+
+class ChainProvider(Provider):
+    """Returns the last block of the height, which the test sets"""
+
+    def __init__(self, delay=0.0):
+        self.height = 10
+        self.delay = delay
+        self.count = 0
+
+    def make_request(self, method, params=None, full_response=False):
+        self.count += 1
+        time.sleep(self.delay)
+        return {"version": "0.3", "height": hex(self.height), "hash": "0x" + "0" * 64}
+
+    def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class QueueMonitor(Monitor):
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def read(self, timeout=None):
+        item = self.queue.get()
+        if item is None:
+            raise EOFError()
+        return item
+
+    def close(self):
+        self.queue.put(None)
+
+
+class TestHeadCache(TestCase):
+
+    def test_shared(self):
+        provider = ChainProvider(delay=0.05)
+        icon_service = IconService(provider, head_cache=HeadCache(ttl=10))
+        with ThreadPoolExecutor(8) as executor:
+            heights = list(executor.map(lambda _: icon_service.get_last_height(), range(16)))
+        self.assertEqual([10] * 16, heights)
+        self.assertEqual(1, provider.count)
+
+    def test_ttl(self):
+        provider = ChainProvider()
+        head = HeadCache(ttl=0.05)
+        icon_service = IconService(provider, head_cache=head)
+        icon_service.get_block("latest", block_version="0.3")
+        icon_service.get_block("latest", block_version="0.3")
+        self.assertEqual(1, provider.count)
+        time.sleep(0.06)
+        icon_service.get_block("latest", block_version="0.3")
+        self.assertEqual(2, provider.count)
+        self.assertEqual((1, 2), (head.hits, head.misses))
+
+    def test_follow(self):
+        provider = ChainProvider()
+        head = HeadCache(ttl=10)
+        icon_service = IconService(provider, head_cache=head)
+        self.assertEqual(10, icon_service.get_last_height())
+
+        monitor = QueueMonitor()
+        follower = head.follow(monitor)
+        provider.height = 11
+        monitor.queue.put({"height": "0xb", "hash": "0x" + "1" * 64})
+        for _ in range(100):
+            if head.notified_height == 11:
+                break
+            time.sleep(0.01)
+        self.assertEqual(11, icon_service.get_last_height())
+        self.assertEqual(1, provider.count)
+
+        # the cached block expires by the notification
+        self.assertEqual(11, icon_service.get_block("latest")["height"])
+        self.assertEqual(2, provider.count)
+
+        monitor.close()
+        follower.join(1)
+        self.assertFalse(follower.is_alive())
+
+    def test_silent_monitor(self):
+        provider = ChainProvider()
+        head = HeadCache(ttl=0.01, max_silence=0.1)
+        icon_service = IconService(provider, head_cache=head)
+        monitor = QueueMonitor()
+        head.follow(monitor)
+        monitor.queue.put({"height": "0xb", "hash": "0x" + "1" * 64})
+        for _ in range(100):
+            if head.notified_height == 11:
+                break
+            time.sleep(0.01)
+        provider.height = 12
+        self.assertEqual(11, icon_service.get_last_height())
+        self.assertEqual(0, provider.count)
+
+        # the monitor stalls without closing
+        time.sleep(0.15)
+        self.assertIsNone(head.notified_height)
+        self.assertEqual(12, icon_service.get_last_height())
+        self.assertEqual(1, provider.count)
+        monitor.close()
+
+
+class AsyncChainProvider(AsyncProvider):
+
+    def __init__(self):
+        self.height = 10
+        self.count = 0
+
+    async def make_request(self, method, params=None, full_response=False):
+        self.count += 1
+        await asyncio.sleep(0.01)
+        return {"version": "0.3", "height": hex(self.height), "hash": "0x" + "0" * 64}
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class AsyncQueueMonitor(AsyncMonitor):
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def read(self, timeout=None):
+        return await self.queue.get()
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class TestAsyncHeadCache(IsolatedAsyncioTestCase):
+
+    async def test_shared(self):
+        provider = AsyncChainProvider()
+        head = HeadCache(ttl=10)
+        service = AsyncIconService(provider, head_cache=head)
+        blocks = await asyncio.gather(*[service.get_block("latest") for _ in range(10)])
+        self.assertEqual(1, provider.count)
+        self.assertEqual(10, len(blocks))
+        self.assertIsNot(blocks[0], blocks[1])
+
+        monitor = AsyncQueueMonitor()
+        follower = head.afollow(monitor)
+        await monitor.queue.put({"height": "0xc", "hash": "0x" + "2" * 64})
+        await asyncio.sleep(0.01)
+        self.assertEqual(12, await service.get_last_height())
+        self.assertEqual(1, provider.count)
+        follower.cancel()
+
+
+if __name__ == "__main__":
+    main()
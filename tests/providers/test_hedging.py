@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+from iconsdk.monitor import BlockMonitorSpec
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.balancer import AsyncLoadBalancingProvider, LoadBalancingProvider
+from iconsdk.providers.hedging import HedgePolicy, LatencyHistogram
+from iconsdk.providers.provider import Provider
+
+
+class SlowProvider(Provider):
+
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.count = 0
+
+    def make_request(self, method, params=None, full_response=False):
+        self.count += 1
+        time.sleep(self.delay)
+        return self.name
+
+    def make_batch_request(self, entries, full_response=False):
+        self.count += 1
+        time.sleep(self.delay)
+        return [self.name] * len(entries)
+
+    def make_monitor(self, spec, keep_alive=None):
+        self.count += 1
+        time.sleep(self.delay)
+        return self.name
+
+
+class AsyncSlowProvider(AsyncProvider):
+
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.count = 0
+        self.cancelled = 0
+
+    async def make_request(self, method, params=None, full_response=False):
+        self.count += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.name
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class TestHedgePolicy(TestCase):
+
+    def test_histogram(self):
+        histogram = LatencyHistogram(size=100)
+        self.assertIsNone(histogram.percentile(50))
+        for i in range(200):
+            histogram.record(i / 1000)
+        self.assertEqual(100, len(histogram))
+        self.assertEqual(0.150, histogram.percentile(50))
+        self.assertEqual(0.199, histogram.percentile(99.9))
+
+    def test_delay(self):
+        policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0.005)
+        self.assertIsNone(policy.begin("icx_getBalance"))
+        for i in range(10):
+            policy.record("icx_getBalance", (i + 1) / 100)
+        self.assertEqual(0.1, policy.begin("icx_getBalance"))
+        self.assertIsNone(policy.begin("icx_getTransactionResult"))
+        self.assertTrue(policy.applies_to("icx_getTransactionResult"))
+        self.assertFalse(policy.applies_to("icx_waitTransactionResult"))
+        self.assertFalse(policy.applies_to("icx_sendTransaction"))
+
+    def test_rate(self):
+        policy = HedgePolicy(max_rate=0.25, max_burst=2)
+        for _ in range(100):
+            policy.begin("icx_getBalance")
+        self.assertTrue(policy.try_hedge())
+        self.assertTrue(policy.try_hedge())
+        self.assertFalse(policy.try_hedge())
+        for _ in range(4):
+            policy.begin("icx_getBalance")
+        self.assertTrue(policy.try_hedge())
+        self.assertEqual(3, policy.hedged)
+
+
+class TestHedgedRequest(TestCase):
+
+    def test_hedge(self):
+        slow, fast = SlowProvider("slow", 0.5), SlowProvider("fast", 0)
+        policy = HedgePolicy(max_rate=1, min_samples=1, min_delay=0.01)
+        policy.record("icx_getTransactionResult", 0.01)
+        with LoadBalancingProvider([slow, fast], hedge=policy) as provider:
+            started = time.monotonic()
+            self.assertEqual("fast", provider.make_request("icx_getTransactionResult", {"txHash": "0x1"}))
+            self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(1, policy.hedged)
+        self.assertEqual((1, 1), (slow.count, fast.count))
+
+    def test_no_hedge_for_batch_and_monitor(self):
+        slow, fast = SlowProvider("slow", 0.1), SlowProvider("fast", 0)
+        policy = HedgePolicy(max_rate=1, min_samples=1, min_delay=0.01)
+        policy.record("icx_getBlock", 0.01)
+        with LoadBalancingProvider([slow, fast], hedge=policy) as provider:
+            self.assertEqual("slow", provider.make_monitor(BlockMonitorSpec(1)))
+            self.assertEqual(["fast"], provider.make_batch_request([("icx_getBlock", {"height": "0x1"})]))
+        self.assertEqual(0, policy.hedged)
+        self.assertEqual((1, 1), (slow.count, fast.count))
+        # only the latencies of the requests of the method are recorded
+        self.assertEqual(1, len(policy.histogram("icx_getBlock")))
+
+
+class TestAsyncHedgedRequest(IsolatedAsyncioTestCase):
+
+    async def test_hedge(self):
+        slow, fast = AsyncSlowProvider("slow", 10), AsyncSlowProvider("fast", 0)
+        policy = HedgePolicy(max_rate=1, min_samples=1, min_delay=0.01)
+        policy.record("icx_getTransactionResult", 0.01)
+        provider = AsyncLoadBalancingProvider([slow, fast], hedge=policy)
+        result = await asyncio.wait_for(provider.make_request("icx_getTransactionResult", {"txHash": "0x1"}), 1)
+        self.assertEqual("fast", result)
+        await asyncio.sleep(0)
+        self.assertEqual(1, slow.cancelled)
+        self.assertEqual([0, 0], [ep.outstanding for ep in provider.endpoints])
+
+    async def test_no_hedge_for_fast(self):
+        first, second = AsyncSlowProvider("first", 0), AsyncSlowProvider("second", 0)
+        policy = HedgePolicy(max_rate=1, min_samples=1, min_delay=0.1)
+        policy.record("icx_getBalance", 0.1)
+        provider = AsyncLoadBalancingProvider([first, second], hedge=policy)
+        for _ in range(4):
+            await provider.make_request("icx_getBalance", {"address": "hx1"})
+        self.assertEqual(0, policy.hedged)
+        self.assertEqual((2, 2), (first.count, second.count))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
 from unittest import main
+from unittest.mock import patch
+
+import requests_mock
 
 from iconsdk.exception import URLException
 from iconsdk.providers.http_provider import HTTPProvider
@@ -81,6 +86,55 @@ class TestHTTPProvider(TestSendSuper):
             with self.assertRaises(URLException):
                 HTTPProvider(url, self.VERSION)
 
+    def test_pooled_session(self):
+        provider = HTTPProvider(self.FULL_PATH_URL, pool_size=4)
+        with requests_mock.Mocker() as m:
+            m.post(self.FULL_PATH_URL, json={"jsonrpc": "2.0", "result": "0x1", "id": 1})
+            provider.make_request('icx_getTotalSupply')
+            session = provider._session
+            self.assertIsNotNone(session)
+            provider.make_request('icx_getTotalSupply')
+            self.assertIs(session, provider._session)
+            self.assertEqual(4, session.get_adapter(self.FULL_PATH_URL)._pool_maxsize)
+
+            # a new session is made after closing it
+            provider.close()
+            self.assertIsNone(provider._session)
+            provider.make_request('icx_getTotalSupply')
+            self.assertIsNot(session, provider._session)
+
+    def test_context_manager(self):
+        provider = HTTPProvider(self.BASE_PATH_URL, self.VERSION)
+        session = provider._get_session()
+        with patch.object(session, 'close') as close:
+            with provider as p:
+                self.assertIs(provider, p)
+            close.assert_called_once()
+        self.assertIsNone(provider._session)
+
+        with self.assertRaises(ValueError):
+            HTTPProvider(self.FULL_PATH_URL, pool_size=0)
+
+    def test_single_flight(self):
+        provider = HTTPProvider(self.FULL_PATH_URL, single_flight=True)
+
+        def callback(request, context):
+            sleep(0.2)
+            return {"jsonrpc": "2.0", "result": "0x1", "id": request.json()["id"]}
+
+        with requests_mock.Mocker() as m, ThreadPoolExecutor(8) as executor:
+            m.post(self.FULL_PATH_URL, json=callback)
+            futures = [executor.submit(provider.make_request, 'icx_getBlockByHeight', {'height': '0x64'})
+                       for _ in range(8)]
+            self.assertEqual(['0x1'] * 8, [future.result() for future in futures])
+            self.assertEqual(1, m.call_count)
+
+            # it doesn't share the response for a write method
+            futures = [executor.submit(provider.make_request, 'icx_sendTransaction', {'value': '0x1'})
+                       for _ in range(2)]
+            self.assertEqual(['0x1'] * 2, [future.result() for future in futures])
+            self.assertEqual(3, m.call_count)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase, main
+
+import aiohttp
+from aiohttp import web
+
+from iconsdk.monitor import BlockMonitorSpec
+from iconsdk.providers.aiohttp_provider import AIOWebSocketMonitor
+from iconsdk.providers.http_provider import WebSocketMonitor
+from iconsdk.providers.provider import Monitor, MonitorTimeoutException
+from iconsdk.resilient_monitor import ResilientMonitor
+from tests.providers.test_resilient_monitor import FakeService
+
+FRAMES = 5
+
+
+async def handle_monitor(request):
+    """Accepts a monitor, then sends FRAMES notifications at once and another one a while later"""
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    await ws.receive_json()
+    await ws.send_json({"code": 0})
+    for height in range(FRAMES):
+        await ws.send_str(json.dumps({"height": hex(height)}))
+    await asyncio.sleep(0.3)
+    await ws.send_str(json.dumps({"height": hex(FRAMES)}))
+    async for _ in ws:
+        pass
+    return ws
+
+
+async def handle_broken(request):
+    """Sends a ping after some notifications, then a broken frame"""
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    await ws.receive_json()
+    await ws.send_json({"code": 0})
+    for height in range(2):
+        await ws.send_str(json.dumps({"height": hex(height)}))
+    await ws.ping()
+    await asyncio.sleep(0.5)
+    await ws.send_str(json.dumps({"height": hex(2)}))
+    await ws.send_str("{broken")
+    await ws.send_str(json.dumps({"height": hex(3)}))
+    async for _ in ws:
+        pass
+    return ws
+
+
+def make_app() -> web.Application:
+    app = web.Application()
+    app.router.add_get("/ws", handle_monitor)
+    app.router.add_get("/broken", handle_broken)
+    return app
+
+
+class MonitorServer:
+    """Runs the app in a thread for sync clients"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.runner = web.AppRunner(make_app())
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        self.url = f"ws://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/ws"
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class ListMonitor(Monitor):
+
+    def __init__(self, notifications):
+        self.notifications = list(notifications)
+
+    def read(self, timeout=None):
+        if not self.notifications:
+            raise MonitorTimeoutException()
+        return self.notifications.pop(0)
+
+    def close(self):
+        pass
+
+
+class TestMonitor(TestCase):
+
+    def test_default(self):
+        monitor = ListMonitor([1, 2, 3])
+        self.assertEqual([1], monitor.read_many(10))
+        iterator = iter(monitor)
+        self.assertEqual([2, 3], [next(iterator), next(iterator)])
+        self.assertEqual([], monitor.read_many(10, 0.01))
+
+    def test_resilient(self):
+        service = FakeService([{"height": hex(h)} for h in (1, 2, 2, 3)])
+        monitor = ResilientMonitor(service, BlockMonitorSpec(1))
+        self.assertEqual([{"height": "0x1"}], monitor.read_many(10, 1))
+        self.assertEqual([{"height": "0x2"}], monitor.read_many(10, 1))
+        # duplicates are skipped
+        self.assertEqual([{"height": "0x3"}], monitor.read_many(10, 1))
+        self.assertEqual(1, monitor.skipped)
+        self.assertEqual([], monitor.read_many(10, 0.01))
+
+
+class TestWebSocketMonitor(TestCase):
+
+    def setUp(self):
+        self.server = MonitorServer()
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_read_many(self):
+        monitor = WebSocketMonitor(self.server.url, {"height": "0x0"})
+        try:
+            # wait for all the frames in the socket
+            time.sleep(0.1)
+            notifications = monitor.read_many(3, 1)
+            self.assertEqual([{"height": hex(h)} for h in range(3)], notifications)
+            frames = monitor.read_many(10, 1, parse=False)
+            self.assertEqual([hex(h) for h in range(3, FRAMES)],
+                             [monitor.codec.loads(frame)["height"] for frame in frames])
+            self.assertEqual([], monitor.read_many(10, 0.01))
+            self.assertEqual({"height": hex(FRAMES)}, next(iter(monitor)))
+        finally:
+            monitor.close()
+
+    def test_read_many_error(self):
+        monitor = WebSocketMonitor(self.server.url.replace("/ws", "/broken"), {"height": "0x0"})
+        try:
+            time.sleep(0.1)
+            # the ping doesn't hold reading the buffered notifications
+            started = time.monotonic()
+            self.assertEqual([{"height": "0x0"}, {"height": "0x1"}], monitor.read_many(10, 1))
+            self.assertLess(time.monotonic() - started, 0.3)
+            time.sleep(0.6)
+            # notifications read before the error are returned, and the error is raised next
+            self.assertEqual([{"height": "0x2"}], monitor.read_many(10, 1))
+            self.assertRaises(ValueError, monitor.read_many, 10, 1)
+            self.assertEqual([{"height": "0x3"}], monitor.read_many(10, 1))
+        finally:
+            monitor.close()
+
+
+class TestAIOWebSocketMonitor(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.runner = web.AppRunner(make_app())
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"ws://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/ws"
+        self.session = aiohttp.ClientSession()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.runner.cleanup()
+
+    async def test_read_many(self):
+        monitor = AIOWebSocketMonitor(self.session, self.url, {"height": "0x0"})
+        await monitor._connect()
+        try:
+            await asyncio.sleep(0.1)
+            notifications = await monitor.read_many(3, 1)
+            self.assertEqual([{"height": hex(h)} for h in range(3)], notifications)
+            frames = await monitor.read_many(10, 1, parse=False)
+            self.assertEqual([hex(h) for h in range(3, FRAMES)],
+                             [monitor.codec.loads(frame)["height"] for frame in frames])
+            self.assertEqual([], await monitor.read_many(10, 0.01))
+            async for notification in monitor:
+                self.assertEqual({"height": hex(FRAMES)}, notification)
+                break
+        finally:
+            await monitor.close()
+
+    async def test_read_many_error(self):
+        monitor = AIOWebSocketMonitor(self.session, self.url.replace("/ws", "/broken"), {"height": "0x0"})
+        await monitor._connect()
+        try:
+            self.assertEqual([{"height": "0x0"}, {"height": "0x1"}], await monitor.read_many(10, 1))
+            await asyncio.sleep(0.6)
+            self.assertEqual([{"height": "0x2"}], await monitor.read_many(10, 1))
+            with self.assertRaises(ValueError):
+                await monitor.read_many(10, 1)
+            self.assertEqual([{"height": "0x3"}], await monitor.read_many(10, 1))
+        finally:
+            await monitor.close()
+
+
+if __name__ == "__main__":
+    main()
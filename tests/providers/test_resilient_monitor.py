@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase, main
+
+from iconsdk.monitor import BlockMonitorSpec, EventFilter, EventMonitorSpec
+from iconsdk.providers.async_provider import AsyncMonitor
+from iconsdk.providers.provider import Monitor, MonitorTimeoutException
+from iconsdk.resilient_monitor import AsyncResilientMonitor, MonitorPosition, ResilientMonitor
+
+FILTER = EventFilter("Transfer(Address,Address,int)", "cx" + "1" * 40, 2)
+
+
+def event(height, index):
+    return {"hash": f"0x{height:064x}", "height": hex(height), "index": hex(index), "events": ["0x0"]}
+
+
+class FakeMonitor(Monitor):
+
+    def __init__(self, notifications):
+        self.notifications = list(notifications)
+        self.closed = False
+
+    def read(self, timeout=None):
+        if not self.notifications:
+            time.sleep(min(timeout or 0, 0.01))
+            raise MonitorTimeoutException()
+        notification = self.notifications.pop(0)
+        if isinstance(notification, Exception):
+            raise notification
+        return notification
+
+    def close(self):
+        self.closed = True
+
+
+class FakeService:
+    """Answers monitors of the scripted connections in order. An exception fails the connection."""
+
+    def __init__(self, *connections, last_height=100):
+        self.connections = list(connections)
+        self.requests = []
+        self.monitors = []
+        self.last_height = last_height
+
+    def monitor(self, spec, keep_alive=None):
+        self.requests.append(spec.get_request())
+        connection = self.connections.pop(0)
+        if isinstance(connection, Exception):
+            raise connection
+        self.monitors.append(FakeMonitor(connection))
+        return self.monitors[-1]
+
+    def get_last_height(self):
+        return self.last_height
+
+
+class AsyncFakeService(FakeService):
+
+    async def monitor(self, spec, keep_alive=None):
+        monitor = super().monitor(spec, keep_alive)
+        return AsyncFakeMonitor(monitor)
+
+    async def get_last_height(self):
+        return self.last_height
+
+
+class AsyncFakeMonitor(AsyncMonitor):
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def read(self, timeout=None):
+        if not self.monitor.notifications:
+            await asyncio.sleep(min(timeout or 0, 0.01))
+        return self.monitor.read(0)
+
+    async def close(self):
+        self.monitor.close()
+
+
+class TestMonitorSpec(TestCase):
+
+    def test_with_height(self):
+        spec = EventMonitorSpec(None, FILTER, logs=True, progress_interval=10)
+        self.assertIsNone(spec.height)
+        resumed = spec.with_height(20)
+        self.assertEqual(20, resumed.height)
+        self.assertEqual(dict(spec.get_request(), height="0x14"), resumed.get_request())
+        self.assertEqual({"height": "0x5"}, BlockMonitorSpec(1).with_height(5).get_request())
+
+
+class TestMonitorPosition(TestCase):
+
+    def test_events(self):
+        position = MonitorPosition()
+        self.assertIsNone(position.next_height)
+        self.assertTrue(position.accept({"progress": "0x5"}))
+        self.assertEqual(5, position.next_height)
+        self.assertTrue(position.accept(event(7, 0)))
+        self.assertTrue(position.accept(event(7, 2)))
+        # events of the height may follow
+        self.assertEqual(7, position.next_height)
+        self.assertFalse(position.accept(event(7, 1)))
+        self.assertFalse(position.accept(event(6, 3)))
+        self.assertTrue(position.accept(event(8, 0)))
+        self.assertTrue(position.accept({"progress": "0xa"}))
+        self.assertEqual(10, position.next_height)
+
+    def test_blocks(self):
+        position = MonitorPosition()
+        self.assertTrue(position.accept({"height": "0x7", "hash": "0x0"}))
+        self.assertEqual(8, position.next_height)
+        self.assertFalse(position.accept({"height": "0x7", "hash": "0x0"}))
+        self.assertTrue(position.accept({"height": "0x8", "hash": "0x0"}))
+
+
+class TestResilientMonitor(TestCase):
+
+    def test_reconnect(self):
+        service = FakeService(
+            [event(7, 0), event(7, 1), ConnectionError("reset")],
+            ConnectionError("refused"),
+            [event(7, 0), event(7, 1), event(7, 2), event(9, 0)],
+            last_height=12,
+        )
+        monitor = ResilientMonitor(service, EventMonitorSpec(5, FILTER), base_delay=0.001)
+        self.assertIsNone(monitor.get_lag())
+        self.assertEqual([event(7, 0), event(7, 1), event(7, 2), event(9, 0)],
+                         [monitor.read(1) for _ in range(4)])
+        self.assertEqual(["0x5", "0x7", "0x7"], [request["height"] for request in service.requests])
+        self.assertEqual(1, monitor.reconnects)
+        self.assertEqual(2, monitor.skipped)
+        self.assertEqual(9, monitor.last_height)
+        self.assertEqual(3, monitor.get_lag())
+        self.assertTrue(service.monitors[0].closed)
+
+        self.assertRaises(MonitorTimeoutException, monitor.read, 1)
+        monitor.close()
+        self.assertTrue(service.monitors[1].closed)
+
+    def test_max_attempts(self):
+        service = FakeService([{"height": "0x3"}, ConnectionError("reset")],
+                              ConnectionError("refused"), ConnectionError("refused"))
+        monitor = ResilientMonitor(service, BlockMonitorSpec(3), base_delay=0.001, max_attempts=2)
+        self.assertEqual({"height": "0x3"}, monitor.read())
+        self.assertRaises(ConnectionError, monitor.read)
+        self.assertEqual(["0x3", "0x4", "0x4"], [request["height"] for request in service.requests])
+
+    def test_failing_reads(self):
+        # connecting succeeds while reading fails
+        service = FakeService(*([ConnectionError("reset")] for _ in range(1000)))
+        monitor = ResilientMonitor(service, BlockMonitorSpec(3), base_delay=0.05)
+        self.assertRaises(MonitorTimeoutException, monitor.read, 0.2)
+        self.assertLess(monitor.reconnects, 10)
+
+    def test_backoff_reset(self):
+        service = FakeService([{"height": "0x3"}, ConnectionError("reset")],
+                              [ConnectionError("reset")],
+                              [{"height": "0x4"}, ConnectionError("reset")],
+                              [{"height": "0x5"}])
+        monitor = ResilientMonitor(service, BlockMonitorSpec(3), base_delay=0.001, max_attempts=2)
+        # the failures are counted from the last delivered notification
+        self.assertEqual([{"height": hex(h)} for h in (3, 4, 5)], [monitor.read(1) for _ in range(3)])
+        self.assertEqual(3, monitor.reconnects)
+
+    def test_first_connection(self):
+        service = FakeService(ConnectionError("refused"))
+        monitor = ResilientMonitor(service, BlockMonitorSpec(3))
+        self.assertEqual([], service.requests)
+        self.assertRaises(ConnectionError, monitor.read)
+
+
+class TestAsyncResilientMonitor(IsolatedAsyncioTestCase):
+
+    async def test_reconnect(self):
+        service = AsyncFakeService(
+            [{"height": "0x3"}, ConnectionError("reset")],
+            [{"height": "0x3"}, {"height": "0x4"}],
+        )
+        async with AsyncResilientMonitor(service, BlockMonitorSpec(3), base_delay=0.001) as monitor:
+            self.assertEqual([{"height": "0x3"}, {"height": "0x4"}], [await monitor.read(1) for _ in range(2)])
+            self.assertEqual(1, monitor.reconnects)
+            self.assertEqual(1, monitor.skipped)
+            self.assertEqual(96, await monitor.get_lag())
+        self.assertEqual(["0x3", "0x4"], [request["height"] for request in service.requests])
+
+    async def test_failing_reads(self):
+        service = AsyncFakeService(*([ConnectionError("reset")] for _ in range(1000)))
+        async with AsyncResilientMonitor(service, BlockMonitorSpec(3), base_delay=0.05) as monitor:
+            with self.assertRaises(MonitorTimeoutException):
+                await monitor.read(0.2)
+            self.assertLess(monitor.reconnects, 10)
+
+    async def test_first_connection(self):
+        service = AsyncFakeService(ConnectionError("refused"))
+        monitor = AsyncResilientMonitor(service, BlockMonitorSpec(3))
+        with self.assertRaises(ConnectionError):
+            await monitor.read()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+import requests
+import requests_mock
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from websocket import WebSocketTimeoutException
+
+from iconsdk.exception import CircuitOpenException, HTTPError, JSONRPCException
+from iconsdk.monitor import BlockMonitorSpec
+from iconsdk.providers.async_provider import AsyncProvider
+from iconsdk.providers.http_provider import HTTPProvider
+from iconsdk.providers.retry import AsyncRetryProvider, CircuitBreaker, RetryPolicy, RetryProvider
+
+URL = "http://localhost:9000/api/v3"
+
+
+def connect_error():
+    reason = NewConnectionError(None, "Failed to establish a new connection")
+    return requests.ConnectionError(MaxRetryError(None, URL, reason))
+
+
+def refused_url() -> str:
+    """Returns a URL of a port which nothing listens to"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/v3/icon_dex"
+
+
+class CountingProvider(HTTPProvider):
+
+    def __init__(self, url):
+        super().__init__(url)
+        self.monitors = 0
+
+    def make_monitor(self, spec, keep_alive=None):
+        self.monitors += 1
+        return super().make_monitor(spec, keep_alive)
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_retryable(self):
+        self.assertTrue(RetryPolicy.is_retryable(True, requests.ReadTimeout()))
+        self.assertTrue(RetryPolicy.is_retryable(True, HTTPError("", 502)))
+        self.assertFalse(RetryPolicy.is_retryable(True, JSONRPCException("", -32602)))
+        self.assertFalse(RetryPolicy.is_retryable(True, CircuitOpenException()))
+        self.assertFalse(RetryPolicy.is_retryable(False, requests.ReadTimeout()))
+        self.assertFalse(RetryPolicy.is_retryable(False, HTTPError("", 502)))
+        self.assertTrue(RetryPolicy.is_retryable(False, requests.ConnectTimeout()))
+        self.assertTrue(RetryPolicy.is_retryable(False, connect_error()))
+        self.assertFalse(RetryPolicy.is_retryable(True, requests.exceptions.InvalidURL()))
+
+    def test_retryable_socket(self):
+        self.assertTrue(RetryPolicy.is_retryable(True, ConnectionRefusedError()))
+        self.assertTrue(RetryPolicy.is_retryable(True, ConnectionResetError()))
+        self.assertTrue(RetryPolicy.is_retryable(True, WebSocketTimeoutException()))
+        self.assertTrue(RetryPolicy.is_retryable(False, ConnectionRefusedError()))
+        self.assertFalse(RetryPolicy.is_retryable(False, ConnectionResetError()))
+        self.assertFalse(RetryPolicy.is_retryable(False, WebSocketTimeoutException()))
+
+    def test_backoff(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+        for attempt in range(1, 10):
+            delay = policy.backoff(attempt)
+            self.assertLessEqual(delay, min(1.0, 0.1 * 2 ** (attempt - 1)))
+            self.assertGreaterEqual(delay, 0)
+
+    def test_budget(self):
+        policy = RetryPolicy(max_attempts=10, budget_ratio=0.5, max_budget=2)
+        error = requests.ReadTimeout()
+        self.assertTrue(policy.should_retry(True, error, 1))
+        self.assertTrue(policy.should_retry(True, error, 1))
+        self.assertFalse(policy.should_retry(True, error, 1))
+        policy.on_request()
+        policy.on_request()
+        self.assertTrue(policy.should_retry(True, error, 1))
+        self.assertFalse(policy.should_retry(True, error, 10))
+
+
+class TestCircuitBreaker(TestCase):
+
+    def test_open_and_close(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        breaker.on_failure(JSONRPCException("", -32602))
+        breaker.on_failure(HTTPError("", 503))
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+        breaker.on_failure(HTTPError("", 503))
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+        # a trial request is allowed after the reset timeout
+        breaker.before_request()
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+        with self.assertRaises(CircuitOpenException):
+            breaker.before_request()
+        breaker.on_success()
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_trial_failure(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.on_failure(requests.ConnectTimeout())
+        with self.assertRaises(CircuitOpenException):
+            breaker.before_request()
+
+
+class TestRetryProvider(TestCase):
+
+    def test_retry_read(self):
+        with requests_mock.Mocker() as m:
+            m.post(URL, [{"exc": requests.ConnectTimeout},
+                         {"status_code": 502, "text": "bad gateway"},
+                         {"json": {"jsonrpc": "2.0", "id": 1, "result": "0x1"}}])
+            provider = RetryProvider(HTTPProvider(URL), RetryPolicy(base_delay=0.001))
+            self.assertEqual("0x1", provider.make_request("icx_getBalance", {"address": "hx1"}))
+            self.assertEqual(3, m.call_count)
+
+    def test_no_retry_write(self):
+        with requests_mock.Mocker() as m:
+            m.post(URL, exc=requests.ReadTimeout)
+            provider = RetryProvider(HTTPProvider(URL), RetryPolicy(base_delay=0.001))
+            with self.assertRaises(requests.ReadTimeout):
+                provider.make_request("icx_sendTransaction", {})
+            self.assertEqual(1, m.call_count)
+
+    def test_retry_batch(self):
+        with requests_mock.Mocker() as m:
+            m.post(URL, [{"exc": requests.ReadTimeout},
+                         {"json": lambda request, context: [
+                             {"jsonrpc": "2.0", "id": item["id"], "result": "0x1"} for item in request.json()]}])
+            provider = RetryProvider(HTTPProvider(URL), RetryPolicy(base_delay=0.001))
+            self.assertEqual(["0x1"], provider.make_batch_request([("icx_getBalance", {"address": "hx1"})]))
+            self.assertEqual(2, m.call_count)
+
+            # batches with a write are not sent again
+            m.post(URL, exc=requests.ReadTimeout)
+            with self.assertRaises(requests.ReadTimeout):
+                provider.make_batch_request([("icx_getBalance", {"address": "hx1"}), ("icx_sendTransaction", {})])
+            self.assertEqual(3, m.call_count)
+
+    def test_retry_monitor(self):
+        provider = CountingProvider(refused_url())
+        retry = RetryProvider(provider, RetryPolicy(max_attempts=3, base_delay=0.001))
+        with self.assertRaises(ConnectionRefusedError):
+            retry.make_monitor(BlockMonitorSpec(1))
+        self.assertEqual(3, provider.monitors)
+
+        # refused connections open the circuit
+        provider = CountingProvider(refused_url())
+        retry = RetryProvider(provider, RetryPolicy(max_attempts=5, base_delay=0.001),
+                              CircuitBreaker(failure_threshold=2))
+        with self.assertRaises(CircuitOpenException):
+            retry.make_monitor(BlockMonitorSpec(1))
+        self.assertEqual(2, provider.monitors)
+
+    def test_circuit_breaker(self):
+        with requests_mock.Mocker() as m:
+            m.post(URL, status_code=503, text="unavailable")
+            provider = RetryProvider(HTTPProvider(URL), RetryPolicy(max_attempts=5, base_delay=0.001),
+                                     CircuitBreaker(failure_threshold=2))
+            with self.assertRaises(CircuitOpenException):
+                provider.make_request("icx_getLastBlock")
+            self.assertEqual(2, m.call_count)
+
+
+class FlakyProvider(AsyncProvider):
+
+    def __init__(self, errors, result):
+        self.errors = list(errors)
+        self.result = result
+        self.count = 0
+
+    async def make_request(self, method, params=None, full_response=False):
+        self.count += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+    async def make_monitor(self, spec, keep_alive=None):
+        raise NotImplementedError()
+
+
+class TestAsyncRetryProvider(IsolatedAsyncioTestCase):
+
+    async def test_retry(self):
+        inner = FlakyProvider([HTTPError("", 504), requests.ConnectTimeout()], "0x1")
+        provider = AsyncRetryProvider(inner, RetryPolicy(base_delay=0.001))
+        self.assertEqual("0x1", await provider.make_request("icx_getLastBlock"))
+        self.assertEqual(3, inner.count)
+
+        inner = FlakyProvider([requests.ConnectTimeout(), HTTPError("", 504)], "0x1")
+        provider = AsyncRetryProvider(inner, RetryPolicy(base_delay=0.001))
+        with self.assertRaises(HTTPError):
+            await provider.make_request("icx_sendTransaction", {})
+        self.assertEqual(2, inner.count)
+
+    async def test_give_up(self):
+        inner = FlakyProvider([HTTPError("", 504)] * 5, "0x1")
+        provider = AsyncRetryProvider(inner, RetryPolicy(max_attempts=3, base_delay=0.001))
+        with self.assertRaises(HTTPError):
+            await provider.make_request("icx_getLastBlock")
+        self.assertEqual(3, inner.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import IsolatedAsyncioTestCase, TestCase, main
+
+from iconsdk.exception import DataTypeException
+from iconsdk.monitor import EventFilter
+from iconsdk.subscription import AsyncSubscriptionHub, SubscriptionHub, route
+from tests.example_chain import ALICE, BOB, TOKEN, TRANSFER
+from tests.providers.test_resilient_monitor import AsyncFakeService, FakeService
+
+APPROVAL = "Approval(Address,Address,int)"
+TRANSFERS = EventFilter(TRANSFER, TOKEN, 2)
+APPROVALS = EventFilter(APPROVAL, TOKEN, 2, ALICE)
+
+
+def transfer_log(value):
+    return {"scoreAddress": TOKEN, "indexed": [TRANSFER, ALICE, BOB, hex(value)], "data": ["0x"]}
+
+
+def approval_log(owner):
+    return {"scoreAddress": TOKEN, "indexed": [APPROVAL, owner, BOB, "0x1"], "data": []}
+
+
+def notification(height, index, *logs):
+    return {"hash": f"0x{height:064x}", "height": hex(height), "index": hex(index),
+            "events": [hex(i) for i in range(len(logs))], "logs": list(logs)}
+
+
+class TestEventFilter(TestCase):
+
+    def test_matches(self):
+        self.assertTrue(TRANSFERS.matches(transfer_log(1)))
+        self.assertFalse(TRANSFERS.matches(approval_log(ALICE)))
+        self.assertTrue(APPROVALS.matches(approval_log(ALICE)))
+        self.assertFalse(APPROVALS.matches(approval_log(BOB)))
+        self.assertTrue(EventFilter(TRANSFER, None, 3, None, None, 5).matches(transfer_log(5)))
+        self.assertFalse(EventFilter(TRANSFER, None, 3, None, None, 5).matches(transfer_log(6)))
+        self.assertFalse(EventFilter(TRANSFER, "cx" + "2" * 40, 0).matches(transfer_log(5)))
+        self.assertFalse(EventFilter(TRANSFER, None, 0, "0x1").matches(transfer_log(5)))
+
+
+class TestRoute(TestCase):
+
+    def test_route(self):
+        class Sub:
+            def __init__(self, *filters):
+                self.filters = filters
+
+        transfers, approvals, both = Sub(TRANSFERS), Sub(APPROVALS), Sub(TRANSFERS, APPROVALS)
+        routes = route(notification(10, 1, transfer_log(1), approval_log(ALICE), approval_log(BOB)),
+                       [transfers, approvals, both])
+        self.assertEqual([transfers, approvals, both], [subscription for subscription, _ in routes])
+        self.assertEqual(["0x0"], routes[0][1]["events"])
+        self.assertEqual([approval_log(ALICE)], routes[1][1]["logs"])
+        self.assertEqual(["0x0", "0x1"], routes[2][1]["events"])
+        self.assertEqual("0x1", routes[2][1]["index"])
+
+        # events and logs of each filter with eventFilters
+        nested = {"height": "0xa", "index": "0x0", "events": [["0x1"], ["0x0", "0x1"]],
+                  "logs": [[approval_log(ALICE)], [transfer_log(1), approval_log(ALICE)]]}
+        routes = route(nested, [both])
+        self.assertEqual(["0x0", "0x1"], routes[0][1]["events"])
+        self.assertEqual([], route(nested, [Sub(EventFilter("Vote(int)", None, 0))]))
+
+
+class TestSubscriptionHub(TestCase):
+
+    def test_subscribe(self):
+        service = FakeService(
+            [notification(10, 0, transfer_log(1), approval_log(ALICE))],
+            [notification(10, 0, transfer_log(1), approval_log(ALICE)), notification(11, 0, approval_log(ALICE))],
+        )
+        with SubscriptionHub(service, height=10, poll_interval=0.01) as hub:
+            self.assertRaises(DataTypeException, hub.subscribe, [])
+            transfers = hub.subscribe(TRANSFERS)
+            self.assertEqual([transfer_log(1)], transfers.get(1)["logs"])
+            approvals = hub.subscribe(APPROVALS)
+            self.assertEqual("0xb", approvals.get(1)["height"])
+            self.assertEqual(11, hub.next_height)
+            transfers.close()
+            self.assertRaises(Exception, transfers.get, 1)
+
+        self.assertEqual({"height": "0xa", "event": TRANSFER, "addr": TOKEN, "indexed": [], "data": [],
+                          "logs": "0x1"}, service.requests[0])
+        # resubscribed from the height with the filters of both
+        self.assertEqual("0xa", service.requests[1]["height"])
+        self.assertEqual(2, len(service.requests[1]["eventFilters"]))
+        self.assertTrue(all(monitor.closed for monitor in service.monitors))
+
+    def test_first_connection(self):
+        service = FakeService(ConnectionError("refused"), ConnectionError("refused"),
+                              [notification(10, 0, transfer_log(1))])
+        with SubscriptionHub(service, height=10, poll_interval=0.01, base_delay=0.001) as hub:
+            transfers = hub.subscribe(TRANSFERS)
+            self.assertEqual([transfer_log(1)], transfers.get(1)["logs"])
+        self.assertEqual(["0xa"] * 3, [request["height"] for request in service.requests])
+
+    def test_stop_by_error(self):
+        service = FakeService(ConnectionError("refused"), ConnectionError("refused"), last_height=20)
+        hub = SubscriptionHub(service, poll_interval=0.01, base_delay=0.001, max_attempts=1)
+        transfers = hub.subscribe(TRANSFERS)
+        self.assertRaises(ConnectionError, transfers.get, 1)
+        self.assertEqual(["0x15", "0x15"], [request["height"] for request in service.requests])
+        self.assertRaises(Exception, hub.subscribe, TRANSFERS)
+        hub.close()
+
+
+class TestAsyncSubscriptionHub(IsolatedAsyncioTestCase):
+
+    async def test_subscribe(self):
+        service = AsyncFakeService(
+            [notification(10, 0, transfer_log(1), approval_log(ALICE))],
+            [notification(11, 0, transfer_log(2), approval_log(ALICE))],
+        )
+        async with AsyncSubscriptionHub(service, height=10, poll_interval=0.01) as hub:
+            transfers = hub.subscribe(TRANSFERS)
+            self.assertEqual([transfer_log(1)], (await transfers.get(1))["logs"])
+            approvals = hub.subscribe(APPROVALS)
+            self.assertEqual([approval_log(ALICE)], (await approvals.get(1))["logs"])
+            self.assertEqual([transfer_log(2)], (await transfers.get(1))["logs"])
+            await approvals.close()
+            with self.assertRaises(Exception):
+                await approvals.get(1)
+        self.assertEqual("0xa", service.requests[1]["height"])
+        self.assertTrue(all(monitor.closed for monitor in service.monitors))
+        with self.assertRaises(Exception):
+            await transfers.get(1)
+
+    async def test_first_connection(self):
+        service = AsyncFakeService(ConnectionError("refused"), [notification(10, 0, transfer_log(1))])
+        async with AsyncSubscriptionHub(service, height=10, poll_interval=0.01, base_delay=0.001) as hub:
+            transfers = hub.subscribe(TRANSFERS)
+            self.assertEqual([transfer_log(1)], (await transfers.get(1))["logs"])
+        self.assertEqual(["0xa", "0xa"], [request["height"] for request in service.requests])
+
+
+if __name__ == "__main__":
+    main()
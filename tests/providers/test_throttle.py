@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import math
+import random
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+import requests_mock
+from aiohttp import web
+
+from iconsdk.exception import JSONRPCException
+from iconsdk.providers.aiohttp_provider import AIOHTTPProvider
+from iconsdk.providers.http_provider import HTTPProvider
+from iconsdk.providers.methods import is_write_payload
+from iconsdk.providers.throttle import AdaptiveConcurrencyLimiter, RateLimiter, TokenBucket
+
+URL = "http://localhost:9000/api/v3"
+
+
+class TestTokenBucket(TestCase):
+
+    def test_burst(self):
+        bucket = TokenBucket(rate=10, burst=3)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(bucket.try_acquire())
+
+    def test_rate(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        started = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.045)
+
+    def test_method_class(self):
+        limiter = RateLimiter(read=TokenBucket(1000), write=TokenBucket(1, burst=1))
+        limiter.acquire(write=True)
+        started = time.monotonic()
+        limiter.acquire()
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_write_payload(self):
+        self.assertTrue(is_write_payload({"method": "icx_sendTransaction"}))
+        self.assertFalse(is_write_payload({"method": "icx_getBalance"}))
+        self.assertTrue(is_write_payload([{"method": "icx_getBalance"}, {"method": "icx_sendTransaction"}]))
+        self.assertFalse(is_write_payload([{"method": "icx_getBalance"}, {"method": "icx_call"}]))
+
+
+class TestAdaptiveConcurrencyLimiter(TestCase):
+
+    def test_decrease_on_overload(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16)
+        limiter.acquire()
+        limiter.release(0.01, overloaded=True)
+        self.assertEqual(8, limiter.limit)
+        # failures at the same time count once
+        limiter.acquire()
+        limiter.release(0.01, overloaded=True)
+        self.assertEqual(8, limiter.limit)
+
+    def test_decrease_on_latency(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, tolerance=2.0)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(0.01)
+        # a slow request doesn't count while the recent latencies keep slow
+        limiter.acquire()
+        limiter.release(0.05)
+        self.assertEqual(16, limiter.limit)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(0.05)
+        self.assertEqual(8, limiter.limit)
+
+    def test_stable_on_jitter(self):
+        rand = random.Random(1)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+        for i in range(5000):
+            limiter.acquire()
+            if i % 6 == 5:
+                # long polling
+                limiter.release(None)
+            else:
+                limiter.release(rand.lognormvariate(math.log(0.1), 0.4))
+        self.assertEqual(10, limiter.limit)
+
+    def test_increase(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.acquire()
+            limiter.release(0.01)
+            limiter.release(0.01)
+        self.assertEqual(3, limiter.limit)
+        self.assertEqual(0, limiter.inflight)
+
+    def test_http_provider(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        with requests_mock.Mocker() as m:
+            m.post(URL, status_code=429, json={"jsonrpc": "2.0", "id": 1,
+                                               "error": {"code": -32000, "message": "Too many requests"}})
+            provider = HTTPProvider(URL, concurrency_limiter=limiter,
+                                    rate_limiter=RateLimiter(total=TokenBucket(1000)))
+            with self.assertRaises(JSONRPCException):
+                provider.make_request("icx_getLastBlock")
+        self.assertEqual(2, limiter.limit)
+        self.assertEqual(0, limiter.inflight)
+
+
+class TestAsyncConcurrencyLimiter(IsolatedAsyncioTestCase):
+
+    async def test_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        running = []
+
+        async def request():
+            await limiter.acquire_async()
+            running.append(limiter.inflight)
+            await asyncio.sleep(0.01)
+            limiter.release(0.01)
+
+        await asyncio.wait_for(asyncio.gather(*[request() for _ in range(10)]), 1)
+        self.assertEqual(10, len(running))
+        self.assertLessEqual(max(running), 2)
+
+    async def test_cancel(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release(0.01)
+        await asyncio.wait_for(limiter.acquire_async(), 1)
+        self.assertEqual(1, limiter.inflight)
+
+    async def test_cancelled_request(self):
+        async def handle(request):
+            await asyncio.sleep(1)
+            return web.json_response({"jsonrpc": "2.0", "id": 1, "result": "0x1"})
+
+        app = web.Application()
+        app.router.add_post("/api/v3", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        provider = AIOHTTPProvider(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/api/v3",
+                                   concurrency_limiter=limiter)
+        try:
+            for _ in range(10):
+                limiter.acquire()
+                limiter.release(0.01)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(provider.make_request("icx_getLastBlock"), 0.2)
+            # the cancelled request isn't counted as a slow one
+            for _ in range(10):
+                limiter.acquire()
+                limiter.release(0.01)
+            self.assertEqual(4, limiter.limit)
+            self.assertEqual(0, limiter.inflight)
+        finally:
+            await provider.close()
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    main()
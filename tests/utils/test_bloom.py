@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hashlib import sha3_256
+from unittest import TestCase, main
+
+from iconsdk.exception import DataTypeException
+from iconsdk.monitor import EventFilter
+from iconsdk.utils.bloom import LogsBloom, int_to_bytes, address_to_bytes, item_to_bytes, may_contain_events
+
+TRANSFER = "Transfer(Address,Address,int,bytes)"
+TOKEN = "cx" + "1" * 40
+OTHER_TOKEN = "cx" + "2" * 40
+ALICE = "hx" + "a" * 40
+BOB = "hx" + "b" * 40
+
+EVENT_LOGS = [
+    {"scoreAddress": TOKEN, "indexed": [TRANSFER, ALICE, BOB, "0x64"], "data": ["0x"]},
+    {"scoreAddress": TOKEN, "indexed": ["Approval(Address,Address,int)", ALICE, BOB], "data": ["0x1"]},
+]
+
+# transaction result answered by a node, as in tests/api_get/test_get_transaction_result.py
+NODE_RESULT = {
+    "eventLogs": [
+        {
+            "scoreAddress": "cx0000000000000000000000000000000000000000",
+            "indexed": ["PRepSet(Address)"],
+            "data": ["hx86aba2210918a9b116973f3c4b27c41a54d5dafe"]
+        }
+    ],
+    "logsBloom": ("0x00000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001000000000000000000000000"
+                  "00000000000000000000000000000000000000000000000000000000000000000000000800000000000000000000000008000000000000000000000000000000"
+                  "00000000000000000000000000000200000000000000080000000000000000000000000000000000000800000000000000000000000000000000000000000000"
+                  "00000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"),
+}
+
+# event logs with the blooms made by IconServiceEngine._generate_logs_bloom of iconservice 1.9.1,
+# which takes the typed values of the items: Address(hx0b04..), Address(cx88fd..), 10 ** 18, -129 and "sICX/ICX"
+SICX = "cx2609b924e33ef00b648a409245c7ea394c467824"
+REFERENCE_LOGS = [
+    ({"scoreAddress": SICX,
+      "indexed": [TRANSFER, "hx0b047c751658f7ce1b2595da34d57a0e7dad357d", "cx88fd7df7ddff82f7cc735c871dc519838cb235bb",
+                  "0xde0b6b3a7640000"],
+      "data": ["0x"]},
+     "0x00800000020000000000002000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000010000000000"
+     "00000020000400000000000000000000000000000000000000000000000000000000000000000000000000000000010000000000000000002000000000000000"
+     "00000000000000000000000000000000000000000000000000000000041000000020000000000004001000000000000000000400000000000000000000000000"
+     "00000000000000000000000000000000000000000001000000000000000000000000000000000000000000000000000000000000000000000000000000000000"),
+    ({"scoreAddress": "cx88fd7df7ddff82f7cc735c871dc519838cb235bb",
+      "indexed": ["TokenTransfer(int,str,int)", "-0x81", "sICX/ICX", "0x0"],
+      "data": []},
+     "0x00000000000000000000000000000000000000000000000000000000000000000000000000001000000000000000000000000000000000000000000000000000"
+     "00000000000000000000000000000000000000000000000000000000000080000000000000000000000000000000000000000000000000000000000000000000"
+     "00080000000000080000000000000000000000000000000000000200200000000000000000000000000030000000000000000000000000000000000000000000"
+     "00000000000001000000000000000000000000000002000000000000000001000002000000000100000000020000000000400000000000000000000000000000"),
+]
+
+
+class TestBloom(TestCase):
+
+    def test_item_to_bytes(self):
+        self.assertEqual(b"\x00", int_to_bytes(0))
+        self.assertEqual(b"\x7f", int_to_bytes(127))
+        self.assertEqual(b"\x00\x80", int_to_bytes(128))
+        self.assertEqual(b"\xff", int_to_bytes(-1))
+        self.assertEqual(b"\xff\x7f", int_to_bytes(-129))
+        self.assertEqual(b"\x01" + b"\x11" * 20, address_to_bytes(TOKEN))
+        self.assertEqual(b"\x00" + b"\xaa" * 20, address_to_bytes(ALICE))
+        self.assertRaises(DataTypeException, address_to_bytes, "hx1234")
+
+        self.assertEqual(b"\x00\x80", item_to_bytes("0x80", "int"))
+        self.assertEqual(b"\x00\x80", item_to_bytes(128))
+        self.assertEqual(b"\x01", item_to_bytes(True))
+        self.assertEqual(b"\x01", item_to_bytes("0x1", "bool"))
+        self.assertEqual(b"\x12\x34", item_to_bytes("0x1234", "bytes"))
+        self.assertEqual(b"0x1234", item_to_bytes("0x1234", "str"))
+        self.assertEqual(b"abc", item_to_bytes("abc"))
+        self.assertEqual(address_to_bytes(BOB), item_to_bytes(BOB))
+
+    def test_add_item(self):
+        bloom = LogsBloom()
+        bloom.add_item(0, b"abc")
+        digest = sha3_256(b"\x00abc").digest()
+        expected = 0
+        for i in range(3):
+            expected |= 1 << (int.from_bytes(digest[i * 2:i * 2 + 2], "big") & 2047)
+        self.assertEqual(expected, bloom.bits)
+        self.assertEqual(256, len(bloom.to_bytes()))
+        self.assertEqual(bloom, LogsBloom(bloom.to_bytes()))
+        self.assertEqual(bloom, LogsBloom("0x" + bloom.to_bytes().hex()))
+
+    def test_event_filter(self):
+        bloom = LogsBloom.from_event_logs(EVENT_LOGS)
+        matching = [
+            EventFilter(TRANSFER, TOKEN, 0),
+            EventFilter(TRANSFER, None, 1, ALICE),
+            EventFilter(TRANSFER, TOKEN, 3, None, BOB, 100),
+            EventFilter(TRANSFER, TOKEN, 2, ALICE, BOB, b"data"),
+        ]
+        for event_filter in matching:
+            self.assertIn(LogsBloom.from_event_filter(event_filter), bloom)
+
+        not_matching = [
+            EventFilter(TRANSFER, OTHER_TOKEN, 0),
+            EventFilter("Transfer(Address,Address,int)", TOKEN, 0),
+            EventFilter(TRANSFER, TOKEN, 1, BOB),
+            EventFilter(TRANSFER, TOKEN, 3, ALICE, BOB, 101),
+        ]
+        for event_filter in not_matching:
+            self.assertNotIn(LogsBloom.from_event_filter(event_filter), bloom)
+
+    def test_may_contain_events(self):
+        bloom = LogsBloom.from_event_logs(EVENT_LOGS)
+        raw = {"logsBloom": "0x" + bloom.to_bytes().hex()}
+        converted = {"logsBloom": bloom.to_bytes()}
+        filters = [EventFilter(TRANSFER, OTHER_TOKEN, 0), EventFilter(TRANSFER, TOKEN, 1, ALICE)]
+        for target in (raw, converted):
+            self.assertTrue(may_contain_events(target, filters))
+            self.assertFalse(may_contain_events(target, filters[0]))
+        self.assertTrue(may_contain_events({}, filters[0]))
+
+
+class TestNodeBloom(TestCase):
+
+    def test_node_result(self):
+        bloom = LogsBloom(NODE_RESULT["logsBloom"])
+        self.assertEqual(bloom, LogsBloom.from_event_logs(NODE_RESULT["eventLogs"]))
+        # the address is added with the index 0xff, and the signature with the index 0
+        address_bloom = LogsBloom()
+        address_bloom.add_item(0xff, address_to_bytes("cx0000000000000000000000000000000000000000"))
+        signature_bloom = LogsBloom()
+        signature_bloom.add_item(0, b"PRepSet(Address)")
+        self.assertEqual(bloom, address_bloom | signature_bloom)
+
+    def test_reference_logs(self):
+        for event_log, logs_bloom in REFERENCE_LOGS:
+            with self.subTest(event=event_log["indexed"][0]):
+                self.assertEqual(256, len(bytes.fromhex(logs_bloom[2:])))
+                self.assertEqual(LogsBloom(logs_bloom), LogsBloom.from_event_logs([event_log]))
+
+        transfer, token_transfer = (LogsBloom(logs_bloom) for _, logs_bloom in REFERENCE_LOGS)
+        # items given as python values
+        self.assertIn(LogsBloom.from_event_filter(EventFilter(
+            TRANSFER, SICX, 3, "hx0b047c751658f7ce1b2595da34d57a0e7dad357d", None, 10 ** 18)), transfer)
+        self.assertIn(LogsBloom.from_event_filter(EventFilter(
+            "TokenTransfer(int,str,int)", "cx88fd7df7ddff82f7cc735c871dc519838cb235bb", 3, -129, "sICX/ICX", False)),
+            token_transfer)
+        self.assertNotIn(LogsBloom.from_event_filter(EventFilter(
+            TRANSFER, SICX, 3, None, None, 10 ** 18 + 1)), transfer)
+
+
+if __name__ == "__main__":
+    main()